@@ -0,0 +1,189 @@
+"""
+End-to-end load test for the API.
+
+Generates a synthetic dataset, points the file database at it, replaces the
+LLM with a deterministic stub and drives the public endpoints concurrently
+against the in-process ASGI app. Results are reported as JSON with
+throughput and p50/p95/p99 latency per endpoint.
+
+Usage:
+    python -m benchmarks.api_load --positions 10000 --versions 50 --output result.json
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import contextlib
+import argparse
+import tempfile
+from typing import Dict, Any, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+
+from benchmarks.reporting import build_report, quiet_logging, summarize_latencies, write_report
+from benchmarks.stub_llm import StubLLM
+from benchmarks.synthetic_data import generate_dataset
+
+ENDPOINTS = ("chatRequest", "companyPositions", "positionVersions", "positionDetails")
+
+_QUESTIONS = [
+    "Is parking available at the office?",
+    "What does the interview process look like?",
+    "Do you offer a relocation allowance?",
+    "How many days a week are in the office?",
+    "Is there an on-call rotation?",
+]
+
+def _parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+async def _send(client: httpx.AsyncClient, endpoint: str, rng: random.Random,
+                company_ids: List[int], position_ids: List[int]) -> httpx.Response:
+    position_id = rng.choice(position_ids)
+    if endpoint == "chatRequest":
+        return await client.post("/v1/chatRequest", json={"question": rng.choice(_QUESTIONS), "positionId": position_id})
+    if endpoint == "companyPositions":
+        return await client.get(f"/v1/company/{rng.choice(company_ids)}/positions")
+    if endpoint == "positionVersions":
+        return await client.get(f"/v1/position/{position_id}/versions")
+    return await client.put(f"/v1/position/{position_id}/details", json={
+        "position": {
+            "id": position_id,
+            "companyId": company_ids[(position_id - position_ids[0]) % len(company_ids)],
+            "positionTitle": f"Benchmark Position {position_id}",
+            "positionDescription": "Updated by the load test."
+        }
+    })
+
+async def run_load(app: Any, company_ids: List[int], position_ids: List[int], requests: int,
+                   concurrency: int, weights: Dict[str, float], seed: int) -> Tuple[Dict[str, Dict[str, List[float]]], float]:
+    """
+    Drive a weighted mix of endpoint requests concurrently against an ASGI app
+    
+    Args:
+        app: The ASGI application
+        company_ids: Company IDs present in the dataset
+        position_ids: Position IDs present in the dataset
+        requests: Total number of requests to send
+        concurrency: Number of concurrent clients
+        weights: Relative weight of each endpoint in the request mix
+        seed: Seed for the request mix
+        
+    Returns:
+        Tuple of (per-endpoint latencies and error counts, elapsed seconds)
+    """
+    names = list(weights)
+    rng = random.Random(seed)
+    plan = rng.choices(names, weights=[weights[name] for name in names], k=requests)
+    samples = {name: {"latencies": [], "errors": 0} for name in names}
+    queue: asyncio.Queue = asyncio.Queue()
+    for endpoint in plan:
+        queue.put_nowait(endpoint)
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        async def worker(worker_id: int) -> None:
+            worker_rng = random.Random(seed + worker_id)
+            while True:
+                try:
+                    endpoint = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                try:
+                    response = await _send(client, endpoint, worker_rng, company_ids, position_ids)
+                    ok = response.status_code < 500
+                except Exception:
+                    ok = False
+                elapsed = time.perf_counter() - start
+                if ok:
+                    samples[endpoint]["latencies"].append(elapsed)
+                else:
+                    samples[endpoint]["errors"] += 1
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    
+    return samples, elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the Position FAQ API in-process with a stubbed LLM")
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--positions", type=int, default=200)
+    parser.add_argument("--versions", type=int, default=5)
+    parser.add_argument("--faqs", type=int, default=20, help="FAQs per position version")
+    parser.add_argument("--info", type=int, default=5, help="Info items per position version")
+    parser.add_argument("--requests", type=int, default=500, help="Total requests to send")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default="chatRequest=4,companyPositions=1,positionVersions=2,positionDetails=1",
+                        help="Comma separated endpoint=weight pairs")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated LLM latency in seconds")
+    parser.add_argument("--data-dir", help="Use the dataset in this directory instead of a temporary one, "
+                                           "generating it first if the directory has no data")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="Keep application log output")
+    args = parser.parse_args()
+    
+    weights = _parse_mix(args.mix)
+    
+    with contextlib.ExitStack() as stack:
+        if args.data_dir:
+            data_dir = args.data_dir
+            os.makedirs(data_dir, exist_ok=True)
+        else:
+            data_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="position-faq-bench-"))
+        reuse = any(name.startswith("example-data-") for name in os.listdir(data_dir))
+        generate_start = time.perf_counter()
+        if not reuse:
+            company_ids, position_ids = generate_dataset(
+                data_dir, args.companies, args.positions, args.versions, args.faqs, args.info, args.seed
+            )
+        generate_seconds = time.perf_counter() - generate_start
+        
+        # Keep import-time output away from a report written to stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            from src.database import file_db
+            from src.workflow import workflow
+            from src.main import app
+        if not args.verbose:
+            quiet_logging()
+        
+        file_db.STATIC_FILES_DIR = data_dir
+        if reuse:
+            company_ids, position_ids = file_db.get_company_ids(), file_db.get_position_ids()
+            print(f"Reusing {len(company_ids)} companies and {len(position_ids)} positions in {data_dir}", file=sys.stderr)
+        stub = StubLLM(latency=args.llm_latency)
+        workflow.llm = stub
+        
+        samples, elapsed = asyncio.run(run_load(
+            app, company_ids, position_ids, args.requests, args.concurrency, weights, args.seed
+        ))
+    
+    results = {
+        name: summarize_latencies(sample["latencies"], sample["errors"], elapsed)
+        for name, sample in samples.items()
+    }
+    all_latencies = [latency for sample in samples.values() for latency in sample["latencies"]]
+    results["overall"] = summarize_latencies(all_latencies, sum(s["errors"] for s in samples.values()), elapsed)
+    results["overall"]["elapsed_s"] = round(elapsed, 3)
+    results["overall"]["llm_calls"] = stub.calls
+    
+    parameters = vars(args).copy()
+    parameters["dataset_reused"] = reuse
+    parameters["dataset_generation_s"] = round(generate_seconds, 3)
+    write_report(build_report("api_load", parameters, results), args.output)
+
+if __name__ == "__main__":
+    main()
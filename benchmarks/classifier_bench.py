@@ -0,0 +1,140 @@
+"""
+Benchmark for the local question type classifier.
+
+Classifies a labelled set of inputs at several confidence thresholds and
+reports the fraction handled locally (LLM calls avoided), the accuracy of the
+local classifications and the time per classification. The reference labels
+are the built-in ones, or the LLM's own classifications with --reference llm
+(requires ANTHROPIC_API_KEY).
+
+Usage:
+    python -m benchmarks.classifier_bench --thresholds 0.8,0.9,0.95 --output classifier.json
+    python -m benchmarks.classifier_bench --data-dir src/staticFiles --reference llm
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from typing import Dict, Any, List, Tuple
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.reporting import build_report, quiet_logging, write_report
+
+# Inputs not used as training examples, with the class the LLM is expected to choose
+EVALUATION_SET: List[Tuple[str, str]] = [
+    ("hello!", "chitchat"), ("hi", "chitchat"), ("thanks a lot", "chitchat"), ("ok thank you", "chitchat"),
+    ("good afternoon", "chitchat"), ("bye for now", "chitchat"), ("great, cheers", "chitchat"),
+    ("lol", "chitchat"), ("I see", "chitchat"), ("that helps", "chitchat"),
+    ("What is the weather in Sydney?", "off_topic"), ("Can you write me a poem?", "off_topic"),
+    ("Who is the president of the USA?", "off_topic"), ("How do I fix my bike?", "off_topic"),
+    ("What's your name?", "off_topic"), ("Do you like music?", "off_topic"),
+    ("What are the main duties of this role?", "position"), ("Is this position fully remote?", "position"),
+    ("What qualifications do I need for this job?", "position"), ("Who will I report to in this role?", "position"),
+    ("How big is the team for this position?", "position"), ("Is there on-call for this job?", "position"),
+    ("What programming languages does the team use?", "position"), ("What is the pay for this role?", "position"),
+    ("Is parking provided for this role?", "position"), ("When would the job start?", "position"),
+    ("What is the culture like at the company?", "company"), ("How many people work at the company?", "company"),
+    ("Where are the company's offices?", "company"), ("What does the company sell?", "company"),
+    ("Is the company growing?", "company"), ("What are the company's core values?", "company"),
+    ("Who is the CEO of the company?", "company"), ("Does the company offer health insurance?", "company"),
+    ("What perks does the company provide?", "company"), ("How old is the company?", "company"),
+]
+
+_CLASS_RESULTS = {
+    "chitchat": (False, False, False),
+    "off_topic": (True, False, False),
+    "position": (True, True, False),
+    "company": (True, False, True),
+}
+
+def _as_tuple(result: Dict[str, Any]) -> Tuple[bool, bool, bool]:
+    return (bool(result.get("is_question")), bool(result.get("about_position")), bool(result.get("about_company")))
+
+def reference_labels(reference: str) -> List[Tuple[bool, bool, bool]]:
+    """
+    Get the reference classification of each evaluation input
+
+    Args:
+        reference: 'labels' for the built-in labels or 'llm' to ask the LLM
+
+    Returns:
+        (is_question, about_position, about_company) per input
+    """
+    if reference == "labels":
+        return [_CLASS_RESULTS[label] for _, label in EVALUATION_SET]
+    from src.workflow.workflow import identify_question_type
+    return [_as_tuple(identify_question_type(text)) for text, _ in EVALUATION_SET]
+
+def evaluate(classifier: Any, expected: List[Tuple[bool, bool, bool]], repeat: int) -> Dict[str, Any]:
+    """
+    Classify the evaluation set and compare with the reference
+
+    Args:
+        classifier: A trained QuestionClassifier
+        expected: The reference classification per input
+        repeat: Timed passes over the set
+
+    Returns:
+        Local fraction, local accuracy, overall accuracy with the LLM fallback and
+        the median time per classification
+    """
+    results = [classifier.classify(text) for text, _ in EVALUATION_SET]
+    local = [(result, reference) for result, reference in zip(results, expected) if result is not None]
+    correct = sum(1 for result, reference in local if _as_tuple(result) == reference)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text, _ in EVALUATION_SET:
+            classifier.classify(text)
+        timings.append((time.perf_counter() - start) / len(EVALUATION_SET))
+
+    count = len(EVALUATION_SET)
+    return {
+        "inputs": count,
+        "classified_locally": len(local),
+        "llm_calls_avoided_fraction": round(len(local) / count, 4),
+        "local_accuracy": round(correct / len(local), 4) if local else None,
+        # Inputs left to the LLM count as agreeing with it
+        "accuracy_with_llm_fallback": round((correct + count - len(local)) / count, 4),
+        "median_us_per_input": round(statistics.median(timings) * 1_000_000, 2),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the local question type classifier")
+    parser.add_argument("--thresholds", default="0.7,0.8,0.9,0.95,0.99", help="Comma-separated confidence thresholds")
+    parser.add_argument("--data-dir", help="Data directory whose stored FAQs are used as training examples")
+    parser.add_argument("--training-file", help="JSON lines file of labelled inputs used as training examples")
+    parser.add_argument("--reference", choices=("labels", "llm"), default="labels",
+                        help="Compare with the built-in labels or with the LLM's classifications")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed passes over the evaluation set")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    quiet_logging()
+    from src.database import file_db
+    from src.workflow.question_classifier import QuestionClassifier, load_faq_examples, load_labelled_examples
+
+    examples = []
+    if args.data_dir:
+        with patch.object(file_db, "STATIC_FILES_DIR", os.path.abspath(args.data_dir)):
+            examples += load_faq_examples()
+    if args.training_file:
+        examples += load_labelled_examples(args.training_file)
+
+    expected = reference_labels(args.reference)
+    results = {"training_examples": len(examples), "thresholds": {}}
+    for threshold in [float(value) for value in args.thresholds.split(",")]:
+        classifier = QuestionClassifier(threshold=threshold)
+        classifier.train(examples=examples)
+        results["thresholds"][str(threshold)] = evaluate(classifier, expected, args.repeat)
+        print(f"Threshold {threshold}: {results['thresholds'][str(threshold)]}", file=sys.stderr)
+
+    write_report(build_report("question_classifier", vars(args), results), args.output)
+
+if __name__ == "__main__":
+    main()
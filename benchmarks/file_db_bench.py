@@ -0,0 +1,157 @@
+"""
+Micro-benchmarks for the file database at increasing data sizes.
+
+Builds temporary data directories of increasing size and measures the
+file_db lookups on each one, reporting median time and peak memory per call.
+The growth of each function is estimated as the slope of log(time) against
+log(files) and functions that grow faster than linearly are flagged.
+
+Usage:
+    python -m benchmarks.file_db_bench --sizes 100,1000,10000 --versions 5 --output file_db.json
+"""
+
+import os
+import sys
+import math
+import time
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+import statistics
+from typing import Dict, Any, List, Callable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.reporting import build_report, quiet_logging, write_report
+from benchmarks.synthetic_data import generate_dataset, FIRST_COMPANY_ID, FIRST_POSITION_ID
+
+# Slope of log(time) / log(size) above which growth is reported as super-linear
+SUPER_LINEAR_SLOPE = 1.2
+
+def _operations(file_db: Any, positions: int) -> Dict[str, Callable[[], Any]]:
+    # Probe a position in the middle of the ID range so glob ordering does not help
+    position_id = FIRST_POSITION_ID + positions // 2
+    return {
+        "_get_latest_version_file": lambda: file_db._get_latest_version_file("pos", position_id),
+        "_get_next_id": lambda: file_db._get_next_id("pos"),
+        "get_positions_by_company_id": lambda: file_db.get_positions_by_company_id(FIRST_COMPANY_ID),
+        "get_all_position_versions": lambda: file_db.get_all_position_versions(position_id),
+    }
+
+def measure(operation: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """
+    Measure the median wall time and peak traced memory of an operation
+    
+    Timing and memory are measured in separate passes because tracemalloc
+    slows allocation-heavy code down considerably.
+    
+    Args:
+        operation: Zero-argument callable to measure
+        repeat: Number of timed calls
+        
+    Returns:
+        Dictionary with median and minimum time in milliseconds and peak memory in KiB
+    """
+    operation()  # Warm the OS file cache
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "min_ms": round(min(timings) * 1000, 4),
+        "peak_kib": round(peak / 1024, 1)
+    }
+
+def growth_slope(sizes: List[int], timings: List[float]) -> float:
+    """
+    Least-squares slope of log(time) against log(size)
+    
+    A slope of about 1 means linear growth, 0 means constant time.
+    
+    Args:
+        sizes: Data sizes
+        timings: Time measured at each size
+        
+    Returns:
+        The fitted slope, or 0.0 if there are fewer than two usable points
+    """
+    points = [(math.log(s), math.log(t)) for s, t in zip(sizes, timings) if s > 0 and t > 0]
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if denominator == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark file_db operations at increasing data sizes")
+    parser.add_argument("--sizes", default="100,300,1000", help="Comma separated position counts")
+    parser.add_argument("--versions", type=int, default=5, help="Versions per position")
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--faqs", type=int, default=20, help="FAQs per position version")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per operation and size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--fail-on-super-linear", action="store_true",
+                        help="Exit with status 1 if any operation grows super-linearly")
+    args = parser.parse_args()
+    
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        from src.database import file_db
+    quiet_logging()
+    original_dir = file_db.STATIC_FILES_DIR
+    
+    per_size: List[Dict[str, Any]] = []
+    try:
+        for positions in sizes:
+            with tempfile.TemporaryDirectory(prefix="position-faq-file-db-") as data_dir:
+                generate_dataset(data_dir, args.companies, positions, args.versions, args.faqs, 5, args.seed)
+                file_db.STATIC_FILES_DIR = data_dir
+                files = len(os.listdir(data_dir))
+                per_size.append({
+                    "positions": positions,
+                    "files": files,
+                    "operations": {
+                        name: measure(operation, args.repeat)
+                        for name, operation in _operations(file_db, positions).items()
+                    }
+                })
+                print(f"Measured {positions} positions ({files} files)", file=sys.stderr)
+    finally:
+        file_db.STATIC_FILES_DIR = original_dir
+    
+    file_counts = [entry["files"] for entry in per_size]
+    growth = {}
+    for name in per_size[0]["operations"]:
+        slope = growth_slope(file_counts, [entry["operations"][name]["median_ms"] for entry in per_size])
+        growth[name] = {
+            "slope": round(slope, 3),
+            "super_linear": slope > SUPER_LINEAR_SLOPE
+        }
+    
+    results = {"sizes": per_size, "growth": growth}
+    write_report(build_report("file_db", vars(args), results), args.output)
+    
+    flagged = [name for name, entry in growth.items() if entry["super_linear"]]
+    if flagged:
+        print(f"Super-linear growth detected in: {', '.join(flagged)}", file=sys.stderr)
+        if args.fail_on_super_linear:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
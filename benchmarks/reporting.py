@@ -0,0 +1,112 @@
+"""
+Shared helpers for summarising and reporting benchmark results.
+"""
+
+import os
+import sys
+import json
+import platform
+import subprocess
+import logging
+import datetime
+from typing import Dict, Any, List, Optional
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+    
+    Args:
+        sorted_values: Values sorted in ascending order
+        pct: Percentile between 0 and 100
+        
+    Returns:
+        The percentile value, or 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize_latencies(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """
+    Summarise a list of request latencies
+    
+    Args:
+        latencies: Latencies in seconds of the successful requests
+        errors: Number of failed requests
+        elapsed: Wall-clock duration of the run in seconds
+        
+    Returns:
+        Dictionary with count, throughput and latency percentiles in milliseconds
+    """
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "count": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 3) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0
+    }
+
+def git_revision() -> Optional[str]:
+    """Return the current git commit hash, or None outside a git checkout"""
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_report(benchmark: str, parameters: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Wrap benchmark results with the metadata needed to compare runs
+    
+    Args:
+        benchmark: Name of the benchmark
+        parameters: The parameters the benchmark ran with
+        results: The benchmark results
+        
+    Returns:
+        Report dictionary
+    """
+    return {
+        "benchmark": benchmark,
+        "commit": git_revision(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "results": results
+    }
+
+def write_report(report: Dict[str, Any], output: Optional[str]) -> None:
+    """
+    Write a report as JSON to a file, or to stdout if no file is given
+    
+    Args:
+        report: The report to write
+        output: Output file path or None
+    """
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w') as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+def quiet_logging(level: int = logging.WARNING) -> None:
+    """
+    Raise the structlog level so per-request log lines do not skew timings
+    or interleave with a report written to stdout
+    
+    Args:
+        level: Minimum level to keep
+    """
+    from src.utils.logger import configure_logging
+    configure_logging(level=level)
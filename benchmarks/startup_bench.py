@@ -0,0 +1,147 @@
+"""
+Startup time benchmark for the API.
+
+Imports src.main in fresh interpreters with `python -X importtime`, reporting
+the median total import time and the slowest modules. Modules that are meant
+to load lazily (the LLM client libraries) are reported if they are imported at
+startup.
+
+Usage:
+    python -m benchmarks.startup_bench --runs 5 --max-import-ms 1000 --output startup.json
+"""
+
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.reporting import build_report, write_report
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Packages that must only be imported on first use
+LAZY_MODULES = ("langchain_anthropic", "anthropic", "langchain_core")
+
+_IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+def parse_import_times(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse `-X importtime` output
+    
+    Args:
+        stderr: Standard error of the interpreter
+        
+    Returns:
+        List of (module, self microseconds, cumulative microseconds, nesting depth)
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+def measure_startup(module: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Import a module in a fresh interpreter and collect its import times
+    
+    Args:
+        module: The module to import, e.g. 'src.main'
+        
+    Returns:
+        Parsed import times, see parse_import_times
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return parse_import_times(result.stderr)
+
+def direct_imports(entries: List[Tuple[str, int, int, int]], module: str) -> Dict[str, int]:
+    """
+    Find the modules imported directly by a top-level module
+    
+    Nested imports are printed before the module that triggered them, so the
+    direct imports are the entries one level deeper since the previous top-level entry.
+    
+    Args:
+        entries: Parsed import times, see parse_import_times
+        module: The top-level module
+        
+    Returns:
+        Dictionary of module name to cumulative microseconds
+    """
+    names = [entry[0] for entry in entries]
+    if module not in names:
+        return {}
+    result = {}
+    for name, _, cumulative, depth in reversed(entries[:names.index(module)]):
+        if depth == 0:
+            break
+        if depth == 1:
+            result[name] = cumulative
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the import time of the API")
+    parser.add_argument("--module", default="src.main", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to report")
+    parser.add_argument("--max-import-ms", type=float, default=1000,
+                        help="Exit with status 1 if the median import time exceeds this")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+    
+    totals_ms = []
+    self_times: Dict[str, List[int]] = {}
+    imported = set()
+    for run in range(args.runs):
+        entries = measure_startup(args.module)
+        total = next((cumulative for module, _, cumulative, _ in entries if module == args.module), 0)
+        totals_ms.append(total / 1000)
+        for module, self_us, _, _ in entries:
+            self_times.setdefault(module, []).append(self_us)
+            imported.add(module)
+        print(f"Run {run + 1}: {totals_ms[-1]:.1f} ms", file=sys.stderr)
+    
+    top_level = direct_imports(entries, args.module)
+    
+    eager_lazy_modules = sorted(module for module in imported if module.split(".")[0] in LAZY_MODULES)
+    median_ms = statistics.median(totals_ms)
+    results = {
+        "median_import_ms": round(median_ms, 1),
+        "min_import_ms": round(min(totals_ms), 1),
+        "max_import_ms": round(max(totals_ms), 1),
+        "slowest_modules_self_ms": [
+            {"module": module, "median_ms": round(statistics.median(times) / 1000, 2)}
+            for module, times in sorted(self_times.items(), key=lambda item: -statistics.median(item[1]))[:args.top]
+        ],
+        "slowest_direct_imports_ms": [
+            {"module": module, "cumulative_ms": round(cumulative / 1000, 2)}
+            for module, cumulative in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]
+        ],
+        "lazy_modules_imported_at_startup": eager_lazy_modules
+    }
+    write_report(build_report("startup", vars(args), results), args.output)
+    
+    failed = False
+    if eager_lazy_modules:
+        print(f"Modules meant to load lazily were imported at startup: {', '.join(eager_lazy_modules)}", file=sys.stderr)
+        failed = True
+    if median_ms > args.max_import_ms:
+        print(f"Median import time {median_ms:.1f} ms exceeds {args.max_import_ms:.0f} ms", file=sys.stderr)
+        failed = True
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
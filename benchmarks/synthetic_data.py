@@ -0,0 +1,176 @@
+"""
+Synthetic data generation for benchmarks.
+
+Writes company and position files using the same naming scheme as the
+staticFiles folder so the file database can be pointed at the generated
+directory unchanged.
+"""
+
+import os
+import json
+import random
+import datetime
+from typing import Dict, Any, List, Tuple
+
+FIRST_POSITION_ID = 1001
+FIRST_COMPANY_ID = 2001
+
+_TOPICS = [
+    "parking", "relocation", "visa sponsorship", "remote work", "on-call",
+    "interview process", "salary range", "equipment", "training budget",
+    "team size", "tech stack", "travel", "start date", "probation",
+    "annual leave", "health insurance", "promotion path", "office location",
+]
+
+_TEMPLATES = [
+    "Is {topic} available for this role?",
+    "What is the policy on {topic}?",
+    "Can you tell me more about {topic}?",
+    "How does {topic} work here?",
+]
+
+def _timestamp(rng: random.Random) -> str:
+    base = datetime.datetime(2025, 8, 1, tzinfo=datetime.timezone.utc)
+    return (base + datetime.timedelta(minutes=rng.randint(0, 60 * 24 * 60))).isoformat()
+
+def _question(rng: random.Random) -> str:
+    return rng.choice(_TEMPLATES).format(topic=rng.choice(_TOPICS))
+
+def build_company(company_id: int, faq_count: int, info_count: int, rng: random.Random) -> Dict[str, Any]:
+    """
+    Build a synthetic company document
+    
+    Args:
+        company_id: The company ID
+        faq_count: Number of company FAQs to generate
+        info_count: Number of company info items to generate
+        rng: Random number generator
+        
+    Returns:
+        Company data dictionary
+    """
+    return {
+        "companyFAQs": [
+            {
+                "id": 70001 + i,
+                "companyId": company_id,
+                "generatedByUser": rng.random() < 0.5,
+                "answeredByHR": True,
+                "timesAsked": rng.randint(1, 50),
+                "question": _question(rng),
+                "answer": f"Company answer {i} for {company_id}." if rng.random() < 0.7 else None,
+                "version": 1,
+                "timestamp": _timestamp(rng)
+            }
+            for i in range(faq_count)
+        ],
+        "companyInfo": [
+            {
+                "id": 80001 + i,
+                "companyId": company_id,
+                "generatedByUser": False,
+                "answeredByHR": True,
+                "subject": rng.choice(_TOPICS).title(),
+                "answer": f"Company info {i} for {company_id}.",
+                "version": 1,
+                "timestamp": _timestamp(rng)
+            }
+            for i in range(info_count)
+        ]
+    }
+
+def build_position(position_id: int, company_id: int, version: int, faq_count: int,
+                   info_count: int, rng: random.Random) -> Dict[str, Any]:
+    """
+    Build a synthetic position document
+    
+    Args:
+        position_id: The position ID
+        company_id: The ID of the company the position belongs to
+        version: The version number of the document
+        faq_count: Number of position FAQs to generate
+        info_count: Number of position info items to generate
+        rng: Random number generator
+        
+    Returns:
+        Position data dictionary
+    """
+    faqs = []
+    for i in range(faq_count):
+        answered = rng.random() < 0.6
+        faqs.append({
+            "id": 50001 + i,
+            "positionId": position_id,
+            "generatedByUser": not answered,
+            "answeredByHR": answered,
+            "timesAsked": rng.randint(1, 100),
+            "question": _question(rng),
+            "response": f"Answer {i} for position {position_id}." if answered else None,
+            "version": 1,
+            "timestamp": _timestamp(rng)
+        })
+    return {
+        "position": {
+            "id": position_id,
+            "companyId": company_id,
+            "positionTitle": f"Synthetic Position {position_id}",
+            "positionDescription": f"Synthetic Position {position_id}. Generated for benchmarking.",
+            "version": version,
+            "timestamp": _timestamp(rng)
+        },
+        "positionFAQs": faqs,
+        "positionInfo": [
+            {
+                "id": 60001 + i,
+                "positionId": position_id,
+                "generatedByUser": False,
+                "answeredByHR": True,
+                "subject": rng.choice(_TOPICS).title(),
+                "answer": f"Info {i} for position {position_id}.",
+                "version": 1,
+                "timestamp": _timestamp(rng)
+            }
+            for i in range(info_count)
+        ]
+    }
+
+def generate_dataset(directory: str, companies: int = 10, positions: int = 100, versions: int = 5,
+                     faqs_per_position: int = 20, info_per_position: int = 5,
+                     seed: int = 42) -> Tuple[List[int], List[int]]:
+    """
+    Generate a synthetic dataset of companies and versioned positions
+    
+    Positions are assigned to companies round-robin. Every version of a
+    position is written as its own file, mirroring how the API stores edits.
+    
+    Args:
+        directory: Directory to write the files to (created if missing)
+        companies: Number of companies
+        positions: Number of positions
+        versions: Number of versions per position
+        faqs_per_position: Number of FAQs in each position version
+        info_per_position: Number of info items in each position version
+        seed: Seed for the random number generator
+        
+    Returns:
+        Tuple of (company_ids, position_ids)
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    
+    company_ids = [FIRST_COMPANY_ID + i for i in range(companies)]
+    position_ids = [FIRST_POSITION_ID + i for i in range(positions)]
+    
+    for company_id in company_ids:
+        data = build_company(company_id, faqs_per_position, info_per_position, rng)
+        with open(os.path.join(directory, f"example-data-com-{company_id}-1.json"), 'w') as file:
+            json.dump(data, file)
+    
+    for index, position_id in enumerate(position_ids):
+        company_id = company_ids[index % len(company_ids)]
+        for version in range(1, versions + 1):
+            data = build_position(position_id, company_id, version, faqs_per_position, info_per_position, rng)
+            with open(os.path.join(directory, f"example-data-pos-{position_id}-{version}.json"), 'w') as file:
+                json.dump(data, file)
+    
+    return company_ids, position_ids
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+from src.config import settings
+from src.api.chat_request_model import ChatRequest
+
+MAX_BATCH_QUESTIONS = settings.max_batch_questions
+
+class BatchChatRequest(BaseModel):
+    """
+    Model for batch chat request validation
+    """
+    questions: List[ChatRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_QUESTIONS,
+        description="The questions from the user, each with the ID of the position it is about"
+    )
@@ -1,10 +1,8 @@
 from pydantic import BaseModel, Field, validator
 from typing import Optional
-from dotenv import load_dotenv
-import os
+from src.config import settings
 
-load_dotenv()
-MAX_QUESTION_LENGTH = int(os.getenv("MAX_QUESTION_LENGTH", "5000"))
+MAX_QUESTION_LENGTH = settings.max_question_length
 
 class ChatRequest(BaseModel):
     """
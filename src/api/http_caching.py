@@ -0,0 +1,127 @@
+# src/api/http_caching.py
+"""
+Helpers for conditional GET requests with ETags.
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from src.config import settings
+
+CACHE_CONTROL_MAX_AGE = settings.cache_control_max_age
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values that determine a response
+    
+    Args:
+        parts: Values identifying the response content, e.g. IDs and version numbers
+        
+    Returns:
+        The quoted ETag
+    """
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+def version_etag(version: int, *parts: Any) -> str:
+    """
+    Build a strong ETag that starts with the version of the resource
+    
+    Unlike make_etag, the version can be read back from the ETag, so a client can
+    send it in If-Match (see parse_version_precondition).
+    
+    Args:
+        version: The latest version of the resource
+        parts: Other values the response depends on, e.g. the field projection
+        
+    Returns:
+        The quoted ETag, e.g. '"3"', or '"3-<digest>"' if parts are given
+    """
+    if not any(parts):
+        return f'"{version}"'
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return f'"{version}-{digest[:16]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag
+    
+    Uses the weak comparison required for If-None-Match, so W/ prefixes are ignored.
+    
+    Args:
+        if_none_match: The If-None-Match header value, if any
+        etag: The current ETag of the resource
+        
+    Returns:
+        True if the client's cached copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """
+    Build the caching headers for a response
+    
+    Args:
+        etag: The ETag of the response
+        
+    Returns:
+        Dictionary of header names to values
+    """
+    return {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={CACHE_CONTROL_MAX_AGE}, must-revalidate"
+    }
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Return a 304 response if the request's If-None-Match matches the ETag
+    
+    Args:
+        request: The incoming request
+        etag: The current ETag of the resource
+        
+    Returns:
+        A 304 Not Modified response, or None if the full response must be sent
+    """
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
+
+def parse_version_precondition(if_match: Optional[str]) -> Optional[int]:
+    """
+    Parse an If-Match header carrying the version an update is based on
+    
+    Accepts the ETags built by version_etag, e.g. from GET /v1/position/{id}/versions.
+    
+    Args:
+        if_match: The If-Match header value, e.g. '"3"' or '"3-<digest>"', or None
+        
+    Returns:
+        The expected version, or None if any version is acceptable ('*' or no header)
+        
+    Raises:
+        ValueError: If the header is not a single version number
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    value = value.strip('"').split("-", 1)[0]
+    if not value.isdigit():
+        raise ValueError(f"If-Match must be a single position version, e.g. \"3\", got: {if_match}")
+    return int(value)
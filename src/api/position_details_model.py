@@ -8,3 +8,15 @@ class PositionDetailsRequest(BaseModel):
     position: Dict[str, Any] = Field(..., description="Position information")
     positionFAQs: Optional[List[Dict[str, Any]]] = Field(None, description="Position FAQs")
     positionInfo: Optional[List[Dict[str, Any]]] = Field(None, description="Position information items")
+
+class PositionDetailsPatchRequest(BaseModel):
+    """
+    Model for an item-level position details update
+    
+    Position fields are merged into the current position. FAQ and info items are
+    matched by ID: existing items are updated with the given fields and items without
+    an ID, or with an unknown ID, are added.
+    """
+    position: Optional[Dict[str, Any]] = Field(None, description="Position fields to change")
+    positionFAQs: Optional[List[Dict[str, Any]]] = Field(None, description="Position FAQs to update or add")
+    positionInfo: Optional[List[Dict[str, Any]]] = Field(None, description="Position information items to update or add")
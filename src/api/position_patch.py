@@ -0,0 +1,167 @@
+# src/api/position_patch.py
+"""
+Partial updates of position details.
+
+Supports RFC 6902 JSON Patch documents and item-level upserts keyed by FAQ/info ID.
+Both produce a function that is applied to the latest position data while its
+entry lock is held (see file_db.update_position_data).
+"""
+
+import copy
+import datetime
+from typing import Any, Callable, Dict, Optional
+
+import jsonpatch
+import jsonpointer
+from pydantic import ValidationError
+
+from src.api.position_details_model import PositionDetailsPatchRequest
+
+JSON_PATCH_MEDIA_TYPE = "application/json-patch+json"
+
+# First ID given to new items of each list
+ITEM_LISTS = {"positionFAQs": 50001, "positionInfo": 60001}
+
+class InvalidPatchError(ValueError):
+    """Raised when a patch request is malformed"""
+
+class PatchConflictError(Exception):
+    """Raised when a patch cannot be applied to the current position data"""
+
+def build_position_patch(body: Any, content_type: Optional[str], position_id: int) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Build the update function for a patch request body
+    
+    Args:
+        body: The parsed JSON request body
+        content_type: The request Content-Type header
+        position_id: The ID of the position being patched
+        
+    Returns:
+        Function taking the latest position data and returning the patched data
+        
+    Raises:
+        InvalidPatchError: If the body is not a valid JSON Patch or upsert request
+    """
+    is_json_patch = (content_type or "").split(";")[0].strip().lower() == JSON_PATCH_MEDIA_TYPE
+    
+    if is_json_patch or isinstance(body, list):
+        if not isinstance(body, list):
+            raise InvalidPatchError("A JSON Patch must be an array of operations")
+        try:
+            patch = jsonpatch.JsonPatch(body)
+        except (jsonpatch.InvalidJsonPatch, jsonpointer.JsonPointerException, TypeError) as e:
+            raise InvalidPatchError(f"Invalid JSON Patch: {str(e)}")
+        
+        def apply_patch(data: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                patched = patch.apply(data)
+            except (jsonpatch.JsonPatchException, jsonpointer.JsonPointerException, KeyError, IndexError, TypeError) as e:
+                raise PatchConflictError(f"JSON Patch could not be applied: {str(e)}")
+            return finalize_position_data(data, patched, position_id)
+        return apply_patch
+    
+    try:
+        changes = PositionDetailsPatchRequest.model_validate(body)
+    except ValidationError as e:
+        raise InvalidPatchError(f"Invalid position details update: {e.errors(include_url=False)}")
+    
+    def apply_changes(data: Dict[str, Any]) -> Dict[str, Any]:
+        patched = copy.deepcopy(data)
+        apply_upserts(patched, changes)
+        return finalize_position_data(data, patched, position_id)
+    return apply_changes
+
+def apply_upserts(data: Dict[str, Any], changes: PositionDetailsPatchRequest) -> None:
+    """
+    Apply item-level upserts to position data in place
+    
+    Args:
+        data: The position data to update
+        changes: The requested changes
+    """
+    if changes.position:
+        data.setdefault("position", {}).update(changes.position)
+    
+    for list_name in ITEM_LISTS:
+        items = getattr(changes, list_name)
+        if not items:
+            continue
+        existing = {item.get("id"): item for item in data.setdefault(list_name, []) if isinstance(item, dict)}
+        for item in items:
+            current = existing.get(item.get("id")) if item.get("id") is not None else None
+            if current is not None:
+                current.update(item)
+            else:
+                data[list_name].append(dict(item))
+
+def finalize_position_data(original: Dict[str, Any], patched: Any, position_id: int) -> Dict[str, Any]:
+    """
+    Validate patched position data and fill in the fields the server owns
+    
+    IDs are restored, new items get IDs and defaults, and the version and timestamp
+    of every changed item are bumped.
+    
+    Args:
+        original: The position data before the patch
+        patched: The patched position data
+        position_id: The ID of the position
+        
+    Returns:
+        The position data to save
+        
+    Raises:
+        PatchConflictError: If the patched data is not a valid position document
+    """
+    if not isinstance(patched, dict) or not isinstance(patched.get("position"), dict):
+        raise PatchConflictError("The patched document must contain a position object")
+    
+    patched["position"]["id"] = position_id
+    now = datetime.datetime.now().isoformat()
+    
+    for list_name, first_id in ITEM_LISTS.items():
+        items = patched.get(list_name)
+        if items is None:
+            continue
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise PatchConflictError(f"{list_name} must be an array of objects")
+        
+        previous = {item.get("id"): item for item in original.get(list_name) or []}
+        next_id = max([first_id - 1] + [item["id"] for item in items if isinstance(item.get("id"), int)]) + 1
+        seen_ids = set()
+        for item in items:
+            if item.get("id") is None:
+                item["id"] = next_id
+                next_id += 1
+            if item["id"] in seen_ids:
+                raise PatchConflictError(f"Duplicate {list_name} ID: {item['id']}")
+            seen_ids.add(item["id"])
+            item["positionId"] = position_id
+            _touch_item(item, previous.get(item["id"]), list_name, now)
+    
+    return patched
+
+def _touch_item(item: Dict[str, Any], previous: Optional[Dict[str, Any]], list_name: str, now: str) -> None:
+    if previous is None:
+        item.setdefault("generatedByUser", False)
+        item.setdefault("answeredByHR", True)
+        if list_name == "positionFAQs":
+            item.setdefault("timesAsked", 0)
+            item.setdefault("response", None)
+        item["version"] = 1
+        item["timestamp"] = now
+        return
+    
+    changed = _without_metadata(item) != _without_metadata(previous)
+    # Clients cannot set the item version or timestamp directly
+    for key in ("version", "timestamp"):
+        if key in previous:
+            item[key] = previous[key]
+        else:
+            item.pop(key, None)
+    if changed:
+        item["version"] = previous.get("version", 0) + 1
+        item["timestamp"] = now
+
+def _without_metadata(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in item.items() if key not in ("version", "timestamp")}
@@ -0,0 +1,93 @@
+# src/api/projection.py
+"""
+Field projection for list endpoints.
+
+A `fields` query parameter such as "position.id,position.positionTitle,positionFAQs.question"
+selects the parts of each document to return. Lists are projected item by item.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+FIELD_PATH = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$')
+
+FieldTree = Dict[str, "FieldTree"]
+
+def parse_fields(fields: Optional[str]) -> Optional[FieldTree]:
+    """
+    Parse a comma separated list of dotted field paths into a field tree
+    
+    Args:
+        fields: The fields parameter, e.g. "position.id,position.version"
+        
+    Returns:
+        Nested dictionary of selected fields (an empty dictionary selects the whole
+        value), or None if no projection was requested
+        
+    Raises:
+        ValueError: If a field path is malformed
+    """
+    if fields is None or not fields.strip():
+        return None
+    
+    tree: FieldTree = {}
+    for path in fields.split(","):
+        path = path.strip()
+        if not FIELD_PATH.match(path):
+            raise ValueError(f"Invalid field path: '{path}'")
+        node = tree
+        parts = path.split(".")
+        for index, part in enumerate(parts):
+            if part in node and not node[part]:
+                # A parent path already selects the whole value
+                break
+            if index == len(parts) - 1:
+                node[part] = {}
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+def canonical_fields(tree: Optional[FieldTree]) -> str:
+    """
+    Render a field tree in a canonical form, e.g. for use in an ETag
+    
+    Args:
+        tree: The parsed field tree
+        
+    Returns:
+        Sorted comma separated field paths, or an empty string for no projection
+    """
+    if tree is None:
+        return ""
+    
+    paths = []
+    def walk(node: FieldTree, prefix: str) -> None:
+        for name in sorted(node):
+            path = f"{prefix}{name}"
+            if node[name]:
+                walk(node[name], f"{path}.")
+            else:
+                paths.append(path)
+    walk(tree, "")
+    return ",".join(paths)
+
+def project(value: Any, tree: Optional[FieldTree]) -> Any:
+    """
+    Apply a field tree to a value
+    
+    Fields that do not exist in the value are omitted.
+    
+    Args:
+        value: A document, list of documents or scalar
+        tree: The parsed field tree, or None to return the value unchanged
+        
+    Returns:
+        The projected value
+    """
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {name: project(value[name], subtree) for name, subtree in tree.items() if name in value}
+    return value
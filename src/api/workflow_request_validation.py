@@ -1,11 +1,9 @@
 # src/api/validation.py
 
 from pydantic import BaseModel, field_validator
-from dotenv import load_dotenv
-import os
+from src.config import settings
 
-load_dotenv()
-MAX_INPUT_LENGTH = os.getenv("MAX_INPUT_LENGTH", 5000)
+MAX_INPUT_LENGTH = settings.max_input_length
     
 def validate_input(text: str, max_length: int = int(MAX_INPUT_LENGTH) | 5000) -> None:
     """
@@ -0,0 +1,150 @@
+# src/config.py
+"""
+Application settings, read once from the environment and the .env file.
+"""
+
+import os
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+def _get_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+def _get_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+def _get_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, "true" if default else "false").lower() == "true"
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Settings for the API, workflow and tooling
+    
+    Modules copy the values they need into module-level constants at import time,
+    so tests can still patch those constants.
+    """
+    llm_model_id: str
+    logging_level: str
+    log_async: bool
+    log_queue_size: int
+    log_sample_rates: str
+    log_max_field_length: int
+    max_question_length: int
+    max_input_length: int
+    max_batch_questions: int
+    batch_max_concurrency: int
+    bulk_answer_batch_size: int
+    bulk_answer_concurrency: int
+    server_timing_enabled: bool
+    positions_page_max_limit: int
+    search_max_limit: int
+    faq_stats_top_k: int
+    gzip_minimum_size: int
+    gzip_compress_level: int
+    cache_control_max_age: int
+    usage_stats_file: str
+    usage_persist_interval: float
+    llm_input_cost_per_mtok: float
+    llm_output_cost_per_mtok: float
+    document_cache_max_bytes: int
+    warmup_enabled: bool
+    warmup_positions: int
+    warmup_llm_ping: bool
+    answer_cache_size: int
+    company_answer_reuse_enabled: bool
+    company_answer_min_similarity: float
+    duplicate_question_threshold: float
+    question_classifier_enabled: bool
+    question_classifier_threshold: float
+    question_classifier_max_examples: int
+    question_classifier_training_file: str
+    admission_max_in_flight: int
+    admission_max_queue: int
+    admission_queue_timeout: float
+    admission_retry_after: int
+    file_watcher_mode: str
+    file_watcher_poll_interval: float
+    shared_store_path: str
+    shared_store_log_entries: int
+    shared_store_doc_slots: int
+    shared_store_slot_bytes: int
+    email_outbox_file: str
+    email_transport: str
+    email_file_dir: str
+    email_smtp_host: str
+    email_smtp_port: int
+    email_sender: str
+    email_digest_interval: float
+    email_send_concurrency: int
+    email_max_attempts: int
+    hiring_manager_email: str
+    
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Load the .env file and read the settings from the environment
+        
+        Returns:
+            The settings, with defaults for unset variables
+        """
+        load_dotenv()
+        return cls(
+            llm_model_id=os.getenv("LLM_MODEL_ID", "claude-3-haiku-20240307"),
+            logging_level=os.getenv("LOGGING_LEVEL", "20"),
+            log_async=_get_bool("LOG_ASYNC", True),
+            log_queue_size=_get_int("LOG_QUEUE_SIZE", 10000),
+            log_sample_rates=os.getenv("LOG_SAMPLE_RATES", ""),
+            log_max_field_length=_get_int("LOG_MAX_FIELD_LENGTH", 2000),
+            max_question_length=_get_int("MAX_QUESTION_LENGTH", 5000),
+            max_input_length=_get_int("MAX_INPUT_LENGTH", 5000),
+            max_batch_questions=_get_int("MAX_BATCH_QUESTIONS", 20),
+            batch_max_concurrency=_get_int("BATCH_MAX_CONCURRENCY", 4),
+            bulk_answer_batch_size=_get_int("BULK_ANSWER_BATCH_SIZE", 10),
+            bulk_answer_concurrency=_get_int("BULK_ANSWER_CONCURRENCY", 4),
+            server_timing_enabled=_get_bool("SERVER_TIMING_ENABLED", False),
+            positions_page_max_limit=_get_int("POSITIONS_PAGE_MAX_LIMIT", 100),
+            search_max_limit=_get_int("SEARCH_MAX_LIMIT", 50),
+            faq_stats_top_k=_get_int("FAQ_STATS_TOP_K", 20),
+            gzip_minimum_size=_get_int("GZIP_MINIMUM_SIZE", 1024),
+            gzip_compress_level=_get_int("GZIP_COMPRESS_LEVEL", 5),
+            cache_control_max_age=_get_int("CACHE_CONTROL_MAX_AGE", 0),
+            usage_stats_file=os.getenv("USAGE_STATS_FILE", ""),
+            usage_persist_interval=_get_float("USAGE_PERSIST_INTERVAL", 60),
+            llm_input_cost_per_mtok=_get_float("LLM_INPUT_COST_PER_MTOK", 0.25),
+            llm_output_cost_per_mtok=_get_float("LLM_OUTPUT_COST_PER_MTOK", 1.25),
+            document_cache_max_bytes=_get_int("DOCUMENT_CACHE_MAX_BYTES", 32 * 1024 * 1024),
+            warmup_enabled=_get_bool("WARMUP_ENABLED", True),
+            warmup_positions=_get_int("WARMUP_POSITIONS", 20),
+            warmup_llm_ping=_get_bool("WARMUP_LLM_PING", False),
+            answer_cache_size=_get_int("ANSWER_CACHE_SIZE", 1024),
+            company_answer_reuse_enabled=_get_bool("COMPANY_ANSWER_REUSE_ENABLED", True),
+            company_answer_min_similarity=_get_float("COMPANY_ANSWER_MIN_SIMILARITY", 0.8),
+            duplicate_question_threshold=_get_float("DUPLICATE_QUESTION_THRESHOLD", 0.8),
+            question_classifier_enabled=_get_bool("QUESTION_CLASSIFIER_ENABLED", True),
+            question_classifier_threshold=_get_float("QUESTION_CLASSIFIER_THRESHOLD", 0.9),
+            question_classifier_max_examples=_get_int("QUESTION_CLASSIFIER_MAX_EXAMPLES", 2000),
+            question_classifier_training_file=os.getenv("QUESTION_CLASSIFIER_TRAINING_FILE", ""),
+            admission_max_in_flight=_get_int("ADMISSION_MAX_IN_FLIGHT", 8),
+            admission_max_queue=_get_int("ADMISSION_MAX_QUEUE", 32),
+            admission_queue_timeout=_get_float("ADMISSION_QUEUE_TIMEOUT", 10),
+            admission_retry_after=_get_int("ADMISSION_RETRY_AFTER", 2),
+            file_watcher_mode=os.getenv("FILE_WATCHER_MODE", "auto"),
+            file_watcher_poll_interval=_get_float("FILE_WATCHER_POLL_INTERVAL", 2),
+            shared_store_path=os.getenv("SHARED_STORE_PATH", ""),
+            shared_store_log_entries=_get_int("SHARED_STORE_LOG_ENTRIES", 4096),
+            shared_store_doc_slots=_get_int("SHARED_STORE_DOC_SLOTS", 256),
+            shared_store_slot_bytes=_get_int("SHARED_STORE_SLOT_BYTES", 65536),
+            email_outbox_file=os.getenv("EMAIL_OUTBOX_FILE", ""),
+            email_transport=os.getenv("EMAIL_TRANSPORT", "log"),
+            email_file_dir=os.getenv("EMAIL_FILE_DIR", "sent_emails"),
+            email_smtp_host=os.getenv("EMAIL_SMTP_HOST", "localhost"),
+            email_smtp_port=_get_int("EMAIL_SMTP_PORT", 1025),
+            email_sender=os.getenv("EMAIL_SENDER", "faq-bot@localhost"),
+            email_digest_interval=_get_float("EMAIL_DIGEST_INTERVAL", 300),
+            email_send_concurrency=_get_int("EMAIL_SEND_CONCURRENCY", 4),
+            email_max_attempts=_get_int("EMAIL_MAX_ATTEMPTS", 5),
+            hiring_manager_email=os.getenv("HIRING_MANAGER_EMAIL", "")
+        )
+
+settings = Settings.from_env()
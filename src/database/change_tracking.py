@@ -0,0 +1,100 @@
+"""
+Incremental refresh of in-memory views built from the latest file_db entries.
+
+file_db change listeners are called with the file index locked, so a view must
+not take any lock that is also held while reading from file_db. ChangeTracker
+records changed entries under a lock of its own, and loads them outside of the
+view's lock: the view only locks its state to apply the loaded documents.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from src.database import file_db
+
+# (data type, entry ID)
+Entry = Tuple[str, int]
+
+# Called with (rebuild, documents): rebuild is True when the documents are all
+# the entries of a new data directory, and a document is None when the entry
+# no longer exists
+ApplyChanges = Callable[[bool, Dict[Entry, Optional[Dict[str, Any]]]], None]
+
+def _load(entry: Entry) -> Optional[Dict[str, Any]]:
+    data_type, data_id = entry
+    if data_type == "pos":
+        return file_db.get_position_data(data_id)
+    return file_db.get_company_data(data_id)
+
+class ChangeTracker:
+    """
+    Entries changed since a view was last refreshed
+    """
+
+    def __init__(self, data_types: Iterable[str]):
+        self._data_types = frozenset(data_types)
+        # Only held to update the changed entries, never while reading from file_db
+        self._lock = threading.Lock()
+        self._changed: Set[Entry] = set()
+        # Serializes refreshes, so an older document is never applied after a newer one
+        self._refresh_lock = threading.Lock()
+        # Data directory the view was built from, None until the first refresh
+        self._directory: Optional[str] = None
+
+    def mark_changed(self, data_type: str, data_id: int) -> None:
+        """
+        Change listener marking an entry to be re-read on the next refresh
+
+        Args:
+            data_type: The type of data ('com' or 'pos')
+            data_id: The ID of the entry
+        """
+        if data_type in self._data_types:
+            with self._lock:
+                self._changed.add((data_type, data_id))
+
+    def clear(self) -> None:
+        """Forget the changes so that the next refresh rebuilds the view"""
+        with self._refresh_lock:
+            with self._lock:
+                self._changed.clear()
+                self._directory = None
+
+    def refresh(self, apply: ApplyChanges, wait: bool = True) -> bool:
+        """
+        Load the changed entries, or all entries if the data directory changed, and apply them
+
+        Args:
+            apply: Function applying the loaded documents to the view
+            wait: Whether to wait for a refresh running in another thread
+
+        Returns:
+            False if another thread was refreshing and wait is False, otherwise True
+        """
+        if not self._refresh_lock.acquire(blocking=wait):
+            return False
+        try:
+            directory = file_db.STATIC_FILES_DIR
+            with self._lock:
+                rebuild = directory != self._directory
+                changed, self._changed = self._changed, set()
+            if rebuild:
+                entries = []
+                if "pos" in self._data_types:
+                    entries += [("pos", position_id) for position_id in file_db.get_position_ids()]
+                if "com" in self._data_types:
+                    entries += [("com", company_id) for company_id in file_db.get_company_ids()]
+            else:
+                entries = sorted(changed)
+            if entries or rebuild:
+                try:
+                    apply(rebuild, {entry: _load(entry) for entry in entries})
+                except Exception:
+                    # Retry the entries on the next refresh
+                    with self._lock:
+                        self._changed |= changed
+                    raise
+            self._directory = directory
+            return True
+        finally:
+            self._refresh_lock.release()
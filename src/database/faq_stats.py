@@ -0,0 +1,197 @@
+"""
+Aggregated FAQ statistics per position and company.
+
+Aggregates are built from the latest position documents on the first request
+and then kept current entry by entry: file_db change listeners mark saved or
+externally changed positions, and only those are re-read before the next
+request. Requests are answered from the aggregates without loading documents,
+and changed documents are read before the aggregates are locked.
+
+Questions asked per day are derived from timesAsked increases, dated by the
+FAQ's timestamp (set when it is asked). Asks recorded before the aggregates
+were built are all dated by the FAQ's last timestamp.
+"""
+
+import datetime
+import heapq
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from src.config import settings
+from src.database import file_db
+from src.database.change_tracking import ChangeTracker, Entry
+
+FAQ_STATS_TOP_K = settings.faq_stats_top_k
+
+@dataclass
+class _FaqState:
+    """The counted fields of one position FAQ"""
+    times_asked: int
+    answered: bool
+
+@dataclass
+class _PositionStats:
+    """Aggregates of one position's FAQs"""
+    company_id: Optional[int]
+    faqs: Dict[int, _FaqState] = field(default_factory=dict)
+    answered: int = 0
+    unanswered: int = 0
+    times_asked: int = 0
+    # Unanswered FAQs with the highest timesAsked, highest first
+    top_unanswered: List[Dict[str, Any]] = field(default_factory=list)
+    asked_per_day: Counter = field(default_factory=Counter)
+
+def _ask_day(timestamp: Any) -> str:
+    """The date of an FAQ timestamp, or today if it has none"""
+    if isinstance(timestamp, str):
+        try:
+            return datetime.date.fromisoformat(timestamp[:10]).isoformat()
+        except ValueError:
+            pass
+    return datetime.date.today().isoformat()
+
+def _summarize(count: int, answered: int, unanswered: int, times_asked: int,
+               top_unanswered: List[Dict[str, Any]], asked_per_day: Counter) -> Dict[str, Any]:
+    return {
+        "faqCount": count,
+        "answeredCount": answered,
+        "unansweredCount": unanswered,
+        "answeredRatio": round(answered / count, 4) if count else None,
+        "timesAsked": times_asked,
+        "topUnanswered": top_unanswered,
+        "askedPerDay": dict(sorted(asked_per_day.items()))
+    }
+
+class FaqStats:
+    """
+    Incrementally maintained FAQ aggregates for positions and companies
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._changes = ChangeTracker(("pos",))
+        self._positions: Dict[int, _PositionStats] = {}
+        self._company_positions: Dict[int, Set[int]] = {}
+
+    def mark_changed(self, data_type: str, data_id: int) -> None:
+        """
+        Change listener marking a position to be re-read before the next request
+
+        Args:
+            data_type: The type of data ('com' or 'pos')
+            data_id: The ID of the entry
+        """
+        self._changes.mark_changed(data_type, data_id)
+
+    def clear(self) -> None:
+        """Drop the aggregates so they are rebuilt on the next request"""
+        self._changes.clear()
+        with self._lock:
+            self._positions.clear()
+            self._company_positions.clear()
+
+    def _reindex(self, position_id: int, data: Optional[Dict[str, Any]]) -> None:
+        old = self._positions.pop(position_id, None)
+        if old is not None and old.company_id in self._company_positions:
+            self._company_positions[old.company_id].discard(position_id)
+        if data is None:
+            return
+
+        stats = _PositionStats(company_id=(data.get("position") or {}).get("companyId"))
+        if old is not None:
+            stats.asked_per_day = old.asked_per_day
+        unanswered = []
+        for faq in data.get("positionFAQs") or []:
+            faq_id = faq.get("id")
+            if faq_id is None or faq_id in stats.faqs:
+                continue
+            state = _FaqState(times_asked=faq.get("timesAsked") or 0, answered=bool(faq.get("response")))
+            stats.faqs[faq_id] = state
+            stats.times_asked += state.times_asked
+
+            # Count the asks since the position was last aggregated
+            previous = old.faqs.get(faq_id) if old is not None else None
+            asked = state.times_asked - (previous.times_asked if previous is not None else 0)
+            if asked > 0:
+                stats.asked_per_day[_ask_day(faq.get("timestamp"))] += asked
+
+            if state.answered:
+                stats.answered += 1
+            else:
+                stats.unanswered += 1
+                unanswered.append({
+                    "id": faq_id,
+                    "positionId": position_id,
+                    "question": faq.get("question"),
+                    "timesAsked": state.times_asked,
+                    "timestamp": faq.get("timestamp")
+                })
+        stats.top_unanswered = heapq.nlargest(FAQ_STATS_TOP_K, unanswered, key=lambda item: item["timesAsked"])
+
+        self._positions[position_id] = stats
+        self._company_positions.setdefault(stats.company_id, set()).add(position_id)
+
+    def _apply(self, rebuild: bool, documents: Dict[Entry, Optional[Dict[str, Any]]]) -> None:
+        with self._lock:
+            if rebuild:
+                self._positions.clear()
+                self._company_positions.clear()
+            for (_, position_id), data in documents.items():
+                self._reindex(position_id, data)
+
+    def position_stats(self, position_id: int, limit: int = FAQ_STATS_TOP_K) -> Optional[Dict[str, Any]]:
+        """
+        Get the FAQ statistics of a position
+
+        Args:
+            position_id: The ID of the position
+            limit: Maximum number of unanswered FAQs to list
+
+        Returns:
+            The statistics, or None if the position does not exist
+        """
+        self._changes.refresh(self._apply)
+        with self._lock:
+            stats = self._positions.get(position_id)
+            if stats is None:
+                return None
+            result = {"positionId": position_id, "companyId": stats.company_id}
+            result.update(_summarize(len(stats.faqs), stats.answered, stats.unanswered, stats.times_asked,
+                                     stats.top_unanswered[:limit], stats.asked_per_day))
+            return result
+
+    def company_stats(self, company_id: int, limit: int = FAQ_STATS_TOP_K) -> Optional[Dict[str, Any]]:
+        """
+        Get the FAQ statistics of all positions of a company
+
+        Args:
+            company_id: The ID of the company
+            limit: Maximum number of unanswered FAQs to list
+
+        Returns:
+            The statistics, or None if the company has no positions
+        """
+        self._changes.refresh(self._apply)
+        with self._lock:
+            positions = [self._positions[position_id] for position_id in self._company_positions.get(company_id, ())]
+            if not positions:
+                return None
+
+            asked_per_day = Counter()
+            for stats in positions:
+                asked_per_day.update(stats.asked_per_day)
+            # Each position keeps its own top unanswered FAQs, so the company's are among them
+            top_unanswered = heapq.nlargest(limit, (item for stats in positions for item in stats.top_unanswered),
+                                            key=lambda item: item["timesAsked"])
+            result = {"companyId": company_id, "positionCount": len(positions)}
+            result.update(_summarize(sum(len(stats.faqs) for stats in positions),
+                                     sum(stats.answered for stats in positions),
+                                     sum(stats.unanswered for stats in positions),
+                                     sum(stats.times_asked for stats in positions),
+                                     top_unanswered, asked_per_day))
+            return result
+
+faq_stats = FaqStats()
+file_db.add_change_listener(faq_stats.mark_changed)
@@ -6,11 +6,31 @@ import os
 import json
 import re
 import glob
-from typing import Dict, Any, Optional, List, Tuple
+import bisect
+import copy
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Set, Tuple, Iterator, Callable
+from src.config import settings
 from src.utils.logger import log
+from src.utils.timing import timed
+from src.utils.metrics import FILE_DB_OPERATIONS, FILE_DB_BYTES, record_cache_lookup
 
 # Base directory for static files
 STATIC_FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "staticFiles")
+FILE_WATCHER_MODE = settings.file_watcher_mode
+FILE_WATCHER_POLL_INTERVAL = settings.file_watcher_poll_interval
+
+# Store shared with the other workers on this host, see src/launcher.py
+_shared_store = None
+if settings.shared_store_path:
+    from src.database.shared_store import SharedStore
+    _shared_store = SharedStore(
+        settings.shared_store_path,
+        settings.shared_store_log_entries,
+        settings.shared_store_doc_slots,
+        settings.shared_store_slot_bytes
+    )
 
 def _get_file_pattern(data_type: str, data_id: Optional[int] = None) -> str:
     """
@@ -44,6 +64,588 @@ def _parse_file_info(file_path: str) -> Tuple[str, int, int]:
         return data_type, int(data_id), int(version)
     raise ValueError(f"Invalid file name format: {file_name}")
 
+class _DocumentCache:
+    """
+    LRU cache of the raw contents of data files, bounded by total size
+    
+    Raw bytes are cached rather than parsed documents because callers modify the
+    documents they get, and parsing the cached bytes is as fast as copying a
+    parsed document. Entries are validated against the file's modification time
+    and size, so files changed on disk are read again.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], bytes]]" = OrderedDict()
+        self._size = 0
+    
+    def get(self, file_path: str, stat: os.stat_result) -> Optional[bytes]:
+        """Return the cached contents of a file if they match its current stat"""
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is None or entry[0] != (stat.st_mtime_ns, stat.st_size):
+                return None
+            self._entries.move_to_end(file_path)
+            return entry[1]
+    
+    def put(self, file_path: str, stat: os.stat_result, raw: bytes) -> None:
+        """Cache the contents of a file, evicting the least recently used files if needed"""
+        if len(raw) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(file_path, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[file_path] = ((stat.st_mtime_ns, stat.st_size), raw)
+            self._size += len(raw)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+    
+    def discard(self, file_path: str) -> None:
+        """Remove the entry for a file if there is one"""
+        with self._lock:
+            entry = self._entries.pop(file_path, None)
+            if entry is not None:
+                self._size -= len(entry[1])
+    
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+_documents = _DocumentCache(settings.document_cache_max_bytes)
+
+def _read_raw_file(file_path: str) -> bytes:
+    """
+    Read the contents of a data file, recording read metrics
+    
+    Recently read and written files are served from the document cache.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        The raw file contents
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        stat = None
+    
+    raw = _documents.get(file_path, stat) if stat is not None else None
+    record_cache_lookup("documents", raw is not None)
+    if raw is None:
+        with open(file_path, 'rb') as file:
+            raw = file.read()
+        FILE_DB_OPERATIONS.inc(operation="read")
+        FILE_DB_BYTES.inc(len(raw), operation="read")
+        if stat is not None:
+            _documents.put(file_path, stat, raw)
+    return raw
+
+def _read_json_file(file_path: str) -> Dict[str, Any]:
+    """
+    Read and parse a JSON data file
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        The parsed data
+    """
+    return json.loads(_read_raw_file(file_path))
+
+def _read_data_file(file_path: str) -> Dict[str, Any]:
+    """
+    Read and parse one version of an entry
+    
+    In multi-worker mode the shared document slots are tried first, and files
+    read from disk are put in them for the other workers.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        The parsed data
+    """
+    if _shared_store is None:
+        return _read_json_file(file_path)
+    
+    data_type, data_id, version = _parse_file_info(file_path)
+    raw = _shared_store.get_document(data_type, data_id, version)
+    record_cache_lookup("shared_documents", raw is not None)
+    if raw is None:
+        raw = _read_raw_file(file_path)
+        _shared_store.put_document(data_type, data_id, version, raw)
+    return json.loads(raw)
+
+def _write_json_file(file_path: str, data: Dict[str, Any]) -> bytes:
+    """
+    Serialize and write a JSON data file, recording write metrics
+    
+    The data is written to a temporary file in the same directory, which then
+    replaces the data file, so readers and the watcher never see a partial file.
+    
+    Args:
+        file_path: Path to the file
+        data: The data to write
+        
+    Returns:
+        The bytes written
+    """
+    text = json.dumps(data, indent=2)
+    # Unique per writer; the name doesn't match the data file pattern, so it is never indexed
+    temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'w') as file:
+            file.write(text)
+        os.replace(temp_path, file_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    FILE_DB_OPERATIONS.inc(operation="write")
+    # json.dumps escapes non-ASCII characters, so characters equal bytes
+    FILE_DB_BYTES.inc(len(text), operation="write")
+    # The next read of a new version usually follows soon after the write
+    raw = text.encode("ascii")
+    _documents.put(file_path, os.stat(file_path), raw)
+    return raw
+
+class _VersionIndex:
+    """
+    In-memory index of the data files in the static files directory
+    
+    Maps each (data type, ID) to its sorted version numbers, parsed from the file
+    names so no documents are read. The index is rebuilt when the directory's
+    modification time changes (files added or removed by another process) and is
+    updated in place for files saved through this module.
+    
+    In multi-worker mode, saves by other workers are applied from the shared
+    change log, so only changes made outside the API cause a rescan. While the
+    directory is watched (see start_watching), changes made outside the API are
+    applied file by file as the watcher reports them and the directory is not
+    checked at all.
+    
+    Change listeners are called with (data type, ID) whenever an entry changes.
+    
+    A summary of each position (metadata and FAQ/info counts, see
+    build_position_summary) is also indexed, computed from the latest version of
+    each position the first time it is needed and kept up to date on save.
+    """
+    
+    _FILE_NAME = re.compile(r'example-data-(\w+)-(\d+)-(\d+)\.json$')
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._directory: Optional[str] = None
+        self._mtime_ns: Optional[int] = None
+        self._versions: Dict[Tuple[str, int], List[int]] = {}
+        # Sequence number of the last shared change applied
+        self._shared_sequence = 0
+        # Directory whose changes are reported by a watcher
+        self._watching: Optional[str] = None
+        # Set when changes may have been missed and the directory must be rescanned
+        self._stale = False
+        # File name -> (mtime, size) of files written by this process, so the
+        # watcher's reports of our own writes can be ignored
+        self._own_writes: Dict[str, Tuple[int, int]] = {}
+        # Versions saved by other workers and already applied from the shared
+        # change log, so the watcher's reports of those files can be ignored
+        self._shared_writes: Set[Tuple[str, int, int]] = set()
+        # Position ID -> (version the summary was built from, summary)
+        self._position_summaries: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+    
+    def _directory_mtime(self, directory: str) -> Optional[int]:
+        try:
+            return os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _apply_shared_changes(self) -> bool:
+        changes, sequence = _shared_store.changes_since(self._shared_sequence)
+        if changes is None:
+            return False
+        for data_type, data_id, version in changes:
+            version_list = self._versions.setdefault((data_type, data_id), [])
+            if version not in version_list:
+                bisect.insort(version_list, version)
+                if self._watching is not None and self._watching == self._directory:
+                    self._shared_writes.add((data_type, data_id, version))
+                _notify_change(data_type, data_id)
+        self._shared_sequence = sequence
+        return True
+    
+    def _ensure_current(self) -> None:
+        directory = STATIC_FILES_DIR
+        if directory == self._directory and not self._stale:
+            if _shared_store is not None and not self._apply_shared_changes():
+                # Fell too far behind the change log
+                self._stale = True
+            elif directory == self._watching:
+                return
+            else:
+                mtime = self._directory_mtime(directory)
+                if _shared_store is not None and mtime != self._mtime_ns and mtime == _shared_store.directory_mtime():
+                    # The directory changed only by saves already applied from the log
+                    self._mtime_ns = mtime
+                if mtime == self._mtime_ns:
+                    return
+        
+        mtime = self._directory_mtime(directory)
+        # Changes published during the scan are applied again, which is harmless
+        sequence = _shared_store.sequence() if _shared_store is not None else 0
+        versions: Dict[Tuple[str, int], List[int]] = {}
+        if mtime is not None:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    match = self._FILE_NAME.match(entry.name)
+                    if match:
+                        data_type, data_id, version = match.groups()
+                        versions.setdefault((data_type, int(data_id)), []).append(int(version))
+        for version_list in versions.values():
+            version_list.sort()
+        
+        if directory != self._directory:
+            self._position_summaries = {}
+        else:
+            for key in self._versions.keys() | versions.keys():
+                if self._versions.get(key) != versions.get(key):
+                    _notify_change(*key)
+        self._directory = directory
+        self._mtime_ns = mtime
+        self._versions = versions
+        self._shared_writes.clear()
+        self._shared_sequence = sequence
+        self._stale = False
+        log.info("Built file index", directory=directory, entries=len(versions))
+    
+    def watch(self, directory: Optional[str]) -> None:
+        """
+        Rely on a watcher for changes to a directory, or stop relying on one
+        
+        The directory is rescanned once, since changes made before the watcher
+        started were not reported.
+        
+        Args:
+            directory: The watched directory, or None when the watcher stopped
+        """
+        with self._lock:
+            self._watching = directory
+            self._own_writes.clear()
+            self._shared_writes.clear()
+            self._stale = True
+    
+    def invalidate(self) -> None:
+        """Rescan the directory on the next lookup"""
+        with self._lock:
+            self._stale = True
+    
+    def apply_file_event(self, file_name: Optional[str], exists: bool) -> None:
+        """
+        Apply a change reported by the directory watcher
+        
+        Only the affected entry is updated: its version list, its position
+        summary if the summarized version changed, and the cached contents of
+        the file.
+        
+        Args:
+            file_name: Name of the file added, changed or removed, or None if
+                changes may have been missed
+            exists: Whether the file exists after the change
+        """
+        if file_name is None:
+            self.invalidate()
+            return
+        match = self._FILE_NAME.match(file_name)
+        if not match:
+            return
+        data_type, data_id, version = match.group(1), int(match.group(2)), int(match.group(3))
+        
+        with self._lock:
+            if self._watching is None or self._directory != self._watching:
+                return
+            file_path = os.path.join(self._watching, file_name)
+            stat = None
+            if exists:
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    exists = False
+            own_write = self._own_writes.pop(file_name, None)
+            if stat is not None and own_write == (stat.st_mtime_ns, stat.st_size):
+                return
+            shared_write = (data_type, data_id, version)
+            if shared_write in self._shared_writes:
+                self._shared_writes.discard(shared_write)
+                if exists:
+                    # Invalidated when the change log was applied, and version files are never rewritten
+                    return
+            
+            key = (data_type, data_id)
+            version_list = self._versions.setdefault(key, [])
+            known = version in version_list
+            if exists and not known:
+                bisect.insort(version_list, version)
+            elif not exists and known:
+                version_list.remove(version)
+            if not version_list:
+                del self._versions[key]
+            if data_type == "pos":
+                cached = self._position_summaries.get(data_id)
+                if cached is not None and cached[0] == version:
+                    del self._position_summaries[data_id]
+        
+        if known:
+            # An existing version was rewritten or removed
+            _documents.discard(file_path)
+            if _shared_store is not None:
+                _shared_store.discard_document(data_type, data_id, version)
+        _notify_change(data_type, data_id)
+    
+    def versions(self, data_type: str, data_id: int) -> List[int]:
+        """Return the version numbers of an entry in ascending order"""
+        with self._lock:
+            self._ensure_current()
+            return list(self._versions.get((data_type, data_id), []))
+    
+    def latest_version(self, data_type: str, data_id: int) -> Optional[int]:
+        """Return the latest version number of an entry, or None if it does not exist"""
+        with self._lock:
+            self._ensure_current()
+            version_list = self._versions.get((data_type, data_id))
+            return version_list[-1] if version_list else None
+    
+    def ids(self, data_type: str) -> List[int]:
+        """Return the IDs of all entries of a data type in ascending order"""
+        with self._lock:
+            self._ensure_current()
+            return sorted(data_id for entry_type, data_id in self._versions if entry_type == data_type)
+    
+    def record(self, data_type: str, data_id: int, version: int, summary: Optional[Dict[str, Any]] = None,
+               raw: Optional[bytes] = None) -> None:
+        """
+        Record a file written by this process, publishing it to the other workers
+        
+        Args:
+            data_type: The type of data ('com' or 'pos')
+            data_id: The ID of the entry
+            version: The version that was written
+            summary: For positions, the summary of the written document
+            raw: The bytes written, shared with the other workers
+        """
+        with self._lock:
+            self._ensure_current()
+            version_list = self._versions.setdefault((data_type, data_id), [])
+            if version not in version_list:
+                bisect.insort(version_list, version)
+            if data_type == "pos" and summary is not None and version == version_list[-1]:
+                self._position_summaries[data_id] = (version, summary)
+            # Our own write changed the directory; don't treat that as an external change
+            self._mtime_ns = self._directory_mtime(self._directory)
+            if self._watching is not None:
+                file_name = f"example-data-{data_type}-{data_id}-{version}.json"
+                try:
+                    stat = os.stat(os.path.join(self._directory, file_name))
+                    self._own_writes[file_name] = (stat.st_mtime_ns, stat.st_size)
+                except FileNotFoundError:
+                    pass
+            if _shared_store is not None:
+                _shared_store.publish(data_type, data_id, version, self._mtime_ns or 0, raw)
+        _notify_change(data_type, data_id)
+    
+    def position_summary(self, position_id: int, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Return the summary of a version of a position, by default the latest"""
+        with self._lock:
+            self._ensure_current()
+            version_list = self._versions.get(("pos", position_id))
+            if not version_list:
+                return None
+            latest = version_list[-1]
+            if version is None:
+                version = latest
+            cached = self._position_summaries.get(position_id)
+            if cached is not None and cached[0] == version:
+                record_cache_lookup("position_summary", True)
+                return cached[1]
+        
+        # Read outside the lock; only the requested version is needed
+        record_cache_lookup("position_summary", False)
+        file_path = os.path.join(STATIC_FILES_DIR, f"example-data-pos-{position_id}-{version}.json")
+        try:
+            summary = build_position_summary(_read_data_file(file_path))
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            log.error("Error reading position data file", file_path=file_path, error=str(e))
+            return None
+        
+        if version == latest:
+            with self._lock:
+                self._position_summaries[position_id] = (version, summary)
+        return summary
+    
+    def position_company(self, position_id: int) -> Optional[int]:
+        """Return the company ID of the latest version of a position"""
+        summary = self.position_summary(position_id)
+        return summary["position"].get("companyId") if summary else None
+
+def build_position_summary(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the lightweight summary of a position document
+    
+    Args:
+        data: The position data
+        
+    Returns:
+        Dictionary with the position metadata, FAQ/info counts and the total
+        number of times its FAQs were asked
+    """
+    faqs = data.get("positionFAQs") or []
+    return {
+        "position": dict(data.get("position") or {}),
+        "faqCount": len(faqs),
+        "answeredFaqCount": sum(1 for faq in faqs if faq.get("response")),
+        "timesAsked": sum(faq.get("timesAsked") or 0 for faq in faqs),
+        "infoCount": len(data.get("positionInfo") or [])
+    }
+
+_change_listeners: List[Callable[[str, int], None]] = []
+
+def add_change_listener(listener: Callable[[str, int], None]) -> None:
+    """
+    Register a function called with (data type, ID) whenever an entry changes
+    
+    Listeners are called for saves through this module, saves by other workers
+    and changes reported by the directory watcher. They may be called with the
+    file index locked, so they should only mark state as stale.
+    
+    Args:
+        listener: The function to call
+    """
+    _change_listeners.append(listener)
+
+def remove_change_listener(listener: Callable[[str, int], None]) -> None:
+    """
+    Unregister a change listener
+    
+    Args:
+        listener: The function to remove
+    """
+    if listener in _change_listeners:
+        _change_listeners.remove(listener)
+
+def _notify_change(data_type: str, data_id: int) -> None:
+    for listener in list(_change_listeners):
+        try:
+            listener(data_type, data_id)
+        except Exception as e:
+            log.error("Error in change listener", data_type=data_type, data_id=data_id, error=str(e))
+
+_index = _VersionIndex()
+
+def start_watching(mode: str = FILE_WATCHER_MODE, interval: float = FILE_WATCHER_POLL_INTERVAL):
+    """
+    Start watching the static files directory for changes made outside the API
+    
+    While the watcher runs, the file index is updated file by file as changes
+    are reported instead of checking the directory on every lookup.
+    
+    Args:
+        mode: 'inotify', 'polling', 'auto' (inotify with a polling fallback) or 'off'
+        interval: Seconds between scans when polling
+        
+    Returns:
+        The watcher, to pass to stop_watching, or None if mode is 'off'
+    """
+    from src.database.file_watcher import start_watcher
+    directory = STATIC_FILES_DIR
+    watcher = start_watcher(directory, _index.apply_file_event, mode, interval)
+    if watcher is not None:
+        _index.watch(directory)
+    return watcher
+
+def stop_watching(watcher) -> None:
+    """
+    Stop a watcher started by start_watching
+    
+    Args:
+        watcher: The watcher, or None
+    """
+    if watcher is None:
+        return
+    watcher.stop()
+    _index.watch(None)
+
+class _EntryLock:
+    """
+    Re-entrant lock serializing writes to one entry
+    
+    In multi-worker mode the outermost acquisition also takes the entry's lock in
+    the shared store, so saves in other workers are serialized too.
+    """
+    
+    def __init__(self, process_lock=None):
+        self._lock = threading.RLock()
+        self._process_lock = process_lock
+        self._depth = 0
+    
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0 and self._process_lock is not None:
+            try:
+                self._process_lock.__enter__()
+            except BaseException:
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        try:
+            if self._depth == 0 and self._process_lock is not None:
+                self._process_lock.__exit__(*exc_info)
+        finally:
+            self._lock.release()
+
+_entry_locks: Dict[Tuple[str, Optional[int]], _EntryLock] = {}
+_entry_locks_guard = threading.Lock()
+
+def _entry_lock(data_type: str, data_id: Optional[int]) -> _EntryLock:
+    """
+    Get the lock serializing writes to one entry
+    
+    Args:
+        data_type: The type of data ('com' or 'pos')
+        data_id: The ID of the entry, or None for the lock used when allocating new IDs
+        
+    Returns:
+        A re-entrant lock shared by all callers for the same entry
+    """
+    with _entry_locks_guard:
+        lock = _entry_locks.get((data_type, data_id))
+        if lock is None:
+            process_lock = _shared_store.entry_lock(data_type, data_id) if _shared_store is not None else None
+            lock = _entry_locks[(data_type, data_id)] = _EntryLock(process_lock)
+        return lock
+
+class PositionNotFoundError(LookupError):
+    """Raised when updating a position that does not exist"""
+
+class VersionConflictError(Exception):
+    """Raised when the latest version of an entry is not the version an update expected"""
+    
+    def __init__(self, expected_version: int, current_version: int):
+        super().__init__(f"Expected version {expected_version} but the current version is {current_version}")
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+def _get_data_file_path(data_type: str, data_id: int, version: int) -> str:
+    return os.path.join(STATIC_FILES_DIR, f"example-data-{data_type}-{data_id}-{version}.json")
+
+@timed("file_db.get_latest_version_file")
 def _get_latest_version_file(data_type: str, data_id: int) -> Optional[str]:
     """
     Get the path to the latest version file for a specific data type and ID
@@ -55,25 +657,100 @@ def _get_latest_version_file(data_type: str, data_id: int) -> Optional[str]:
     Returns:
         Path to the latest version file or None if not found
     """
-    pattern = _get_file_pattern(data_type, data_id)
-    files = glob.glob(pattern)
+    latest_version = _index.latest_version(data_type, data_id)
     
-    if not files:
-        log.warning(f"No {data_type} files found for ID: {data_id}")
+    if latest_version is None:
+        log.warning("No data files found", data_type=data_type, data_id=data_id)
         return None
     
-    # Extract versions and find the latest one
-    latest_version = 0
-    latest_file = None
+    return _get_data_file_path(data_type, data_id, latest_version)
+
+@timed("file_db.get_latest_version")
+def get_latest_version(data_type: str, data_id: int) -> Optional[int]:
+    """
+    Get the latest version number for a specific data type and ID without reading the file
     
-    for file in files:
-        _, _, version = _parse_file_info(file)
-        if version > latest_version:
-            latest_version = version
-            latest_file = file
+    Args:
+        data_type: The type of data ('com' or 'pos')
+        data_id: The ID to look for
+        
+    Returns:
+        The latest version number or None if not found
+    """
+    return _index.latest_version(data_type, data_id)
+
+def get_version_numbers(data_type: str, data_id: int) -> List[int]:
+    """
+    Get all version numbers for a specific data type and ID without reading any files
     
-    return latest_file
+    Args:
+        data_type: The type of data ('com' or 'pos')
+        data_id: The ID to look for
+        
+    Returns:
+        List of version numbers in ascending order
+    """
+    return _index.versions(data_type, data_id)
 
+def get_position_ids() -> List[int]:
+    """
+    Get the IDs of all positions, served from the file index
+    
+    Returns:
+        Position IDs in ascending order
+    """
+    return _index.ids("pos")
+
+def get_company_ids() -> List[int]:
+    """
+    Get the IDs of all companies, served from the file index
+    
+    Returns:
+        Company IDs in ascending order
+    """
+    return _index.ids("com")
+
+@timed("file_db.get_company_position_versions")
+def get_company_position_versions(company_id: int) -> Dict[int, int]:
+    """
+    Get the latest version number of every position belonging to a company
+    
+    Served from the file index. The company of a position is read from its latest
+    version the first time it is needed and remembered after that.
+    
+    Args:
+        company_id: The company ID
+        
+    Returns:
+        Dictionary of position ID to latest version number
+    """
+    result = {}
+    for position_id in _index.ids("pos"):
+        if _index.position_company(position_id) == company_id:
+            latest_version = _index.latest_version("pos", position_id)
+            if latest_version is not None:
+                result[position_id] = latest_version
+    return result
+
+def get_position_summary(position_id: int, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Get the summary of a version of a position, by default the latest
+    
+    Summaries are built when a position is saved, or from the latest version the
+    first time they are needed, so repeated calls do not read the document.
+    
+    Args:
+        position_id: The position ID
+        version: The version to summarize, or None for the latest
+        
+    Returns:
+        Dictionary with the position metadata, faqCount, answeredFaqCount,
+        timesAsked and infoCount, or None if the position does not exist
+    """
+    summary = _index.position_summary(position_id, version)
+    return copy.deepcopy(summary) if summary is not None else None
+
+@timed("file_db.get_next_id")
 def _get_next_id(data_type: str) -> int:
     """
     Get the next available ID for a data type
@@ -84,22 +761,16 @@ def _get_next_id(data_type: str) -> int:
     Returns:
         The next available ID
     """
-    pattern = _get_file_pattern(data_type)
-    files = glob.glob(pattern)
+    ids = _index.ids(data_type)
     
-    if not files:
+    if not ids:
         # Default starting IDs
         return 1001 if data_type == "pos" else 2001
     
-    # Find the highest ID
-    max_id = 0
-    for file in files:
-        _, file_id, _ = _parse_file_info(file)
-        max_id = max(max_id, file_id)
-    
-    # Return the next ID
-    return max_id + 1
+    # Return the next ID after the highest one
+    return ids[-1] + 1
 
+@timed("file_db.get_company_data")
 def get_company_data(company_id: int) -> Optional[Dict[str, Any]]:
     """
     Retrieve the latest version of company data for the specified ID
@@ -115,12 +786,12 @@ def get_company_data(company_id: int) -> Optional[Dict[str, Any]]:
         return None
     
     try:
-        with open(file_path, 'r') as file:
-            return json.load(file)
+        return _read_data_file(file_path)
     except (json.JSONDecodeError, FileNotFoundError) as e:
-        log.error(f"Error reading company data file: {str(e)}")
+        log.error("Error reading company data file", error=str(e))
         return None
 
+@timed("file_db.get_position_data")
 def get_position_data(position_id: int) -> Optional[Dict[str, Any]]:
     """
     Retrieve the latest version of position data for the specified ID
@@ -136,12 +807,30 @@ def get_position_data(position_id: int) -> Optional[Dict[str, Any]]:
         return None
     
     try:
-        with open(file_path, 'r') as file:
-            return json.load(file)
+        return _read_data_file(file_path)
     except (json.JSONDecodeError, FileNotFoundError) as e:
-        log.error(f"Error reading position data file: {str(e)}")
+        log.error("Error reading position data file", error=str(e))
         return None
 
+def get_position_data_version(position_id: int, version: int) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve a specific version of position data
+    
+    Args:
+        position_id: The position ID to retrieve
+        version: The version to retrieve
+        
+    Returns:
+        Position data dictionary or None if not found
+    """
+    file_path = _get_data_file_path("pos", position_id, version)
+    try:
+        return _read_data_file(file_path)
+    except (json.JSONDecodeError, FileNotFoundError) as e:
+        log.error("Error reading position data file", error=str(e))
+        return None
+
+@timed("file_db.save_company_data")
 def save_company_data(data: Dict[str, Any], company_id: Optional[int] = None) -> Tuple[bool, int, int]:
     """
     Save company data to a file
@@ -155,45 +844,48 @@ def save_company_data(data: Dict[str, Any], company_id: Optional[int] = None) ->
     """
     data_type = "com"
     
-    # Determine ID and version
-    if company_id is None:
-        # Create new company with new ID
-        company_id = _get_next_id(data_type)
-        version = 1
-    else:
-        # Check if company exists and get next version
-        file_path = _get_latest_version_file(data_type, company_id)
-        if file_path:
-            _, _, current_version = _parse_file_info(file_path)
-            version = current_version + 1
-        else:
-            # Company ID specified but no file exists
+    # Hold the entry lock so concurrent saves cannot write the same version
+    with _entry_lock(data_type, company_id):
+        # Determine ID and version
+        if company_id is None:
+            # Create new company with new ID
+            company_id = _get_next_id(data_type)
             version = 1
-    
-    # Ensure company ID is set in the data
-    if "companyInfo" in data:
-        for item in data["companyInfo"]:
-            if "companyId" in item:
-                item["companyId"] = company_id
-    
-    if "companyFAQs" in data:
-        for item in data["companyFAQs"]:
-            if "companyId" in item:
-                item["companyId"] = company_id
-    
-    # Create the file path
-    file_name = f"example-data-{data_type}-{company_id}-{version}.json"
-    file_path = os.path.join(STATIC_FILES_DIR, file_name)
-    
-    try:
-        with open(file_path, 'w') as file:
-            json.dump(data, file, indent=2)
-        log.info(f"Saved company data to {file_path}")
-        return True, company_id, version
-    except Exception as e:
-        log.error(f"Error saving company data: {str(e)}")
-        return False, company_id, version
+        else:
+            # Check if company exists and get next version
+            file_path = _get_latest_version_file(data_type, company_id)
+            if file_path:
+                _, _, current_version = _parse_file_info(file_path)
+                version = current_version + 1
+            else:
+                # Company ID specified but no file exists
+                version = 1
+        
+        # Ensure company ID is set in the data
+        if "companyInfo" in data:
+            for item in data["companyInfo"]:
+                if "companyId" in item:
+                    item["companyId"] = company_id
+        
+        if "companyFAQs" in data:
+            for item in data["companyFAQs"]:
+                if "companyId" in item:
+                    item["companyId"] = company_id
+        
+        # Create the file path
+        file_name = f"example-data-{data_type}-{company_id}-{version}.json"
+        file_path = os.path.join(STATIC_FILES_DIR, file_name)
+        
+        try:
+            raw = _write_json_file(file_path, data)
+            _index.record(data_type, company_id, version, raw=raw)
+            log.info("Saved company data", file_path=file_path)
+            return True, company_id, version
+        except Exception as e:
+            log.error("Error saving company data", error=str(e))
+            return False, company_id, version
 
+@timed("file_db.save_position_data")
 def save_position_data(data: Dict[str, Any], position_id: Optional[int] = None) -> Tuple[bool, int, int]:
     """
     Save position data to a file
@@ -207,50 +899,86 @@ def save_position_data(data: Dict[str, Any], position_id: Optional[int] = None)
     """
     data_type = "pos"
     
-    # Determine ID and version
-    if position_id is None:
-        # Create new position with new ID
-        position_id = _get_next_id(data_type)
-        version = 1
-    else:
-        # Check if position exists and get next version
-        file_path = _get_latest_version_file(data_type, position_id)
-        if file_path:
-            _, _, current_version = _parse_file_info(file_path)
-            version = current_version + 1
-        else:
-            # Position ID specified but no file exists
+    # Hold the entry lock so concurrent saves cannot write the same version
+    with _entry_lock(data_type, position_id):
+        # Determine ID and version
+        if position_id is None:
+            # Create new position with new ID
+            position_id = _get_next_id(data_type)
             version = 1
+        else:
+            # Check if position exists and get next version
+            file_path = _get_latest_version_file(data_type, position_id)
+            if file_path:
+                _, _, current_version = _parse_file_info(file_path)
+                version = current_version + 1
+            else:
+                # Position ID specified but no file exists
+                version = 1
+        
+        # Ensure position ID is set in the data
+        if "position" in data:
+            data["position"]["id"] = position_id
+            # Set the version in the position data
+            data["position"]["version"] = version
+        
+        if "positionInfo" in data:
+            for item in data["positionInfo"]:
+                if "positionId" in item:
+                    item["positionId"] = position_id
+        
+        if "positionFAQs" in data:
+            for item in data["positionFAQs"]:
+                if "positionId" in item:
+                    item["positionId"] = position_id
+        
+        # Create the file path
+        file_name = f"example-data-{data_type}-{position_id}-{version}.json"
+        file_path = os.path.join(STATIC_FILES_DIR, file_name)
+        
+        try:
+            raw = _write_json_file(file_path, data)
+            _index.record(data_type, position_id, version, build_position_summary(data), raw)
+            log.info("Saved position data", file_path=file_path)
+            return True, position_id, version
+        except Exception as e:
+            log.error("Error saving position data", error=str(e))
+            return False, position_id, version
+
+@timed("file_db.update_position_data")
+def update_position_data(position_id: int, mutator: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+                         expected_version: Optional[int] = None) -> Tuple[bool, int, int]:
+    """
+    Atomically read, modify and save the latest version of a position
     
-    # Ensure position ID is set in the data
-    if "position" in data:
-        data["position"]["id"] = position_id
-        # Set the version in the position data
-        data["position"]["version"] = version
-    
-    if "positionInfo" in data:
-        for item in data["positionInfo"]:
-            if "positionId" in item:
-                item["positionId"] = position_id
-    
-    if "positionFAQs" in data:
-        for item in data["positionFAQs"]:
-            if "positionId" in item:
-                item["positionId"] = position_id
-    
-    # Create the file path
-    file_name = f"example-data-{data_type}-{position_id}-{version}.json"
-    file_path = os.path.join(STATIC_FILES_DIR, file_name)
+    The entry lock is held from the read to the write, so no other save through
+    this module can create a version in between.
     
-    try:
-        with open(file_path, 'w') as file:
-            json.dump(data, file, indent=2)
-        log.info(f"Saved position data to {file_path}")
-        return True, position_id, version
-    except Exception as e:
-        log.error(f"Error saving position data: {str(e)}")
-        return False, position_id, version
+    Args:
+        position_id: The position ID to update
+        mutator: Function given the latest position data. It either updates the
+            data in place and returns None, or returns the data to save
+        expected_version: Optional version the caller based its changes on
+        
+    Returns:
+        Tuple of (success, position_id, version)
+        
+    Raises:
+        PositionNotFoundError: If the position does not exist
+        VersionConflictError: If expected_version is not the latest version
+    """
+    with _entry_lock("pos", position_id):
+        current_version = _index.latest_version("pos", position_id)
+        data = get_position_data(position_id) if current_version is not None else None
+        if data is None:
+            raise PositionNotFoundError(f"Position not found with ID: {position_id}")
+        if expected_version is not None and expected_version != current_version:
+            raise VersionConflictError(expected_version, current_version)
+        
+        updated = mutator(data)
+        return save_position_data(data if updated is None else updated, position_id)
 
+@timed("file_db.get_positions_by_company_id")
 def get_positions_by_company_id(company_id: int) -> List[Dict[str, Any]]:
     """
     Retrieve all position data associated with a specific company ID
@@ -268,62 +996,72 @@ def get_positions_by_company_id(company_id: int) -> List[Dict[str, Any]]:
     
     for file_path in files:
         try:
-            with open(file_path, 'r') as file:
-                data = json.load(file)
+            data = _read_json_file(file_path)
+            
+            # Check if this position belongs to the specified company
+            if "position" in data and data["position"].get("companyId") == company_id:
+                # Get the position ID and check if we already have a newer version
+                position_id = data["position"]["id"]
+                
+                # Check if we already have this position in our list
+                existing_position = next((p for p in positions if p["position"]["id"] == position_id), None)
                 
-                # Check if this position belongs to the specified company
-                if "position" in data and data["position"].get("companyId") == company_id:
-                    # Get the position ID and check if we already have a newer version
-                    position_id = data["position"]["id"]
-                    
-                    # Check if we already have this position in our list
-                    existing_position = next((p for p in positions if p["position"]["id"] == position_id), None)
-                    
-                    if existing_position:
-                        # Compare versions and keep the newer one
-                        if data["position"].get("version", 0) > existing_position["position"].get("version", 0):
-                            # Replace with newer version
-                            positions.remove(existing_position)
-                            positions.append(data)
-                    else:
-                        # Add new position
+                if existing_position:
+                    # Compare versions and keep the newer one
+                    if data["position"].get("version", 0) > existing_position["position"].get("version", 0):
+                        # Replace with newer version
+                        positions.remove(existing_position)
                         positions.append(data)
+                else:
+                    # Add new position
+                    positions.append(data)
                         
         except (json.JSONDecodeError, FileNotFoundError) as e:
-            log.error(f"Error reading position data file {file_path}: {str(e)}")
+            log.error("Error reading position data file", file_path=file_path, error=str(e))
             continue
     
-    log.info(f"Found {len(positions)} positions for company ID: {company_id}")
+    log.info("Found company positions", company_id=company_id, positions=len(positions))
     return positions
 
-def get_all_position_versions(position_id: int) -> List[Dict[str, Any]]:
+@timed("file_db.get_all_position_versions")
+def get_all_position_versions(position_id: int, version_numbers: Optional[List[int]] = None) -> List[Dict[str, Any]]:
     """
     Retrieve all versions of position data for the specified ID
     
     Args:
         position_id: The position ID to retrieve all versions for
+        version_numbers: Versions from get_version_numbers to read, so the result matches
+            a validator computed from them; by default all version files found
         
     Returns:
         List of position data dictionaries, sorted by version (newest first)
     """
+    if version_numbers is not None:
+        versions = []
+        for version in sorted(version_numbers, reverse=True):
+            data = get_position_data_version(position_id, version)
+            if data is not None:
+                versions.append(data)
+        log.info("Found position versions", position_id=position_id, versions=len(versions))
+        return versions
+    
     pattern = _get_file_pattern("pos", position_id)
     files = glob.glob(pattern)
     
     if not files:
-        log.warning(f"No position files found for ID: {position_id}")
+        log.warning("No position files found", position_id=position_id)
         return []
     
     versions = []
     
     for file_path in files:
         try:
-            with open(file_path, 'r') as file:
-                data = json.load(file)
-                # Add the file path to the data for reference
-                data["_file_path"] = file_path
-                versions.append(data)
+            data = _read_json_file(file_path)
+            # Add the file path to the data for reference
+            data["_file_path"] = file_path
+            versions.append(data)
         except (json.JSONDecodeError, FileNotFoundError) as e:
-            log.error(f"Error reading position data file {file_path}: {str(e)}")
+            log.error("Error reading position data file", file_path=file_path, error=str(e))
             continue
     
     # Sort by version (descending)
@@ -334,5 +1072,65 @@ def get_all_position_versions(position_id: int) -> List[Dict[str, Any]]:
         if "_file_path" in version:
             del version["_file_path"]
     
-    log.info(f"Found {len(versions)} versions for position ID: {position_id}")
-    return versions
\ No newline at end of file
+    log.info("Found position versions", position_id=position_id, versions=len(versions))
+    return versions
+
+@timed("file_db.get_company_positions_page")
+def get_company_positions_page(company_id: int, limit: Optional[int] = None, after_id: Optional[int] = None,
+                               summary: bool = False, position_versions: Optional[Dict[int, int]] = None
+                               ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Retrieve one page of the latest positions of a company, ordered by position ID
+    
+    Positions are selected from the file index, so only the documents on the page are
+    read. In summary mode no documents are read once the summaries are built.
+    
+    Args:
+        company_id: The company ID to retrieve positions for
+        limit: Maximum number of positions to return, or None for all
+        after_id: Only return positions with an ID greater than this
+        summary: Return position summaries instead of full documents
+        position_versions: Versions from get_company_position_versions to read, so the
+            page matches a validator computed from them; by default the latest versions
+        
+    Returns:
+        Tuple of (positions, ID to pass as after_id for the next page or None if this is the last page)
+    """
+    if position_versions is None:
+        position_versions = get_company_position_versions(company_id)
+    position_ids = sorted(position_versions)
+    if after_id is not None:
+        position_ids = [position_id for position_id in position_ids if position_id > after_id]
+    
+    next_after_id = None
+    if limit is not None and len(position_ids) > limit:
+        position_ids = position_ids[:limit]
+        next_after_id = position_ids[-1]
+    
+    load = get_position_summary if summary else get_position_data_version
+    positions = [load(position_id, position_versions[position_id]) for position_id in position_ids]
+    positions = [data for data in positions if data is not None]
+    
+    log.info("Found company positions", company_id=company_id, after_id=after_id, positions=len(positions))
+    return positions, next_after_id
+
+def iter_latest_position_data() -> Iterator[Dict[str, Any]]:
+    """
+    Stream the latest version of every position, one document at a time
+    
+    The latest version of each position is taken from the file index, so only
+    those files are read, and only as the iterator is consumed.
+    
+    Yields:
+        Position data dictionaries, ordered by position ID
+    """
+    for position_id in get_position_ids():
+        version = _index.latest_version("pos", position_id)
+        if version is None:
+            continue
+        file_path = _get_data_file_path("pos", position_id, version)
+        try:
+            yield _read_json_file(file_path)
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            log.error("Error reading position data file", file_path=file_path, error=str(e))
+            continue
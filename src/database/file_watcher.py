@@ -0,0 +1,179 @@
+"""
+Watch the data directory for files added, changed or removed outside the API.
+
+On Linux the watcher uses inotify through ctypes, so changes are reported as they
+happen without scanning the directory. Elsewhere, or if inotify is unavailable,
+it falls back to polling file modification times.
+
+Callbacks receive the file name and whether the file exists, or a file name of
+None when changes may have been missed (the inotify queue overflowed) and the
+caller should rescan.
+"""
+
+import os
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from src.utils.logger import log
+
+FileCallback = Callable[[Optional[str], bool], None]
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_DELETE_SELF
+_EVENT = struct.Struct("iIII")
+
+class InotifyWatcher:
+    """
+    Reports changes to the files of one directory using inotify
+
+    Args:
+        directory: The directory to watch
+        callback: Called from the watcher thread with (file name, exists)
+    """
+
+    def __init__(self, directory: str, callback: FileCallback):
+        self.directory = directory
+        self.callback = callback
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        # Writing to the pipe wakes the thread up to stop
+        self._wake_read, self._wake_write = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+
+    def start(self) -> "InotifyWatcher":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        os.write(self._wake_write, b"x")
+        self._thread.join()
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            os.close(fd)
+
+    def _run(self) -> None:
+        while True:
+            readable, _, _ = select.select([self._fd, self._wake_read], [], [])
+            if self._wake_read in readable:
+                return
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            self._dispatch(buffer)
+
+    def _dispatch(self, buffer: bytes) -> None:
+        offset = 0
+        while offset + _EVENT.size <= len(buffer):
+            _, mask, _, length = _EVENT.unpack_from(buffer, offset)
+            name = buffer[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            try:
+                if mask & (IN_Q_OVERFLOW | IN_DELETE_SELF):
+                    self.callback(None, False)
+                elif name:
+                    self.callback(os.fsdecode(name), not mask & (IN_DELETE | IN_MOVED_FROM))
+            except Exception as e:
+                log.error("Error handling data file change", file_name=os.fsdecode(name), error=str(e))
+
+class PollingWatcher:
+    """
+    Reports changes to the files of one directory by comparing their modification times
+
+    Args:
+        directory: The directory to watch
+        callback: Called from the watcher thread with (file name, exists)
+        interval: Seconds between scans
+    """
+
+    def __init__(self, directory: str, callback: FileCallback, interval: float = 2.0):
+        self.directory = directory
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._files = self._scan()
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+
+    def start(self) -> "PollingWatcher":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        files = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+        return files
+
+    def poll(self) -> None:
+        """Scan the directory once and report the differences since the last scan"""
+        files = self._scan()
+        for name, stat in files.items():
+            if self._files.get(name) != stat:
+                self.callback(name, True)
+        for name in self._files.keys() - files.keys():
+            self.callback(name, False)
+        self._files = files
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                log.error("Error polling data directory", directory=self.directory, error=str(e))
+
+def start_watcher(directory: str, callback: FileCallback, mode: str = "auto", interval: float = 2.0):
+    """
+    Start watching a directory
+
+    Args:
+        directory: The directory to watch
+        callback: Called from the watcher thread with (file name, exists)
+        mode: 'inotify', 'polling', 'auto' (inotify with a polling fallback) or 'off'
+        interval: Seconds between scans when polling
+
+    Returns:
+        The started watcher, with a stop() method, or None if mode is 'off'
+    """
+    if mode == "off":
+        return None
+    if mode in ("auto", "inotify"):
+        try:
+            watcher = InotifyWatcher(directory, callback).start()
+            log.info("Watching data directory", directory=directory, mode="inotify")
+            return watcher
+        except (OSError, AttributeError) as e:
+            if mode == "inotify":
+                raise
+            log.warning("inotify unavailable, polling for changes instead", error=str(e))
+    watcher = PollingWatcher(directory, callback, interval).start()
+    log.info("Watching data directory", directory=directory, mode="polling")
+    return watcher
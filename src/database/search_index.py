@@ -0,0 +1,218 @@
+"""
+Full-text search over the FAQs and info items of the latest positions and companies.
+
+An inverted index maps each term to the items containing it, and results are
+ranked with BM25. The index is built on the first search and then kept current
+entry by entry: file_db change listeners mark saved or externally changed
+entries, and only those are re-read before the next search. Documents are read
+by the refreshing thread before anything is locked, since listeners are called
+with file_db locked. Each refresh publishes a new snapshot of the index, which
+searches read without a lock.
+"""
+
+import math
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.database import file_db
+from src.database.change_tracking import ChangeTracker, Entry
+from src.utils.timing import timed
+from src.workflow.question_matching import tokenize
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# (data type, entry ID, section, item ID)
+ItemKey = Tuple[str, int, str, int]
+
+# Section -> (result type, title field, answer field)
+_SECTIONS = {
+    "positionFAQs": ("positionFAQ", "question", "response"),
+    "positionInfo": ("positionInfo", "subject", "answer"),
+    "companyFAQs": ("companyFAQ", "question", "answer"),
+    "companyInfo": ("companyInfo", "subject", "answer"),
+}
+_ENTRY_SECTIONS = {
+    "pos": ("positionFAQs", "positionInfo"),
+    "com": ("companyFAQs", "companyInfo"),
+}
+
+@dataclass
+class _Item:
+    """One FAQ or info item in the index"""
+    section: str
+    item_id: int
+    position_id: Optional[int]
+    company_id: Optional[int]
+    title: str
+    answer: Optional[str]
+    length: int
+
+    def to_result(self, score: float) -> Dict[str, Any]:
+        result_type, title_field, _ = _SECTIONS[self.section]
+        return {
+            "type": result_type,
+            "id": self.item_id,
+            "positionId": self.position_id,
+            "companyId": self.company_id,
+            title_field: self.title,
+            "answer": self.answer,
+            "score": round(score, 4)
+        }
+
+class _Snapshot:
+    """
+    The items and postings of the index at one point in time
+
+    A published snapshot is never changed: a refresh copies it, shares the
+    postings of the terms it doesn't touch, and publishes the copy.
+    """
+
+    def __init__(self, base: Optional["_Snapshot"] = None):
+        self.items: Dict[ItemKey, _Item] = dict(base.items) if base is not None else {}
+        # Term -> item -> term frequency
+        self.postings: Dict[str, Dict[ItemKey, int]] = dict(base.postings) if base is not None else {}
+        # (data type, entry ID) -> keys of the entry's items
+        self.entry_items: Dict[Entry, List[ItemKey]] = dict(base.entry_items) if base is not None else {}
+        self.total_length = base.total_length if base is not None else 0
+        # Terms whose postings were copied into this snapshot and may be changed
+        self._copied_terms: Set[str] = set()
+
+    def _term_postings(self, term: str) -> Dict[ItemKey, int]:
+        if term not in self._copied_terms:
+            self.postings[term] = dict(self.postings.get(term, {}))
+            self._copied_terms.add(term)
+        return self.postings[term]
+
+    def remove_entry(self, entry: Entry) -> None:
+        for key in self.entry_items.pop(entry, []):
+            item = self.items.pop(key)
+            self.total_length -= item.length
+            for term in set(tokenize(f"{item.title} {item.answer or ''}")):
+                if term in self.postings:
+                    postings = self._term_postings(term)
+                    postings.pop(key, None)
+                    if not postings:
+                        del self.postings[term]
+                        self._copied_terms.discard(term)
+
+    def add_entry(self, data_type: str, data_id: int, data: Dict[str, Any]) -> None:
+        if data_type == "pos":
+            position_id = data_id
+            company_id = (data.get("position") or {}).get("companyId")
+        else:
+            position_id = None
+            company_id = data_id
+
+        keys = []
+        for section in _ENTRY_SECTIONS[data_type]:
+            _, title_field, answer_field = _SECTIONS[section]
+            for raw_item in data.get(section) or []:
+                if raw_item.get("id") is None:
+                    continue
+                title = raw_item.get(title_field) or ""
+                answer = raw_item.get(answer_field)
+                terms = tokenize(f"{title} {answer or ''}")
+                if not terms:
+                    continue
+                key = (data_type, data_id, section, raw_item["id"])
+                if key in self.items:
+                    # Duplicate item ID; the first item wins
+                    continue
+                self.items[key] = _Item(section, raw_item["id"], position_id, company_id, title, answer, len(terms))
+                self.total_length += len(terms)
+                for term, frequency in Counter(terms).items():
+                    self._term_postings(term)[key] = frequency
+                keys.append(key)
+        self.entry_items[(data_type, data_id)] = keys
+
+class SearchIndex:
+    """
+    Inverted index with BM25 ranking over FAQ and info items
+    """
+
+    def __init__(self):
+        self._changes = ChangeTracker(_ENTRY_SECTIONS)
+        # The latest published snapshot, None until the index is built
+        self._snapshot: Optional[_Snapshot] = None
+
+    def mark_changed(self, data_type: str, data_id: int) -> None:
+        """
+        Change listener marking an entry to be re-read before the next search
+
+        Args:
+            data_type: The type of data ('com' or 'pos')
+            data_id: The ID of the entry
+        """
+        self._changes.mark_changed(data_type, data_id)
+
+    def clear(self) -> None:
+        """Drop the index so it is rebuilt on the next search"""
+        self._changes.clear()
+        self._snapshot = None
+
+    def _apply(self, rebuild: bool, documents: Dict[Entry, Optional[Dict[str, Any]]]) -> None:
+        # Only called by one refreshing thread at a time
+        snapshot = _Snapshot(None if rebuild else self._snapshot)
+        for (data_type, data_id), data in documents.items():
+            snapshot.remove_entry((data_type, data_id))
+            if data is not None:
+                snapshot.add_entry(data_type, data_id, data)
+        self._snapshot = snapshot
+
+    def refresh(self) -> None:
+        """Build the index, or re-read the entries changed since the last refresh"""
+        self._changes.refresh(self._apply)
+
+    @timed("search.query")
+    def search(self, query: str, company_id: Optional[int] = None, position_id: Optional[int] = None,
+               answered_only: bool = False, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find the items that best match a query
+
+        While another thread re-reads changed entries, the previous snapshot is
+        searched instead of waiting for it.
+
+        Args:
+            query: The search text
+            company_id: Only return items of this company and its positions
+            position_id: Only return items of this position
+            answered_only: Only return items that have an answer
+            limit: Maximum number of results
+
+        Returns:
+            Result dictionaries ordered by descending BM25 score
+        """
+        terms = set(tokenize(query))
+        self._changes.refresh(self._apply, wait=self._snapshot is None)
+        snapshot = self._snapshot
+        if snapshot is None or not terms or not snapshot.items:
+            return []
+        item_count = len(snapshot.items)
+        average_length = snapshot.total_length / item_count
+
+        scores: Dict[ItemKey, float] = {}
+        for term in terms:
+            postings = snapshot.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (item_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, frequency in postings.items():
+                item = snapshot.items[key]
+                if position_id is not None and item.position_id != position_id:
+                    continue
+                if company_id is not None and item.company_id != company_id:
+                    continue
+                if answered_only and not item.answer:
+                    continue
+                norm = K1 * (1 - B + B * item.length / average_length)
+                scores[key] = scores.get(key, 0.0) + idf * frequency * (K1 + 1) / (frequency + norm)
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda entry: entry[1])
+        return [snapshot.items[key].to_result(score) for key, score in best]
+
+search_index = SearchIndex()
+file_db.add_change_listener(search_index.mark_changed)
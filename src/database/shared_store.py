@@ -0,0 +1,271 @@
+"""
+Memory-mapped store shared by the worker processes of one host.
+
+When several API workers serve the same data directory, each keeps its own file
+index and document cache. This store lets them stay in sync without rescanning
+the directory: every save is appended to a change log that the other workers
+apply to their index, and recently saved or read documents are kept in slots
+that every worker can read.
+
+Layout of the store file:
+    header: magic, sizes, sequence number of the last change, directory mtime
+    change log: ring of (sequence, data type, ID, version) entries
+    document slots: direct-mapped slots of (sequence, data type, ID, version, length, bytes)
+
+Writers take an exclusive lock on the file while appending to the log or filling
+a slot. Readers do not lock; slots use a sequence counter that is odd while a
+slot is being written, so torn reads are detected and treated as misses.
+"""
+
+import os
+import mmap
+import struct
+import zlib
+import threading
+from typing import List, Optional, Tuple
+
+import fcntl
+
+_MAGIC = b"FDBSHM01"
+# magic, log capacity, document slots, slot size, last sequence, directory mtime
+_HEADER = struct.Struct("<8sIIIQq")
+_HEADER_SIZE = 64
+_SEQUENCE_OFFSET = 20
+_DIRECTORY_MTIME_OFFSET = 28
+# sequence, data type, ID, version
+_LOG_ENTRY = struct.Struct("<Q4sqq")
+# sequence (odd while writing), data type, ID, version, length
+_SLOT_HEADER = struct.Struct("<Q4sqqI")
+_SEQUENCE = struct.Struct("<Q")
+_MTIME = struct.Struct("<q")
+
+# Entry locks are byte-range locks far beyond the end of the file, one byte per entry
+_ENTRY_LOCK_BASE = 1 << 40
+_TYPE_CODES = {"com": 1, "pos": 2}
+
+Change = Tuple[str, int, int]
+
+class SharedStore:
+    """
+    Change log and document slots in a memory-mapped file
+
+    Args:
+        path: Path of the store file, created if it does not exist
+        log_entries: Number of changes kept in the log
+        doc_slots: Number of document slots
+        slot_bytes: Maximum size of a document kept in a slot
+    """
+
+    def __init__(self, path: str, log_entries: int = 4096, doc_slots: int = 256, slot_bytes: int = 65536):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._lock = threading.Lock()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and header[:8] == _MAGIC:
+                # Attach to an existing store with the sizes it was created with
+                _, log_entries, doc_slots, slot_bytes, _, _ = _HEADER.unpack(header)
+            else:
+                size = _HEADER_SIZE + log_entries * _LOG_ENTRY.size + doc_slots * (_SLOT_HEADER.size + slot_bytes)
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, log_entries, doc_slots, slot_bytes, 0, 0), 0)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        self.log_entries = log_entries
+        self.doc_slots = doc_slots
+        self.slot_bytes = slot_bytes
+        self._log_offset = _HEADER_SIZE
+        self._slots_offset = self._log_offset + log_entries * _LOG_ENTRY.size
+        self._slot_size = _SLOT_HEADER.size + slot_bytes
+        self._map = mmap.mmap(self._fd, self._slots_offset + doc_slots * self._slot_size)
+
+    def close(self) -> None:
+        """Unmap the store and close the file"""
+        self._map.close()
+        os.close(self._fd)
+
+    def _exclusive(self):
+        return _FileLock(self._fd, self._lock)
+
+    def sequence(self) -> int:
+        """Return the sequence number of the last change"""
+        return _SEQUENCE.unpack_from(self._map, _SEQUENCE_OFFSET)[0]
+
+    def directory_mtime(self) -> int:
+        """Return the data directory's modification time recorded by the last change"""
+        return _MTIME.unpack_from(self._map, _DIRECTORY_MTIME_OFFSET)[0]
+
+    def publish(self, data_type: str, data_id: int, version: int, directory_mtime: int,
+                raw: Optional[bytes] = None) -> int:
+        """
+        Append a saved version to the change log
+
+        Args:
+            data_type: The type of data ('com' or 'pos')
+            data_id: The ID of the entry
+            version: The version that was written
+            directory_mtime: Modification time of the data directory after the write
+            raw: Optional contents of the written file, kept in a document slot
+
+        Returns:
+            The sequence number of the change
+        """
+        with self._exclusive():
+            sequence = self.sequence() + 1
+            offset = self._log_offset + (sequence % self.log_entries) * _LOG_ENTRY.size
+            _LOG_ENTRY.pack_into(self._map, offset, sequence, data_type.encode(), data_id, version)
+            _MTIME.pack_into(self._map, _DIRECTORY_MTIME_OFFSET, directory_mtime)
+            # Publishing the sequence number makes the entry visible to readers
+            _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, sequence)
+            if raw is not None and len(raw) <= self.slot_bytes:
+                self._write_slot(data_type, data_id, version, raw)
+        return sequence
+
+    def changes_since(self, sequence: int) -> Tuple[Optional[List[Change]], int]:
+        """
+        Read the changes published after a sequence number
+
+        Args:
+            sequence: The last sequence number the caller has applied
+
+        Returns:
+            Tuple of (list of (data type, ID, version) changes in order, or None if
+            older changes were already overwritten, latest sequence number)
+        """
+        latest = self.sequence()
+        if latest == sequence:
+            return [], latest
+        if latest - sequence > self.log_entries or latest < sequence:
+            return None, latest
+
+        changes = []
+        for expected in range(sequence + 1, latest + 1):
+            offset = self._log_offset + (expected % self.log_entries) * _LOG_ENTRY.size
+            entry_sequence, data_type, data_id, version = _LOG_ENTRY.unpack_from(self._map, offset)
+            if entry_sequence != expected:
+                # Overwritten while reading
+                return None, self.sequence()
+            changes.append((data_type.rstrip(b"\0").decode(), data_id, version))
+        return changes, latest
+
+    def _slot_offset(self, data_type: str, data_id: int) -> int:
+        slot = zlib.crc32(f"{data_type}-{data_id}".encode()) % self.doc_slots
+        return self._slots_offset + slot * self._slot_size
+
+    def _write_slot(self, data_type: str, data_id: int, version: int, raw: bytes) -> None:
+        offset = self._slot_offset(data_type, data_id)
+        sequence = _SEQUENCE.unpack_from(self._map, offset)[0]
+        _SLOT_HEADER.pack_into(self._map, offset, sequence + 1, data_type.encode(), data_id, version, len(raw))
+        start = offset + _SLOT_HEADER.size
+        self._map[start:start + len(raw)] = raw
+        _SEQUENCE.pack_into(self._map, offset, sequence + 2)
+
+    def put_document(self, data_type: str, data_id: int, version: int, raw: bytes) -> bool:
+        """
+        Keep the contents of a version in its entry's document slot
+
+        Args:
+            data_type: The type of data ('com' or 'pos')
+            data_id: The ID of the entry
+            version: The version of the contents
+            raw: The file contents
+
+        Returns:
+            True if the document was stored, False if it is larger than a slot
+        """
+        if len(raw) > self.slot_bytes:
+            return False
+        with self._exclusive():
+            self._write_slot(data_type, data_id, version, raw)
+        return True
+
+    def discard_document(self, data_type: str, data_id: int, version: int) -> None:
+        """
+        Empty the entry's document slot if it holds the given version
+
+        Args:
+            data_type: The type of data ('com' or 'pos')
+            data_id: The ID of the entry
+            version: The version whose contents are no longer valid
+        """
+        offset = self._slot_offset(data_type, data_id)
+        with self._exclusive():
+            sequence, slot_type, slot_id, slot_version, _ = _SLOT_HEADER.unpack_from(self._map, offset)
+            if slot_id == data_id and slot_version == version and slot_type.rstrip(b"\0") == data_type.encode():
+                _SLOT_HEADER.pack_into(self._map, offset, sequence + 2, b"", 0, 0, 0)
+
+    def get_document(self, data_type: str, data_id: int, version: int) -> Optional[bytes]:
+        """
+        Get the contents of a version from its entry's document slot
+
+        Args:
+            data_type: The type of data ('com' or 'pos')
+            data_id: The ID of the entry
+            version: The version wanted
+
+        Returns:
+            The file contents, or None if the slot holds something else
+        """
+        offset = self._slot_offset(data_type, data_id)
+        sequence, slot_type, slot_id, slot_version, length = _SLOT_HEADER.unpack_from(self._map, offset)
+        if sequence % 2 or slot_id != data_id or slot_version != version or slot_type.rstrip(b"\0") != data_type.encode():
+            return None
+        start = offset + _SLOT_HEADER.size
+        raw = self._map[start:start + min(length, self.slot_bytes)]
+        if _SEQUENCE.unpack_from(self._map, offset)[0] != sequence:
+            return None
+        return raw
+
+    def entry_lock(self, data_type: str, data_id: Optional[int]) -> "_EntryLock":
+        """
+        Get the lock serializing writes to one entry across processes
+
+        Args:
+            data_type: The type of data ('com' or 'pos')
+            data_id: The ID of the entry, or None for the lock used when allocating new IDs
+
+        Returns:
+            A lock usable as a context manager. It is not re-entrant and is shared by
+            all threads of a process, so callers hold a thread lock around it
+        """
+        offset = _ENTRY_LOCK_BASE + (_TYPE_CODES.get(data_type, 0) << 32) + (0 if data_id is None else data_id + 1)
+        return _EntryLock(self._fd, offset)
+
+class _FileLock:
+    """Exclusive lock on the whole store file, also serializing the threads of this process"""
+
+    def __init__(self, fd: int, thread_lock: threading.Lock):
+        self._fd = fd
+        self._thread_lock = thread_lock
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, _HEADER_SIZE, 0)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, _HEADER_SIZE, 0)
+        finally:
+            self._thread_lock.release()
+
+class _EntryLock:
+    """Exclusive lock on one byte of the store file standing for one entry"""
+
+    def __init__(self, fd: int, offset: int):
+        self._fd = fd
+        self._offset = offset
+
+    def __enter__(self):
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, self._offset)
+        return self
+
+    def __exit__(self, *exc_info):
+        fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, self._offset)
@@ -0,0 +1,180 @@
+# src/handlers/admission.py
+"""
+Admission control for the chat workflow.
+
+Limits the number of chat workflows running at once, counting a request that
+runs several workflows concurrently by its weight. Excess requests wait in a
+bounded priority queue and are rejected early, with a Retry-After hint, when the
+queue is full (429) or they waited too long (503), instead of piling up behind
+slow LLM calls until clients time out.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Tuple
+
+from src.config import settings
+from src.utils.logger import log
+from src.utils.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_WAIT, ADMISSION_SHED
+
+ADMISSION_MAX_IN_FLIGHT = settings.admission_max_in_flight
+ADMISSION_MAX_QUEUE = settings.admission_max_queue
+ADMISSION_QUEUE_TIMEOUT = settings.admission_queue_timeout
+ADMISSION_RETRY_AFTER = settings.admission_retry_after
+
+# Lower values are admitted first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+
+_PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal"}
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted"""
+    
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(f"Request rejected by admission control: {reason}")
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """
+    Bounded concurrency with a bounded priority queue
+    
+    Must be used from a single event loop. Waiting requests are admitted in
+    priority order, then in arrival order; a request holds as many slots as its
+    weight, and requests behind it wait until that many slots are free. When the
+    queue is full, a high priority request displaces the newest normal priority
+    request.
+    """
+    
+    def __init__(self, max_in_flight: int = ADMISSION_MAX_IN_FLIGHT, max_queue: int = ADMISSION_MAX_QUEUE,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT, retry_after: int = ADMISSION_RETRY_AFTER):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        # Heap of (priority, arrival number, weight, future)
+        self._waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for admission"""
+        return sum(1 for _, _, _, future in self._waiters if not future.done())
+    
+    def _update_gauges(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+        ADMISSION_QUEUE_DEPTH.set(self.queue_depth)
+    
+    def _reject(self, status_code: int, reason: str) -> AdmissionRejected:
+        ADMISSION_SHED.inc(reason=reason)
+        log.warning("Shedding chat request", reason=reason, in_flight=self.in_flight, queued=self.queue_depth)
+        return AdmissionRejected(status_code, reason, self.retry_after)
+    
+    def _displace_normal_waiter(self) -> bool:
+        candidates = [entry for entry in self._waiters if entry[0] == PRIORITY_NORMAL and not entry[3].done()]
+        if not candidates:
+            return False
+        newest = max(candidates, key=lambda entry: entry[1])
+        newest[3].set_exception(self._reject(429, "displaced"))
+        return True
+    
+    def _slots(self, weight: int) -> int:
+        # A request heavier than the limit would never be admitted, so it takes all slots
+        return max(1, min(weight, self.max_in_flight))
+    
+    async def acquire(self, priority: int = PRIORITY_NORMAL, weight: int = 1) -> None:
+        """
+        Wait for slots
+        
+        Args:
+            priority: PRIORITY_HIGH or PRIORITY_NORMAL
+            weight: Number of slots, i.e. the number of workflows the request runs concurrently
+            
+        Raises:
+            AdmissionRejected: If the queue is full or the request waited longer than the queue timeout
+        """
+        start = time.perf_counter()
+        slots = self._slots(weight)
+        if self.in_flight + slots <= self.max_in_flight and self.queue_depth == 0:
+            self.in_flight += slots
+            self._update_gauges()
+            ADMISSION_WAIT.observe(0.0, priority=_PRIORITY_NAMES[priority])
+            return
+        
+        if self.queue_depth >= self.max_queue:
+            if priority != PRIORITY_HIGH or not self._displace_normal_waiter():
+                raise self._reject(429, "queue_full")
+        
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrivals), slots, future))
+        self._update_gauges()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.exception():
+                # The slot was handed over just as the timeout expired
+                ADMISSION_WAIT.observe(time.perf_counter() - start, priority=_PRIORITY_NAMES[priority])
+                return
+            future.cancel()
+            # Requests queued behind this one may fit now
+            self._admit_waiters()
+            raise self._reject(503, "queue_timeout")
+        except asyncio.CancelledError:
+            # The client went away; give the slots back if they were already handed over
+            if future.done() and not future.cancelled() and not future.exception():
+                self.release(weight)
+            else:
+                future.cancel()
+                self._admit_waiters()
+            raise
+        ADMISSION_WAIT.observe(time.perf_counter() - start, priority=_PRIORITY_NAMES[priority])
+    
+    def _admit_waiters(self) -> None:
+        # Hand free slots to waiting requests in order, stopping at the first that doesn't fit
+        while self._waiters:
+            _, _, slots, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+            elif self.in_flight + slots <= self.max_in_flight:
+                heapq.heappop(self._waiters)
+                self.in_flight += slots
+                future.set_result(None)
+            else:
+                break
+        self._update_gauges()
+    
+    def release(self, weight: int = 1) -> None:
+        """
+        Release slots, handing them to the next waiting requests
+        
+        Args:
+            weight: The weight the slots were acquired with
+        """
+        self.in_flight -= self._slots(weight)
+        self._admit_waiters()
+    
+    @asynccontextmanager
+    async def admit(self, priority: int = PRIORITY_NORMAL, weight: int = 1) -> AsyncIterator[None]:
+        """
+        Hold slots for the duration of the block
+        
+        Args:
+            priority: PRIORITY_HIGH or PRIORITY_NORMAL
+            weight: Number of slots, i.e. the number of workflows the request runs concurrently
+            
+        Raises:
+            AdmissionRejected: If the request is shed
+        """
+        await self.acquire(priority, weight)
+        try:
+            yield
+        finally:
+            self.release(weight)
+
+admission_controller = AdmissionController()
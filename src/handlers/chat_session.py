@@ -0,0 +1,179 @@
+from src.utils.logger import log
+from src.utils.timing import span
+from src.utils.usage import usage_scope
+from src.api.workflow_request_validation import validate_input
+from src.database.file_db import get_latest_version
+from src.workflow.workflow import (
+    load_position_context,
+    render_position_context_parts,
+    render_faq_item,
+    render_faq_list,
+    answer_question,
+    apply_faq_bookkeeping,
+    save_faq_bookkeeping
+)
+from typing import Optional, Dict, Any, List, Tuple
+
+def _faq_signature(faq: Dict[str, Any]) -> Tuple[Any, ...]:
+    # The fields FAQ bookkeeping changes; anything else changes only with a new version
+    return faq.get("id"), faq.get("timesAsked"), faq.get("timestamp")
+
+class ChatSession:
+    """
+    Chat state for one long-lived connection bound to a position.
+    
+    The position and company data, and the rendered prompt context, are loaded
+    once and reused for every question. Before each question the latest version
+    numbers are checked and the data is reloaded only if either changed. FAQ
+    bookkeeping saved by the session updates the cached data in place, and only
+    the FAQs it changed are rendered again.
+    """
+    
+    def __init__(self):
+        self.position_id: Optional[int] = None
+        self.company_id: Optional[int] = None
+        self.position_data: Optional[Dict[str, Any]] = None
+        self.company_data: Optional[Dict[str, Any]] = None
+        self.position_version: Optional[int] = None
+        self.company_version: Optional[int] = None
+        self._context: Optional[str] = None
+        # Rendered context before and after the position FAQs
+        self._context_parts: Optional[Tuple[str, str]] = None
+        # (signature, rendered FAQ) for each position FAQ in the cached context
+        self._rendered_faqs: List[Tuple[Tuple[Any, ...], str]] = []
+    
+    def _clear(self) -> None:
+        # Drop the cached data but stay bound, so the position is loaded again if it reappears
+        self.position_data = None
+        self.company_id = None
+        self.company_data = None
+        self.position_version = None
+        self.company_version = None
+        self._context = None
+        self._context_parts = None
+        self._rendered_faqs = []
+    
+    def bind(self, position_id: int) -> Dict[str, Any]:
+        """
+        Bind the session to a position and load its data.
+        
+        Args:
+            position_id: The ID of the position
+            
+        Returns:
+            A dictionary with the success status and the bound version, or an error
+        """
+        log.info("Binding chat session to position", position_id=position_id)
+        context = load_position_context(position_id)
+        if context is None:
+            return {
+                "success": False,
+                "error": f"Position with ID {position_id} not found"
+            }
+        
+        self.position_id = position_id
+        self.position_data, self.company_id, self.company_data = context
+        self.position_version = self.position_data.get("position", {}).get("version")
+        self.company_version = get_latest_version("com", self.company_id) if self.company_id else None
+        self._context = None
+        self._context_parts = None
+        self._rendered_faqs = []
+        return {
+            "success": True,
+            "positionId": position_id,
+            "version": self.position_version
+        }
+    
+    def _refresh_if_changed(self) -> None:
+        position_version = get_latest_version("pos", self.position_id)
+        company_version = get_latest_version("com", self.company_id) if self.company_id else None
+        if position_version != self.position_version or company_version != self.company_version:
+            log.info("Position changed, reloading chat session data", position_id=self.position_id)
+            if not self.bind(self.position_id)["success"]:
+                # Deleted or unreadable; never answer from the data cached before
+                log.warning("Bound position could not be reloaded", position_id=self.position_id)
+                self._clear()
+    
+    @property
+    def context(self) -> str:
+        """The rendered prompt context for the bound position"""
+        if self._context is None:
+            with span("context_render"):
+                if self._context_parts is None:
+                    self._context_parts = render_position_context_parts(self.position_data, self.company_data)
+                rendered_faqs = []
+                for index, faq in enumerate(self.position_data.get("positionFAQs", [])):
+                    signature = _faq_signature(faq)
+                    if index < len(self._rendered_faqs) and self._rendered_faqs[index][0] == signature:
+                        rendered_faqs.append(self._rendered_faqs[index])
+                    else:
+                        rendered_faqs.append((signature, render_faq_item(faq)))
+                self._rendered_faqs = rendered_faqs
+                head, tail = self._context_parts
+                self._context = head + render_faq_list([rendered for _, rendered in rendered_faqs]) + tail
+        return self._context
+    
+    def ask(self, question: str) -> Dict[str, Any]:
+        """
+        Answer a question about the bound position.
+        
+        Args:
+            question: The question from the user
+            
+        Returns:
+            A dictionary with the response and success status
+        """
+        if self.position_id is None:
+            return {
+                "success": False,
+                "error": "Session is not bound to a position. Send a positionId first."
+            }
+        
+        try:
+            validate_input(question)
+        except ValueError as ve:
+            log.warning("Validation error", error=str(ve))
+            return {
+                "success": False,
+                "error": str(ve)
+            }
+        
+        try:
+            self._refresh_if_changed()
+            if self.position_data is None:
+                return {
+                    "success": False,
+                    "error": f"Position with ID {self.position_id} not found"
+                }
+            
+            with usage_scope(self.position_id, self.company_id):
+                llm_result = answer_question(question, self.position_id, self.position_data, self.company_data, self.context)
+            
+            added_questions: List[str] = []
+            if apply_faq_bookkeeping(question, llm_result, self.position_data, self.position_id, self.company_id,
+                                     added_questions):
+                base_version = self.position_version
+                version = save_faq_bookkeeping(self.position_data, self.position_id, added_questions)
+                if version is not None and version == (base_version or 0) + 1:
+                    # The cached data was saved as it is, so it is the new version; only
+                    # the FAQs the bookkeeping changed are rendered again
+                    self.position_version = version
+                    self._context = None
+                else:
+                    # The save failed or was merged into a version saved by someone else, so
+                    # drop the cached data so the session does not drift from the stored data
+                    self._clear()
+            
+            result = {
+                "success": True,
+                "response": llm_result.get("response", "I'm sorry, I couldn't process your question at the moment.")
+            }
+            if "provenance" in llm_result:
+                result["provenance"] = llm_result["provenance"]
+            return result
+        except Exception:
+            log.exception("Chat session processing failed")
+            return {
+                "success": False,
+                "error": "An unexpected error occurred while processing your request. Please try again later."
+            }
@@ -1,7 +1,8 @@
 from src.utils.logger import log
+from src.utils.timing import span
 from src.api.workflow_request_validation import validate_input
-from src.workflow.workflow import process_input
-from typing import Optional, Dict, Any
+from src.workflow.workflow import process_input, process_batch_input
+from typing import Optional, Dict, Any, List, Tuple
 
 def handle_workflow_request(input_text: str, position_id: Optional[int] = None) -> Dict[str, Any]:
     """
@@ -14,21 +15,23 @@ def handle_workflow_request(input_text: str, position_id: Optional[int] = None)
     Returns:
         A dictionary with the response and success status
     """
-    log.info(f"Validating and processing workflow request for position ID: {position_id}")
+    log.info("Validating and processing workflow request", position_id=position_id)
 
     try:
         # Validate the input
-        validate_input(input_text)
+        with span("validation"):
+            validate_input(input_text)
         log.info("Workflow request validated")        
         
         # Process the input through the workflow
-        result = process_input(input_text, position_id)
+        with span("workflow"):
+            result = process_input(input_text, position_id)
         
-        log.info(f"Workflow response: {result}")
+        log.info("Workflow response", result=result)
         return result
 
     except ValueError as ve:
-        log.warning(f"Validation error: {str(ve)}")
+        log.warning("Validation error", error=str(ve))
         return {
             "success": False,
             "error": str(ve)
@@ -39,3 +42,50 @@ def handle_workflow_request(input_text: str, position_id: Optional[int] = None)
             "success": False,
             "error": "An unexpected error occurred while processing your request. Please try again later."
         }
+
+
+def handle_batch_workflow_request(questions: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    """
+    Handles a batch workflow request by validating each question and processing the valid ones together.
+    
+    Args:
+        questions: List of (question, position_id) tuples
+        
+    Returns:
+        A list of result dictionaries in the same order as the questions
+    """
+    log.info("Validating and processing batch workflow request", questions=len(questions))
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+    valid_indexes = []
+    
+    with span("validation"):
+        for index, (input_text, position_id) in enumerate(questions):
+            try:
+                validate_input(input_text)
+                valid_indexes.append(index)
+            except ValueError as ve:
+                log.warning("Validation error in batch question", index=index, error=str(ve))
+                results[index] = {
+                    "positionId": position_id,
+                    "question": input_text,
+                    "success": False,
+                    "error": str(ve)
+                }
+    
+    try:
+        with span("workflow"):
+            processed = process_batch_input([questions[index] for index in valid_indexes])
+        for index, result in zip(valid_indexes, processed):
+            results[index] = result
+    except Exception:
+        log.exception("Batch workflow processing failed")
+        for index in valid_indexes:
+            results[index] = {
+                "positionId": questions[index][1],
+                "question": questions[index][0],
+                "success": False,
+                "error": "An unexpected error occurred while processing your request. Please try again later."
+            }
+    
+    return results
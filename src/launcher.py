@@ -0,0 +1,66 @@
+"""
+Start the API with several worker processes on one host.
+
+The workers share a memory-mapped store (see src/database/shared_store.py) so a
+version saved by one worker is seen by the others without rescanning the data
+directory, and hot documents are read from memory by all of them.
+
+Usage:
+    python -m src.launcher --workers 4 --port 8000
+"""
+
+import os
+import argparse
+import tempfile
+from typing import List, Optional
+
+import uvicorn
+
+from src.config import settings
+from src.database.shared_store import SharedStore
+
+def default_store_path(port: int) -> str:
+    """
+    Choose where to create the shared store file
+
+    Args:
+        port: Port the API listens on, so instances on one host get separate stores
+
+    Returns:
+        Path in /dev/shm when available so the store stays in memory, else in the temp directory
+    """
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"position-faq-api-{port}.store")
+
+def create_store(path: str) -> None:
+    """
+    Create a fresh shared store, replacing one left over from an earlier run
+
+    Args:
+        path: Path of the store file
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    SharedStore(
+        path,
+        settings.shared_store_log_entries,
+        settings.shared_store_doc_slots,
+        settings.shared_store_slot_bytes
+    ).close()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the API with several workers sharing one file index and document store")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--host", default="0.0.0.0", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--store", help="Path of the shared store file (default: in /dev/shm)")
+    args = parser.parse_args(argv)
+
+    store_path = args.store or default_store_path(args.port)
+    create_store(store_path)
+    # Workers are started as new processes and read their settings from the environment
+    os.environ["SHARED_STORE_PATH"] = store_path
+    uvicorn.run("src.main:app", host=args.host, port=args.port, workers=args.workers)
+
+if __name__ == "__main__":
+    main()
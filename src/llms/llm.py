@@ -1,17 +1,45 @@
 # src/agents/llm.py
-from langchain_anthropic import ChatAnthropic
-import os
-from dotenv import load_dotenv
+import threading
+from typing import Any
+from src.config import settings
 from src.utils.logger import log
 
-load_dotenv()
+MODEL_ID = settings.llm_model_id
 
-MODEL_ID = os.getenv("LLM_MODEL_ID", "claude-3-haiku-20240307")
+class LazyLLM:
+    """
+    Proxy for the chat model that creates the client on first use
+    
+    Importing LangChain and Anthropic and constructing the client takes a large
+    share of startup time, so it is deferred until the first LLM call (or an
+    explicit call to get_client, e.g. during warm-up).
+    """
+    
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+    
+    def get_client(self) -> Any:
+        """Return the chat model client, creating it if needed"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from langchain_anthropic import ChatAnthropic
+                    
+                    log.debug("LLM model", model_id=MODEL_ID)
+                    self._client = ChatAnthropic(
+                        model=MODEL_ID,
+                        temperature=0.1,
+                        top_p=0.7
+                    )
+        return self._client
+    
+    @property
+    def initialized(self) -> bool:
+        """Whether the client has been created"""
+        return self._client is not None
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get_client(), name)
 
-log.debug("LLM MODELID: " + MODEL_ID)
-
-llm = ChatAnthropic(
-    model=MODEL_ID,
-    temperature=0.1,
-    top_p=0.7
-)
\ No newline at end of file
+llm = LazyLLM()
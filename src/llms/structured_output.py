@@ -0,0 +1,179 @@
+# src/llms/structured_output.py
+"""
+Schema-validated JSON output from the chat model.
+
+Each prompt type has a pydantic schema. The JSON object is located by decoding
+from each opening brace in turn (no regular expression over the whole
+response), validated against the schema, and if that fails the model is asked
+once to repair its output. Failures are counted per workflow step. Callers that
+can use a prose reply may opt in to receiving it as is, marked as unstructured.
+"""
+
+import json
+from typing import Any, Callable, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel, PrivateAttr, ValidationError
+
+from src.utils.logger import log
+from src.utils.metrics import LLM_PARSE_FAILURES
+from src.utils.timing import span
+
+# Opening braces tried before giving up on a response
+MAX_JSON_CANDIDATES = 16
+# Characters of the invalid response quoted in the repair prompt
+REPAIR_QUOTE_LENGTH = 2000
+
+T = TypeVar("T", bound=BaseModel)
+
+class QuestionType(BaseModel):
+    """Result of the question type prompt"""
+    is_question: bool
+    about_position: bool = False
+    about_company: bool = False
+
+class QuestionAnswer(BaseModel):
+    """Result of the answer prompt"""
+    similar_question_id: Optional[int] = None
+    response: str
+    # True for a prose reply that was never parsed, which must not drive FAQ bookkeeping
+    _unstructured: bool = PrivateAttr(default=False)
+
+    @property
+    def unstructured(self) -> bool:
+        """Whether the answer is a prose reply rather than a parsed object"""
+        return self._unstructured
+
+    @classmethod
+    def from_plain_text(cls, text: str) -> "QuestionAnswer":
+        answer = cls(response=text)
+        answer._unstructured = True
+        return answer
+
+class DraftAnswer(BaseModel):
+    """One answer of the bulk answer prompt"""
+    id: int
+    response: Optional[str] = None
+
+class DraftAnswers(BaseModel):
+    """Result of the bulk answer prompt"""
+    answers: List[DraftAnswer] = []
+
+class StructuredOutputError(ValueError):
+    """Raised when a response does not match its schema, even after the repair attempt"""
+
+def find_json_object(text: str) -> Optional[Any]:
+    """
+    Decode the first JSON object in a text
+
+    Decoding starts at each opening brace in turn and stops at the end of the
+    object, so text before or after it (e.g. a Markdown code fence) is ignored.
+
+    Args:
+        text: The text of an LLM response
+
+    Returns:
+        The first decodable JSON object, or None if there is none
+    """
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    for _ in range(MAX_JSON_CANDIDATES):
+        if start < 0:
+            return None
+        try:
+            value, _ = decoder.raw_decode(text, start)
+            if isinstance(value, dict):
+                return value
+        except json.JSONDecodeError:
+            pass
+        start = text.find("{", start + 1)
+    return None
+
+def parse_structured(text: str, schema: Type[T]) -> T:
+    """
+    Parse an LLM response into a schema
+
+    Args:
+        text: The text of the response
+        schema: The pydantic model the response should match
+
+    Returns:
+        The validated model
+
+    Raises:
+        StructuredOutputError: If the response holds no valid object
+    """
+    value = find_json_object(text)
+    if value is None:
+        raise StructuredOutputError("The response contains no JSON object")
+    try:
+        return schema.model_validate(value)
+    except ValidationError as e:
+        errors = "; ".join(f"{'.'.join(str(part) for part in error['loc']) or 'object'}: {error['msg']}"
+                           for error in e.errors())
+        raise StructuredOutputError(f"The JSON object does not match the schema: {errors}")
+
+def build_repair_prompt(response_text: str, error: str, schema: Type[BaseModel]) -> str:
+    """
+    Build the prompt asking the model to correct an invalid response
+
+    Args:
+        response_text: The invalid response
+        error: Why it was rejected
+        schema: The pydantic model the response should match
+
+    Returns:
+        The repair prompt
+    """
+    return f"""
+    Your previous response could not be used: {error}
+
+    Previous response:
+    {response_text[:REPAIR_QUOTE_LENGTH]}
+
+    Return ONLY a JSON object, with the same content, matching this JSON schema:
+    {json.dumps(schema.model_json_schema())}
+    """
+
+def invoke_structured(invoke: Callable[[str, str], Any], step: str, prompt: str, schema: Type[T],
+                      plain_text_fallback: bool = False) -> T:
+    """
+    Call the model and parse its response into a schema, with one repair attempt
+
+    Args:
+        invoke: Function calling the model with (step, prompt), returning a message with content
+        step: The workflow step making the call
+        prompt: The prompt to send
+        schema: The pydantic model the response should match
+        plain_text_fallback: Whether to return a response without any JSON through the
+            schema's from_plain_text instead of asking for a repair
+
+    Returns:
+        The validated model, or the unstructured model built from a prose response
+
+    Raises:
+        StructuredOutputError: If neither the response nor the repaired response is valid
+        Exception: Errors from invoke are passed on
+    """
+    response_text = invoke(step, prompt).content
+    try:
+        with span("json_extraction"):
+            return parse_structured(response_text, schema)
+    except StructuredOutputError as e:
+        LLM_PARSE_FAILURES.inc(step=step, attempt="first")
+        error = str(e)
+
+    # Only a reply without any JSON is prose; broken JSON is never shown as an answer
+    text = response_text.strip()
+    if plain_text_fallback and text and "{" not in text:
+        log.warning("Using the unstructured LLM response as is", step=step, error=error)
+        return schema.from_plain_text(text)
+
+    log.warning("LLM response did not match the schema, asking for a repair", step=step, error=error)
+
+    repaired_text = invoke(f"{step}_repair", build_repair_prompt(response_text, error, schema)).content
+    try:
+        with span("json_extraction"):
+            return parse_structured(repaired_text, schema)
+    except StructuredOutputError as e:
+        LLM_PARSE_FAILURES.inc(step=step, attempt="repair")
+        raise StructuredOutputError(f"{error}; after repair: {str(e)}")
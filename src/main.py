@@ -1,32 +1,83 @@
 # src/main.py
 
+import asyncio
 import json
 import os
 import sys
-from fastapi import FastAPI, Request, Depends
-from fastapi.responses import JSONResponse
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Request, Depends, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
+from fastapi.middleware.gzip import GZipMiddleware
 
 # Add the parent directory to sys.path so we can import modules properly
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Load environment variables
-load_dotenv()
+from src.config import settings
+SERVER_TIMING_ENABLED = settings.server_timing_enabled
+POSITIONS_PAGE_MAX_LIMIT = settings.positions_page_max_limit
+SEARCH_MAX_LIMIT = settings.search_max_limit
+BATCH_MAX_CONCURRENCY = settings.batch_max_concurrency
+FAQ_STATS_TOP_K = settings.faq_stats_top_k
+GZIP_MINIMUM_SIZE = settings.gzip_minimum_size
+GZIP_COMPRESS_LEVEL = settings.gzip_compress_level
 
 try:
     from src.utils.logger import log
-    from src.handlers.workflow_handler import handle_workflow_request
+    from src.utils.timing import start_request, end_request, get_spans, summarize_spans, server_timing_header
+    from src.utils.metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION, HTTP_IN_FLIGHT, render_metrics
+    from src.utils.usage import usage_tracker, DIMENSIONS as USAGE_DIMENSIONS
+    from src.warmup import WARMUP_ENABLED, readiness, run_warm_up
+    from src.handlers.workflow_handler import handle_workflow_request, handle_batch_workflow_request
+    from src.handlers.chat_session import ChatSession
+    from src.handlers.admission import admission_controller, AdmissionRejected, PRIORITY_HIGH, PRIORITY_NORMAL
+    from src.workflow.answer_cache import answer_cache
     from src.api.chat_request_model import ChatRequest
+    from src.api.batch_chat_request_model import BatchChatRequest
     from src.api.company_request_model import CompanyRequest
     from src.api.position_request_model import PositionRequest
     from src.api.position_details_model import PositionDetailsRequest
-    from src.database.file_db import get_positions_by_company_id, get_all_position_versions, get_position_data, save_position_data
+    from src.api.http_caching import make_etag, version_etag, not_modified, cache_headers, parse_version_precondition
+    from src.api.position_patch import build_position_patch, PatchConflictError
+    from src.api.projection import parse_fields, canonical_fields, project
+    from src.database.file_db import get_all_position_versions
+    from src.database.file_db import get_company_position_versions, get_version_numbers, get_company_positions_page
+    from src.database.file_db import update_position_data, PositionNotFoundError, VersionConflictError
+    from src.database.file_db import start_watching, stop_watching
+    from src.database.search_index import search_index
+    from src.database.faq_stats import faq_stats
+    from src.utils.email_outbox import email_outbox
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Pick up data files added or changed outside the API without rescanning
+        file_watcher = start_watching()
+        # Send hiring manager notification digests periodically
+        email_outbox.start()
+        # Warm up in the background so /health/live answers while /health/ready waits
+        warmup_task = None
+        if WARMUP_ENABLED:
+            readiness.reset()
+            warmup_task = asyncio.create_task(run_in_threadpool(run_warm_up))
+        else:
+            readiness.mark_ready({"warmup": "disabled"})
+        yield
+        if warmup_task is not None:
+            await warmup_task
+        stop_watching(file_watcher)
+        email_outbox.stop()
+        # Persist usage totals recorded since the last periodic save
+        usage_tracker.flush()
 
     app = FastAPI(
         title="Position FAQ API",
         json_encoder=json.JSONEncoder,
-        default_response_class=JSONResponse
+        default_response_class=JSONResponse,
+        lifespan=lifespan
     )
 
     # Configure CORS
@@ -40,6 +91,9 @@ try:
         allow_headers=["*"],
     )
     
+    # Compress responses above the size threshold for clients that accept gzip
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
+    
     # Add middleware to ensure proper JSON encoding
     @app.middleware("http")
     async def ensure_proper_encoding(request: Request, call_next):
@@ -48,6 +102,38 @@ try:
             response.headers["Content-Type"] = "application/json; charset=utf-8"
         return response
 
+    # Add middleware to give each request an ID and record its stage timings
+    @app.middleware("http")
+    async def request_context(request: Request, call_next):
+        request_id = start_request(request.headers.get("X-Request-ID"))
+        start = time.perf_counter()
+        status_code = 500
+        HTTP_IN_FLIGHT.inc()
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            spans = get_spans()
+            log.info(
+                "Request completed",
+                method=request.method,
+                path=request.url.path,
+                status_code=response.status_code,
+                duration_ms=round((time.perf_counter() - start) * 1000, 3),
+                timings=summarize_spans(spans)
+            )
+            response.headers["X-Request-ID"] = request_id
+            if SERVER_TIMING_ENABLED and spans:
+                response.headers["Server-Timing"] = server_timing_header(spans)
+            return response
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            # Label by route template rather than raw path to keep label cardinality bounded
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUESTS.inc(method=request.method, route=route_path, status=status_code)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, method=request.method, route=route_path)
+            end_request()
+
     @app.get("/")
     async def root():
         return JSONResponse(
@@ -55,17 +141,91 @@ try:
             content={"message": "Welcome to Position FAQ API."},
             media_type="application/json; charset=utf-8"
         )
+    
+    @app.get("/health/live")
+    async def health_live():
+        return JSONResponse(
+            status_code=200,
+            content={"status": "live"},
+            media_type="application/json; charset=utf-8"
+        )
+    
+    @app.get("/health/ready")
+    async def health_ready():
+        if not readiness.is_ready():
+            return JSONResponse(
+                status_code=503,
+                content={"status": "warming_up"},
+                headers={"Retry-After": "1"},
+                media_type="application/json; charset=utf-8"
+            )
+        return JSONResponse(
+            status_code=200,
+            content={"status": "ready", "warmup": readiness.details},
+            media_type="application/json; charset=utf-8"
+        )
         
+    @app.get("/metrics")
+    async def metrics():
+        return PlainTextResponse(
+            content=render_metrics(),
+            media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    @app.get("/v1/usage")
+    async def get_usage(by: Optional[str] = None, limit: int = 20):
+        log.info("Received request for LLM usage", group_by=by)
+        if by is not None and by not in USAGE_DIMENSIONS:
+            return JSONResponse(
+                status_code=400,
+                content={"error": f"Invalid grouping '{by}'. Expected one of: {', '.join(USAGE_DIMENSIONS)}"},
+                media_type="application/json; charset=utf-8"
+            )
+        if by is not None:
+            content = {"by": by, "usage": usage_tracker.top(by, limit)}
+        else:
+            content = {
+                "totals": usage_tracker.summary(),
+                "steps": usage_tracker.top("step", limit),
+                "positions": usage_tracker.top("position", limit),
+                "companies": usage_tracker.top("company", limit)
+            }
+        return JSONResponse(
+            status_code=200,
+            content=content,
+            media_type="application/json; charset=utf-8"
+        )
+
+    def admission_rejected_response(rejection: AdmissionRejected) -> JSONResponse:
+        return JSONResponse(
+            status_code=rejection.status_code,
+            content={
+                "error": "The server is busy. Please try again later.",
+                "retryAfter": rejection.retry_after
+            },
+            headers={"Retry-After": str(rejection.retry_after)},
+            media_type="application/json; charset=utf-8"
+        )
+
     @app.post("/v1/chatRequest")
     async def chat_request(chat_request: ChatRequest):
-        log.info(f"Received chat request for position ID: {chat_request.positionId}")
+        log.info("Received chat request", position_id=chat_request.positionId)
         try:
-            result = handle_workflow_request(chat_request.question, chat_request.positionId)
+            # Repeated questions are answered from the answer cache without an LLM call, so they go first
+            if answer_cache.contains(chat_request.positionId, chat_request.question):
+                priority = PRIORITY_HIGH
+            else:
+                priority = PRIORITY_NORMAL
+            async with admission_controller.admit(priority):
+                result = await run_in_threadpool(handle_workflow_request, chat_request.question, chat_request.positionId)
             
             if result["success"]:
+                content = {"response": result["response"]}
+                if "provenance" in result:
+                    content["provenance"] = result["provenance"]
                 return JSONResponse(
                     status_code=200,
-                    content={"response": result["response"]},
+                    content=content,
                     media_type="application/json; charset=utf-8"
                 )
             else:
@@ -74,24 +234,228 @@ try:
                     content={"error": result["error"]},
                     media_type="application/json; charset=utf-8"
                 )
+        except AdmissionRejected as rejection:
+            return admission_rejected_response(rejection)
         except Exception as e:
-            log.exception("Unhandled exception in chat request endpoint: %s", str(e))
+            log.exception("Unhandled exception in chat request endpoint", error=str(e))
             return JSONResponse(
                 status_code=500, 
                 content={"error": "An unexpected error occurred. Please try again later."},
                 media_type="application/json; charset=utf-8"
             )
             
+    @app.post("/v1/chatRequest/batch")
+    async def batch_chat_request(batch_request: BatchChatRequest):
+        log.info("Received batch chat request", questions=len(batch_request.questions))
+        try:
+            # A batch answers up to BATCH_MAX_CONCURRENCY questions at once, so it holds a slot for each
+            weight = min(len(batch_request.questions), BATCH_MAX_CONCURRENCY)
+            async with admission_controller.admit(PRIORITY_NORMAL, weight):
+                results = await run_in_threadpool(
+                    handle_batch_workflow_request,
+                    [(item.question, item.positionId) for item in batch_request.questions]
+                )
+            return JSONResponse(
+                status_code=200,
+                content={"responses": results},
+                media_type="application/json; charset=utf-8"
+            )
+        except AdmissionRejected as rejection:
+            return admission_rejected_response(rejection)
+        except Exception as e:
+            log.exception("Unhandled exception in batch chat request endpoint", error=str(e))
+            return JSONResponse(
+                status_code=500,
+                content={"error": "An unexpected error occurred. Please try again later."},
+                media_type="application/json; charset=utf-8"
+            )
+            
+    @app.websocket("/v1/chat/ws")
+    async def chat_websocket(websocket: WebSocket):
+        await websocket.accept()
+        log.info("Chat WebSocket connection opened")
+        session = ChatSession()
+        try:
+            while True:
+                text = await websocket.receive_text()
+                start_request()
+                try:
+                    try:
+                        message = json.loads(text)
+                        if not isinstance(message, dict):
+                            raise ValueError("Message must be a JSON object")
+                    except ValueError:
+                        await websocket.send_json({"type": "error", "error": "Invalid message. Expected a JSON object."})
+                        continue
+                    
+                    if "positionId" in message:
+                        try:
+                            position_id = int(message["positionId"])
+                        except (TypeError, ValueError):
+                            await websocket.send_json({"type": "error", "error": "positionId must be an integer"})
+                            continue
+                        result = await run_in_threadpool(session.bind, position_id)
+                        if not result["success"]:
+                            await websocket.send_json({"type": "error", "error": result["error"]})
+                            continue
+                        await websocket.send_json({"type": "bound", "positionId": position_id, "version": result["version"]})
+                    
+                    if "question" in message:
+                        question = str(message["question"])
+                        if answer_cache.contains(session.position_id, question):
+                            priority = PRIORITY_HIGH
+                        else:
+                            priority = PRIORITY_NORMAL
+                        try:
+                            async with admission_controller.admit(priority):
+                                result = await run_in_threadpool(session.ask, question)
+                        except AdmissionRejected as rejection:
+                            await websocket.send_json({
+                                "type": "error",
+                                "question": message["question"],
+                                "error": "The server is busy. Please try again later.",
+                                "retryAfter": rejection.retry_after
+                            })
+                            continue
+                        if result["success"]:
+                            answer = {"type": "answer", "question": message["question"], "response": result["response"]}
+                            if "provenance" in result:
+                                answer["provenance"] = result["provenance"]
+                            await websocket.send_json(answer)
+                        else:
+                            await websocket.send_json({"type": "error", "question": message["question"], "error": result["error"]})
+                    elif "positionId" not in message:
+                        await websocket.send_json({"type": "error", "error": "Message must contain a positionId or a question"})
+                finally:
+                    end_request()
+        except WebSocketDisconnect:
+            log.info("Chat WebSocket connection closed", position_id=session.position_id)
+
+    @app.get("/v1/search")
+    async def search(q: str = "", companyId: Optional[int] = None, positionId: Optional[int] = None,
+                     answeredOnly: bool = False, limit: int = 10):
+        log.info("Received search request", company_id=companyId, position_id=positionId)
+        try:
+            if not q.strip():
+                return JSONResponse(
+                    status_code=400,
+                    content={"error": "q must not be empty"},
+                    media_type="application/json; charset=utf-8"
+                )
+            if not 1 <= limit <= SEARCH_MAX_LIMIT:
+                return JSONResponse(
+                    status_code=400,
+                    content={"error": f"limit must be between 1 and {SEARCH_MAX_LIMIT}"},
+                    media_type="application/json; charset=utf-8"
+                )
+            
+            # The first search builds the index from every latest document
+            results = await run_in_threadpool(search_index.search, q, companyId, positionId, answeredOnly, limit)
+            return JSONResponse(
+                status_code=200,
+                content={"query": q, "results": results},
+                media_type="application/json; charset=utf-8"
+            )
+        except Exception as e:
+            log.exception("Unhandled exception in search endpoint", error=str(e))
+            return JSONResponse(
+                status_code=500,
+                content={"error": "An unexpected error occurred. Please try again later."},
+                media_type="application/json; charset=utf-8"
+            )
+            
+    async def _faq_stats_response(scope: str, stats_function, entry_id: int, limit: Optional[int]):
+        if limit is None:
+            limit = FAQ_STATS_TOP_K
+        if not 1 <= limit <= FAQ_STATS_TOP_K:
+            return JSONResponse(
+                status_code=400,
+                content={"error": f"limit must be between 1 and {FAQ_STATS_TOP_K}"},
+                media_type="application/json; charset=utf-8"
+            )
+        
+        # Served from the aggregates; only positions changed since the last request are re-read
+        stats = await run_in_threadpool(stats_function, entry_id, limit)
+        if stats is None:
+            return JSONResponse(
+                status_code=404,
+                content={"error": f"No positions found for {scope} ID: {entry_id}"},
+                media_type="application/json; charset=utf-8"
+            )
+        return JSONResponse(
+            status_code=200,
+            content=stats,
+            media_type="application/json; charset=utf-8"
+        )
+
+    @app.get("/v1/company/{company_id}/faq-stats")
+    async def get_company_faq_stats(company_id: int, limit: Optional[int] = None):
+        log.info("Received request for company FAQ stats", company_id=company_id)
+        try:
+            return await _faq_stats_response("company", faq_stats.company_stats, company_id, limit)
+        except Exception as e:
+            log.exception("Unhandled exception in company FAQ stats endpoint", error=str(e))
+            return JSONResponse(
+                status_code=500,
+                content={"error": "An unexpected error occurred. Please try again later."},
+                media_type="application/json; charset=utf-8"
+            )
+
+    @app.get("/v1/position/{position_id}/faq-stats")
+    async def get_position_faq_stats(position_id: int, limit: Optional[int] = None):
+        log.info("Received request for position FAQ stats", position_id=position_id)
+        try:
+            return await _faq_stats_response("position", faq_stats.position_stats, position_id, limit)
+        except Exception as e:
+            log.exception("Unhandled exception in position FAQ stats endpoint", error=str(e))
+            return JSONResponse(
+                status_code=500,
+                content={"error": "An unexpected error occurred. Please try again later."},
+                media_type="application/json; charset=utf-8"
+            )
+
     @app.get("/v1/company/{company_id}/positions")
-    async def get_company_positions(company_id: int):
-        log.info(f"Received request for positions of company ID: {company_id}")
+    async def get_company_positions(company_id: int, request: Request, fields: Optional[str] = None,
+                                    limit: Optional[int] = None, cursor: Optional[str] = None, summary: bool = False):
+        log.info("Received request for company positions", company_id=company_id)
         try:
-            positions = get_positions_by_company_id(company_id)
+            try:
+                field_tree = parse_fields(fields)
+                if limit is not None and not 1 <= limit <= POSITIONS_PAGE_MAX_LIMIT:
+                    raise ValueError(f"limit must be between 1 and {POSITIONS_PAGE_MAX_LIMIT}")
+                # The cursor is the ID of the last position on the previous page
+                if cursor is not None and not (cursor.isascii() and cursor.isdigit()):
+                    raise ValueError(f"Invalid cursor: '{cursor}'")
+            except ValueError as ve:
+                return JSONResponse(
+                    status_code=400,
+                    content={"error": str(ve)},
+                    media_type="application/json; charset=utf-8"
+                )
+            
+            # The ETag is derived from the version index, so unchanged polls never load documents
+            position_versions = get_company_position_versions(company_id)
+            etag = make_etag("company-positions", company_id, sorted(position_versions.items()), canonical_fields(field_tree),
+                             limit, cursor, summary)
+            if position_versions:
+                cached_response = not_modified(request, etag)
+                if cached_response:
+                    return cached_response
+            
+            # The body is read from the same versions as the ETag, so the two always agree
+            after_id = int(cursor) if cursor is not None else None
+            positions, next_after_id = get_company_positions_page(company_id, limit, after_id, summary,
+                                                                  position_versions)
+            content = {"positions": project(positions, field_tree)}
+            if limit is not None or cursor is not None or summary:
+                content["nextCursor"] = str(next_after_id) if next_after_id is not None else None
             
-            if positions:
+            # An empty page past the end is still a valid response for an existing company
+            if position_versions:
                 return JSONResponse(
                     status_code=200,
-                    content={"positions": positions},
+                    content=content,
+                    headers=cache_headers(etag),
                     media_type="application/json; charset=utf-8"
                 )
             else:
@@ -101,7 +465,7 @@ try:
                     media_type="application/json; charset=utf-8"
                 )
         except Exception as e:
-            log.exception("Unhandled exception in company positions endpoint: %s", str(e))
+            log.exception("Unhandled exception in company positions endpoint", error=str(e))
             return JSONResponse(
                 status_code=500,
                 content={"error": "An unexpected error occurred. Please try again later."},
@@ -109,15 +473,35 @@ try:
             )
             
     @app.get("/v1/position/{position_id}/versions")
-    async def get_position_versions(position_id: int):
-        log.info(f"Received request for all versions of position ID: {position_id}")
+    async def get_position_versions(position_id: int, request: Request, fields: Optional[str] = None):
+        log.info("Received request for position versions", position_id=position_id)
         try:
-            versions = get_all_position_versions(position_id)
+            try:
+                field_tree = parse_fields(fields)
+            except ValueError as ve:
+                return JSONResponse(
+                    status_code=400,
+                    content={"error": str(ve)},
+                    media_type="application/json; charset=utf-8"
+                )
+            
+            # Versions are only ever added, so the latest version number identifies the content.
+            # The ETag carries it, so it can be sent back in If-Match when patching the position.
+            version_numbers = get_version_numbers("pos", position_id)
+            etag = version_etag(version_numbers[-1], canonical_fields(field_tree)) if version_numbers else None
+            if etag is not None:
+                cached_response = not_modified(request, etag)
+                if cached_response:
+                    return cached_response
+            
+            # The body is read from the same versions as the ETag, so the two always agree
+            versions = get_all_position_versions(position_id, version_numbers)
             
             if versions:
                 return JSONResponse(
                     status_code=200,
-                    content={"versions": versions},
+                    content={"versions": project(versions, field_tree)},
+                    headers=cache_headers(etag) if etag is not None else None,
                     media_type="application/json; charset=utf-8"
                 )
             else:
@@ -127,7 +511,7 @@ try:
                     media_type="application/json; charset=utf-8"
                 )
         except Exception as e:
-            log.exception("Unhandled exception in position versions endpoint: %s", str(e))
+            log.exception("Unhandled exception in position versions endpoint", error=str(e))
             return JSONResponse(
                 status_code=500,
                 content={"error": "An unexpected error occurred. Please try again later."},
@@ -135,53 +519,134 @@ try:
             )
 
     @app.put("/v1/position/{position_id}/details")
-    async def update_position_details(position_id: int, details: PositionDetailsRequest):
-        log.info(f"Received request to update details for position ID: {position_id}")
+    async def update_position_details(position_id: int, details: PositionDetailsRequest, request: Request):
+        log.info("Received request to update position details", position_id=position_id)
         try:
-            # Get the current position data
-            current_data = get_position_data(position_id)
+            try:
+                expected_version = parse_version_precondition(request.headers.get("If-Match"))
+            except ValueError as ve:
+                return JSONResponse(
+                    status_code=400,
+                    content={"error": str(ve)},
+                    media_type="application/json; charset=utf-8"
+                )
+            
+            def replace_details(new_data):
+                # Update position details
+                if details.position:
+                    new_data["position"] = details.position
+                    # Ensure position ID is preserved
+                    new_data["position"]["id"] = position_id
+                
+                # Update FAQs if provided
+                if details.positionFAQs:
+                    new_data["positionFAQs"] = details.positionFAQs
+                    # Ensure position ID is set for all FAQs
+                    for faq in new_data["positionFAQs"]:
+                        faq["positionId"] = position_id
+                
+                # Update position info if provided
+                if details.positionInfo:
+                    new_data["positionInfo"] = details.positionInfo
+                    # Ensure position ID is set for all info items
+                    for info in new_data["positionInfo"]:
+                        info["positionId"] = position_id
             
-            if not current_data:
+            try:
+                # Applied to the latest version under the position's lock, like PATCH, so a
+                # concurrent PATCH or counter update cannot be lost in between
+                # Off the event loop, since it may wait for the lock behind another save
+                success, saved_id, version = await run_in_threadpool(
+                    update_position_data, position_id, replace_details, expected_version)
+            except PositionNotFoundError:
                 return JSONResponse(
                     status_code=404,
                     content={"error": f"Position not found with ID: {position_id}"},
                     media_type="application/json; charset=utf-8"
                 )
+            except VersionConflictError as vce:
+                return JSONResponse(
+                    status_code=412,
+                    content={"error": str(vce), "currentVersion": vce.current_version},
+                    headers={"ETag": f'"{vce.current_version}"'},
+                    media_type="application/json; charset=utf-8"
+                )
             
-            # Create a new version with updated data
-            new_data = current_data.copy()
-            
-            # Update position details
-            if details.position:
-                new_data["position"] = details.position
-                # Ensure position ID is preserved
-                new_data["position"]["id"] = position_id
-            
-            # Update FAQs if provided
-            if details.positionFAQs:
-                new_data["positionFAQs"] = details.positionFAQs
-                # Ensure position ID is set for all FAQs
-                for faq in new_data["positionFAQs"]:
-                    faq["positionId"] = position_id
-            
-            # Update position info if provided
-            if details.positionInfo:
-                new_data["positionInfo"] = details.positionInfo
-                # Ensure position ID is set for all info items
-                for info in new_data["positionInfo"]:
-                    info["positionId"] = position_id
+            if success:
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "message": f"Position details updated successfully",
+                        "positionId": saved_id,
+                        "version": version
+                    },
+                    headers={"ETag": f'"{version}"'},
+                    media_type="application/json; charset=utf-8"
+                )
+            else:
+                return JSONResponse(
+                    status_code=500,
+                    content={"error": "Failed to save position details"},
+                    media_type="application/json; charset=utf-8"
+                )
+        except Exception as e:
+            log.exception("Unhandled exception in update position details endpoint", error=str(e))
+            return JSONResponse(
+                status_code=500,
+                content={"error": "An unexpected error occurred. Please try again later."},
+                media_type="application/json; charset=utf-8"
+            )
+
+    @app.patch("/v1/position/{position_id}/details")
+    async def patch_position_details(position_id: int, request: Request):
+        log.info("Received request to patch position details", position_id=position_id)
+        try:
+            try:
+                expected_version = parse_version_precondition(request.headers.get("If-Match"))
+                body = await request.json()
+                patch_position = build_position_patch(body, request.headers.get("Content-Type"), position_id)
+            except ValueError as ve:
+                return JSONResponse(
+                    status_code=400,
+                    content={"error": str(ve)},
+                    media_type="application/json; charset=utf-8"
+                )
             
-            # Save the updated position data
-            success, saved_id, version = save_position_data(new_data, position_id)
+            try:
+                # Applied to the latest version under the position's lock, so concurrent
+                # counter updates are neither lost nor able to overwrite this edit
+                # Off the event loop, since it may wait for the lock behind another save
+                success, saved_id, version = await run_in_threadpool(
+                    update_position_data, position_id, patch_position, expected_version)
+            except PositionNotFoundError:
+                return JSONResponse(
+                    status_code=404,
+                    content={"error": f"Position not found with ID: {position_id}"},
+                    media_type="application/json; charset=utf-8"
+                )
+            except VersionConflictError as vce:
+                return JSONResponse(
+                    status_code=412,
+                    content={"error": str(vce), "currentVersion": vce.current_version},
+                    headers={"ETag": f'"{vce.current_version}"'},
+                    media_type="application/json; charset=utf-8"
+                )
+            except PatchConflictError as pce:
+                return JSONResponse(
+                    status_code=409,
+                    content={"error": str(pce)},
+                    media_type="application/json; charset=utf-8"
+                )
             
             if success:
                 return JSONResponse(
                     status_code=200,
                     content={
-                        "message": f"Position details updated successfully",
+                        "message": "Position details updated successfully",
                         "positionId": saved_id,
                         "version": version
                     },
+                    headers={"ETag": f'"{version}"'},
                     media_type="application/json; charset=utf-8"
                 )
             else:
@@ -191,7 +656,7 @@ try:
                     media_type="application/json; charset=utf-8"
                 )
         except Exception as e:
-            log.exception("Unhandled exception in update position details endpoint: %s", str(e))
+            log.exception("Unhandled exception in patch position details endpoint", error=str(e))
             return JSONResponse(
                 status_code=500,
                 content={"error": "An unexpected error occurred. Please try again later."},
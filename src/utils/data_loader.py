@@ -18,7 +18,7 @@ def load_position_data(position_id: int) -> Optional[Dict[str, Any]]:
         file_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
                                "staticFiles", "example_data.json")
         
-        log.info(f"Loading position data from {file_path} for position ID: {position_id}")
+        log.info("Loading position data", file_path=file_path, position_id=position_id)
         
         # Read the JSON file
         with open(file_path, 'r') as file:
@@ -26,17 +26,17 @@ def load_position_data(position_id: int) -> Optional[Dict[str, Any]]:
         
         # Check if the position ID matches
         if data.get("position", {}).get("id") != position_id:
-            log.warning(f"Position ID {position_id} not found in data")
+            log.warning("Position not found in data", position_id=position_id)
             return None
             
         return data
         
     except FileNotFoundError:
-        log.error(f"Example data file not found")
+        log.error("Example data file not found")
         return None
     except json.JSONDecodeError:
-        log.error(f"Error decoding JSON from example data file")
+        log.error("Error decoding JSON from example data file")
         return None
     except Exception as e:
-        log.exception(f"Unexpected error loading position data: {str(e)}")
+        log.exception("Unexpected error loading position data", error=str(e))
         return None
@@ -0,0 +1,377 @@
+# src/utils/email_outbox.py
+"""
+Outbox for hiring manager notifications.
+
+Notifications are queued in a SQLite file and coalesced per recipient into one
+digest email every digest interval, so a busy position sends one email listing
+its new questions instead of one email per question. Digests are sent with
+bounded concurrency through a pluggable transport and retried with backoff.
+
+The queue survives restarts. Notifications are assigned to a digest in the same
+transaction that creates it, and a digest is leased before it is sent, so
+several workers sharing the file never send the same digest concurrently. If a
+process dies after sending a digest but before recording it, the digest is sent
+again with the same Message-ID, so receivers can discard the duplicate.
+"""
+
+import os
+import time
+import smtplib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.message import EmailMessage
+from email.utils import formatdate
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.config import settings
+from src.utils.logger import log
+from src.utils.metrics import EMAILS_SENT
+
+# Kept next to the package by default, like the data files, so it doesn't depend on the working directory
+EMAIL_OUTBOX_FILE = (os.path.abspath(settings.email_outbox_file) if settings.email_outbox_file
+                     else os.path.join(os.path.dirname(os.path.dirname(__file__)), "email_outbox.sqlite3"))
+EMAIL_TRANSPORT = settings.email_transport
+EMAIL_FILE_DIR = settings.email_file_dir
+EMAIL_SMTP_HOST = settings.email_smtp_host
+EMAIL_SMTP_PORT = settings.email_smtp_port
+EMAIL_SENDER = settings.email_sender
+EMAIL_DIGEST_INTERVAL = settings.email_digest_interval
+EMAIL_SEND_CONCURRENCY = settings.email_send_concurrency
+EMAIL_MAX_ATTEMPTS = settings.email_max_attempts
+HIRING_MANAGER_EMAIL = settings.hiring_manager_email
+
+# Seconds a worker may take to send a digest before another worker may retry it
+LEASE_SECONDS = 300
+# Retry delay is RETRY_BASE_SECONDS * 2^attempts, capped at RETRY_MAX_SECONDS
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY,
+    recipient TEXT NOT NULL,
+    position_id INTEGER,
+    position_title TEXT,
+    question TEXT NOT NULL,
+    created REAL NOT NULL,
+    digest_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS notifications_pending ON notifications (digest_id);
+CREATE TABLE IF NOT EXISTS digests (
+    id INTEGER PRIMARY KEY,
+    recipient TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending'
+);
+"""
+
+class LogTransport:
+    """Logs emails instead of sending them, for local development"""
+
+    def send(self, message: EmailMessage) -> None:
+        log.info("[LOCAL EMAIL]", to=message["To"], subject=message["Subject"], message_id=message["Message-ID"])
+
+class FileTransport:
+    """
+    Writes each email to a .eml file named after its Message-ID
+
+    Args:
+        directory: The directory to write the files to
+    """
+
+    def __init__(self, directory: str = EMAIL_FILE_DIR):
+        self.directory = directory
+
+    def send(self, message: EmailMessage) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        file_name = message["Message-ID"].strip("<>").replace("@", "_") + ".eml"
+        # A resent digest overwrites its earlier file
+        with open(os.path.join(self.directory, file_name), "wb") as file:
+            file.write(message.as_bytes())
+
+class SmtpTransport:
+    """
+    Sends emails through an SMTP server, e.g. a local debugging server
+
+    Args:
+        host: The SMTP server host
+        port: The SMTP server port
+        timeout: Seconds to wait for the server
+    """
+
+    def __init__(self, host: str = EMAIL_SMTP_HOST, port: int = EMAIL_SMTP_PORT, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def send(self, message: EmailMessage) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(message)
+
+TRANSPORTS: Dict[str, Callable[[], Any]] = {
+    "log": LogTransport,
+    "file": FileTransport,
+    "smtp": SmtpTransport,
+}
+
+def make_transport(name: str):
+    """
+    Create an email transport by name
+
+    Args:
+        name: 'log', 'file', 'smtp' or another name registered in TRANSPORTS
+
+    Returns:
+        A transport with a send(message) method that raises on failure
+    """
+    try:
+        return TRANSPORTS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown email transport: '{name}'")
+
+def _build_digest(notifications: List[sqlite3.Row]) -> Dict[str, str]:
+    """Build the subject and body of a digest from its notifications, oldest first"""
+    count = len(notifications)
+    subject = f"{count} new question{'s' if count != 1 else ''} about your positions"
+    lines = ["New questions were added to the question list of your positions:"]
+    current_position = object()
+    for notification in notifications:
+        if notification["position_id"] != current_position:
+            current_position = notification["position_id"]
+            title = notification["position_title"] or "Position"
+            lines.append("")
+            lines.append(f"{title} (position {current_position}):")
+        lines.append(f"  - {notification['question']}")
+    return {"subject": subject, "body": "\n".join(lines) + "\n"}
+
+class EmailOutbox:
+    """
+    Persistent queue of notifications, sent as periodic digests per recipient
+
+    Args:
+        file_path: The SQLite file holding the queue
+        transport: The transport used to send digests
+        digest_interval: Seconds between digests when running in the background
+        concurrency: Maximum number of digests sent at once
+        max_attempts: Attempts before a digest is marked failed
+        sender: The From address of digests
+    """
+
+    def __init__(self, file_path: str = EMAIL_OUTBOX_FILE, transport=None,
+                 digest_interval: float = EMAIL_DIGEST_INTERVAL, concurrency: int = EMAIL_SEND_CONCURRENCY,
+                 max_attempts: int = EMAIL_MAX_ATTEMPTS, sender: str = EMAIL_SENDER):
+        self.file_path = file_path
+        self._transport = transport
+        self.digest_interval = digest_interval
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.sender = sender
+        self._schema_ready = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def transport(self):
+        # Created on first use, so an invalid EMAIL_TRANSPORT only fails when emails are sent
+        if self._transport is None:
+            self._transport = make_transport(EMAIL_TRANSPORT)
+        return self._transport
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.file_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            if not self._schema_ready:
+                connection.executescript(_SCHEMA)
+                self._schema_ready = True
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as connection:
+            # Take the write lock up front, so concurrent workers serialize
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def enqueue(self, recipient: str, question: str, position_id: Optional[int] = None,
+                position_title: Optional[str] = None) -> None:
+        """
+        Queue a notification for the recipient's next digest
+
+        Args:
+            recipient: The email address to notify
+            question: The question to list in the digest
+            position_id: The ID of the position the question is about
+            position_title: The title of the position
+        """
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO notifications (recipient, position_id, position_title, question, created) VALUES (?, ?, ?, ?, ?)",
+                (recipient, position_id, position_title, question, time.time())
+            )
+
+    def pending_count(self) -> int:
+        """Return the number of notifications and digests not yet sent"""
+        if not os.path.exists(self.file_path):
+            return 0
+        with self._connect() as connection:
+            notifications = connection.execute("SELECT COUNT(*) FROM notifications WHERE digest_id IS NULL").fetchone()[0]
+            digests = connection.execute("SELECT COUNT(*) FROM digests WHERE status = 'pending'").fetchone()[0]
+        return notifications + digests
+
+    def _coalesce(self, now: float) -> None:
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT * FROM notifications WHERE digest_id IS NULL ORDER BY recipient, position_id, id"
+            ).fetchall()
+            by_recipient: Dict[str, List[sqlite3.Row]] = {}
+            for row in rows:
+                by_recipient.setdefault(row["recipient"], []).append(row)
+            for recipient, notifications in by_recipient.items():
+                digest = _build_digest(notifications)
+                digest_id = connection.execute(
+                    "INSERT INTO digests (recipient, subject, body, created, next_attempt) VALUES (?, ?, ?, ?, ?)",
+                    (recipient, digest["subject"], digest["body"], now, now)
+                ).lastrowid
+                connection.executemany("UPDATE notifications SET digest_id = ? WHERE id = ?",
+                                       [(digest_id, notification["id"]) for notification in notifications])
+
+    def _lease(self, now: float) -> List[sqlite3.Row]:
+        with self._transaction() as connection:
+            digests = connection.execute(
+                "SELECT * FROM digests WHERE status = 'pending' AND next_attempt <= ? ORDER BY id", (now,)
+            ).fetchall()
+            connection.executemany("UPDATE digests SET next_attempt = ? WHERE id = ?",
+                                   [(now + LEASE_SECONDS, digest["id"]) for digest in digests])
+        return digests
+
+    def _message(self, digest: sqlite3.Row) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = digest["recipient"]
+        message["Subject"] = digest["subject"]
+        message["Date"] = formatdate(digest["created"], localtime=True)
+        # Derived from the stored digest, so a resent digest has the same Message-ID
+        domain = self.sender.rpartition("@")[2] or "localhost"
+        message["Message-ID"] = f"<digest-{digest['id']}-{int(digest['created'])}@{domain}>"
+        message.set_content(digest["body"])
+        return message
+
+    def _send(self, digest: sqlite3.Row) -> Optional[str]:
+        try:
+            self.transport.send(self._message(digest))
+            return None
+        except Exception as e:
+            return str(e)
+
+    def _record(self, digest: sqlite3.Row, error: Optional[str], now: float) -> None:
+        with self._transaction() as connection:
+            if error is None:
+                connection.execute("DELETE FROM notifications WHERE digest_id = ?", (digest["id"],))
+                connection.execute("DELETE FROM digests WHERE id = ?", (digest["id"],))
+                EMAILS_SENT.inc(outcome="sent")
+                return
+
+            attempts = digest["attempts"] + 1
+            if attempts >= self.max_attempts:
+                connection.execute("UPDATE digests SET attempts = ?, status = 'failed' WHERE id = ?", (attempts, digest["id"]))
+                EMAILS_SENT.inc(outcome="failed")
+                log.error("Giving up on notification digest", digest_id=digest["id"], attempts=attempts, error=error)
+            else:
+                retry_at = now + min(RETRY_BASE_SECONDS * 2 ** attempts, RETRY_MAX_SECONDS)
+                connection.execute("UPDATE digests SET attempts = ?, next_attempt = ? WHERE id = ?",
+                                   (attempts, retry_at, digest["id"]))
+                EMAILS_SENT.inc(outcome="retry")
+                log.warning("Failed to send notification digest", digest_id=digest["id"], attempts=attempts, error=error)
+
+    def flush(self, now: Optional[float] = None) -> int:
+        """
+        Coalesce queued notifications into digests and send the digests that are due
+
+        Args:
+            now: The current time, defaults to time.time()
+
+        Returns:
+            The number of digests sent
+        """
+        # Nothing was ever queued, don't create the file
+        if not os.path.exists(self.file_path):
+            return 0
+        if now is None:
+            now = time.time()
+
+        self._coalesce(now)
+        digests = self._lease(now)
+        if not digests:
+            return 0
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.concurrency, len(digests)))) as executor:
+            errors = list(executor.map(self._send, digests))
+        for digest, error in zip(digests, errors):
+            self._record(digest, error, now)
+        sent = errors.count(None)
+        log.info("Sent notification digests", sent=sent, failed=len(digests) - sent)
+        return sent
+
+    def start(self) -> None:
+        """Send digests every digest interval in a background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread; queued notifications stay in the file"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.digest_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                log.error("Error sending notification digests", error=str(e))
+
+email_outbox = EmailOutbox()
+
+def notify_question_added(position_data: Dict[str, Any], position_id: int, question: str) -> bool:
+    """
+    Queue a notification to the position's hiring manager about a new question
+
+    Args:
+        position_data: The position data the question was added to
+        position_id: The ID of the position
+        question: The question that was added
+
+    Returns:
+        True if a notification was queued, False if the position has no hiring
+        manager email and HIRING_MANAGER_EMAIL is not set
+    """
+    position = position_data.get("position", {})
+    recipient = position.get("hiringManagerEmail") or HIRING_MANAGER_EMAIL
+    if not recipient:
+        return False
+    try:
+        email_outbox.enqueue(recipient, question, position_id, position.get("positionTitle"))
+        return True
+    except Exception as e:
+        log.error("Error queueing notification", position_id=position_id, error=str(e))
+        return False
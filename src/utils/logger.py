@@ -1,20 +1,230 @@
 # src/utils/logger.py
+"""
+Structured logging for the API and workflow.
+
+Events are filtered by level before anything is formatted, sampled per event
+name, truncated so large payloads (questions, LLM results, responses) cannot
+flood the log, rendered as JSON and handed to a background writer thread so
+request threads never block on stdout.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+from typing import Any, Dict, Optional
+
 import structlog
-from dotenv import load_dotenv
-import os
+from src.config import settings
+
+_LEVEL_ALIASES = {"WARN": logging.WARNING, "FATAL": logging.CRITICAL}
+_SAMPLED_METHODS = {"debug", "info"}
+
+def parse_level(value: Any) -> int:
+    """
+    Parse a logging level given as a number or a level name
+
+    Args:
+        value: Level such as 20, "20", "info" or "WARNING"
+
+    Returns:
+        The numeric logging level
+    """
+    if isinstance(value, int):
+        return value
+    text = str(value).strip()
+    if text.isdigit():
+        return int(text)
+    name = text.upper()
+    if name in _LEVEL_ALIASES:
+        return _LEVEL_ALIASES[name]
+    level = logging.getLevelName(name)
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown logging level: {value}")
+    return level
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """
+    Parse per-event sample rates from a comma-separated list
+
+    Args:
+        spec: Entries like "Request completed=0.1,Processing input=0.5"
+
+    Returns:
+        Dictionary of event name to the fraction of events to keep
+    """
+    rates = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        event, separator, rate = entry.rpartition("=")
+        if not separator or not event.strip():
+            raise ValueError(f"Invalid log sample rate: {entry.strip()}")
+        rates[event.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+class EventSampler:
+    """
+    Processor that keeps only a fraction of high-volume debug and info events
+
+    Kept events carry a sample_rate field so counts can be scaled back up.
+    Warnings and errors are never sampled.
+    """
+
+    def __init__(self, rates: Dict[str, float], random_func=random.random):
+        self.rates = rates
+        self.random_func = random_func
+
+    def __call__(self, logger, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        if method_name not in _SAMPLED_METHODS:
+            return event_dict
+        rate = self.rates.get(event_dict.get("event"))
+        if rate is None or rate >= 1.0:
+            return event_dict
+        if self.random_func() >= rate:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+class FieldTruncator:
+    """
+    Processor that shortens long field values before they are rendered
+
+    Strings longer than the limit are cut, and dictionaries or lists whose JSON
+    form is longer than the limit are replaced by the cut JSON text.
+    """
+
+    def __init__(self, max_length: int):
+        self.max_length = max_length
+
+    def _truncate(self, text: str) -> str:
+        return f"{text[:self.max_length]}...[{len(text) - self.max_length} more chars]"
+
+    def __call__(self, logger, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        if self.max_length <= 0:
+            return event_dict
+        for key, value in event_dict.items():
+            if isinstance(value, str):
+                if len(value) > self.max_length:
+                    event_dict[key] = self._truncate(value)
+            elif isinstance(value, (dict, list, tuple)):
+                text = json.dumps(value, ensure_ascii=False, default=str)
+                if len(text) > self.max_length:
+                    event_dict[key] = self._truncate(text)
+        return event_dict
+
+class QueueWriter:
+    """
+    Writes rendered log lines to stdout from a background thread
+
+    When the queue is full new lines are dropped and counted rather than
+    blocking the caller.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.dropped = 0
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def write(self, line: str) -> None:
+        """
+        Queue a rendered line for writing
+
+        Args:
+            line: Rendered log line without a trailing newline
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            lines = [self._queue.get()]
+            while True:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                sys.stdout.write("\n".join(lines) + "\n")
+                sys.stdout.flush()
+            except Exception:
+                pass
+            finally:
+                for _ in lines:
+                    self._queue.task_done()
+
+    def flush(self) -> None:
+        """
+        Block until every queued line has been written
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+class QueueLogger:
+    """
+    structlog logger that hands rendered lines to a QueueWriter
+    """
+
+    def __init__(self, writer: QueueWriter):
+        self._writer = writer
+
+    def msg(self, message: str) -> None:
+        self._writer.write(message)
+
+    debug = info = warning = warn = error = critical = fatal = exception = log = msg
+
+writer = QueueWriter(settings.log_queue_size)
+atexit.register(writer.flush)
 
-load_dotenv()
-logging_level = os.getenv("LOGGING_LEVEL", "20")
+def configure_logging(level: Any = None, sample_rates: Optional[Dict[str, float]] = None,
+                      max_field_length: Optional[int] = None, use_queue: Optional[bool] = None) -> None:
+    """
+    Configure structlog, using the settings for any argument left as None
 
-print(f"Logging level: {logging_level}")
+    Args:
+        level: Minimum level to log, as a number or name
+        sample_rates: Dictionary of event name to the fraction of events to keep
+        max_field_length: Maximum length of a rendered field value, 0 to disable
+        use_queue: Whether to write through the background writer thread
+    """
+    level = parse_level(settings.logging_level if level is None else level)
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(settings.log_sample_rates)
+    if max_field_length is None:
+        max_field_length = settings.log_max_field_length
+    if use_queue is None:
+        use_queue = settings.log_async
+    logger_factory = (lambda *args: QueueLogger(writer)) if use_queue else structlog.PrintLoggerFactory()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        processors=[
+            EventSampler(sample_rates),
+            structlog.contextvars.merge_contextvars,
+            FieldTruncator(max_field_length),
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer()
+        ],
+        logger_factory=logger_factory,
+    )
 
-structlog.configure(
-    wrapper_class=structlog.make_filtering_bound_logger(10),
-    processors=[
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.format_exc_info,
-        structlog.processors.JSONRenderer()
-    ],
-)
+configure_logging()
 
-log = structlog.get_logger()
\ No newline at end of file
+log = structlog.get_logger()
@@ -0,0 +1,254 @@
+# src/utils/metrics.py
+"""
+Low-overhead in-process metrics rendered in the Prometheus text format.
+
+Metrics are plain Python objects guarded by a lock per metric, so recording
+a value costs a dictionary update. They are exposed by the /metrics endpoint.
+"""
+
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+class _Metric:
+    """Base class for metrics with a fixed set of label names"""
+    
+    kind = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float, Sequence[str]]]:
+        raise NotImplementedError
+    
+    def render(self) -> List[str]:
+        """Render the metric in the Prometheus text exposition format"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, value, extra_names in self.samples():
+            names = self.labelnames + tuple(extra_names)
+            lines.append(f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+    
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def get(self, **labels: object) -> float:
+        return self._values.get(self._key(labels), 0.0)
+    
+    def values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+    
+    def samples(self):
+        for key, value in sorted(self.values().items()):
+            yield "", key, value, ()
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    
+    kind = "gauge"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+    
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+    
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def get(self, **labels: object) -> float:
+        return self._values.get(self._key(labels), 0.0)
+    
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", key, value, ()
+
+class CallbackGauge(_Metric):
+    """Gauge whose values are computed when the metrics are rendered"""
+    
+    kind = "gauge"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 callback: Callable[[], Dict[LabelValues, float]]):
+        super().__init__(name, documentation, labelnames)
+        self._callback = callback
+    
+    def samples(self):
+        for key, value in sorted(self._callback().items()):
+            yield "", key, value, ()
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+    
+    kind = "histogram"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: [bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+    
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+    
+    def count(self, **labels: object) -> float:
+        state = self._values.get(self._key(labels))
+        return state[-1] if state else 0.0
+    
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            cumulative = 0.0
+            for index, bound in enumerate(self.buckets):
+                cumulative += state[index]
+                yield "_bucket", key + (_format_value(bound),), cumulative, ("le",)
+            yield "_sum", key, state[-2], ()
+            yield "_count", key, state[-1], ()
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+    
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+    
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests handled, by route and status code", ["method", "route", "status"]))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds", ["method", "route"]))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled"))
+
+LLM_CALLS = REGISTRY.register(Counter(
+    "llm_calls_total", "LLM calls, by workflow step and outcome", ["step", "outcome"]))
+LLM_CALL_DURATION = REGISTRY.register(Histogram(
+    "llm_call_duration_seconds", "LLM call latency in seconds, by workflow step", ["step"]))
+LLM_TOKENS = REGISTRY.register(Counter(
+    "llm_tokens_total", "LLM tokens, by workflow step and direction", ["step", "direction"]))
+LLM_PARSE_FAILURES = REGISTRY.register(Counter(
+    "llm_parse_failures_total", "LLM responses that did not match their schema, by workflow step and attempt",
+    ["step", "attempt"]))
+
+ADMISSION_IN_FLIGHT = REGISTRY.register(Gauge(
+    "admission_in_flight", "Chat workflows currently admitted"))
+ADMISSION_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "admission_queue_depth", "Chat requests waiting for admission"))
+ADMISSION_WAIT = REGISTRY.register(Histogram(
+    "admission_wait_seconds", "Time chat requests waited for admission, by priority", ["priority"]))
+ADMISSION_SHED = REGISTRY.register(Counter(
+    "admission_shed_total", "Chat requests rejected by admission control, by reason", ["reason"]))
+
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "cache_lookups_total", "Cache lookups, by cache and result", ["cache", "result"]))
+
+def _cache_hit_ratios() -> Dict[LabelValues, float]:
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in CACHE_LOOKUPS.values().items():
+        hits_and_total = totals.setdefault(cache, [0.0, 0.0])
+        if result == "hit":
+            hits_and_total[0] += value
+        hits_and_total[1] += value
+    return {(cache,): hits / total for cache, (hits, total) in totals.items() if total}
+
+CACHE_HIT_RATIO = REGISTRY.register(CallbackGauge(
+    "cache_hit_ratio", "Fraction of cache lookups that were hits", ["cache"], _cache_hit_ratios))
+
+FILE_DB_OPERATIONS = REGISTRY.register(Counter(
+    "file_db_operations_total", "File database reads and writes", ["operation"]))
+FILE_DB_BYTES = REGISTRY.register(Counter(
+    "file_db_bytes_total", "Bytes read from and written to the file database", ["operation"]))
+
+QUESTION_CLASSIFICATIONS = REGISTRY.register(Counter(
+    "question_classifications_total", "Legacy question type classifications, by where they were made", ["source"]))
+EMAILS_SENT = REGISTRY.register(Counter(
+    "emails_sent_total", "Notification digests handed to the email transport, by outcome", ["outcome"]))
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """
+    Record the result of a cache lookup
+    
+    Args:
+        cache: Name of the cache
+        hit: Whether the lookup was a hit
+    """
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+def render_metrics() -> str:
+    """Render all registered metrics in the Prometheus text format"""
+    return REGISTRY.render()
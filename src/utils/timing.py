@@ -0,0 +1,120 @@
+# src/utils/timing.py
+"""
+Request-scoped timing spans.
+
+A request context holds a request ID and the spans recorded while handling
+the request. The request ID is bound to the structlog context so every log
+line emitted during the request carries it.
+"""
+
+import time
+import uuid
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+from src.utils.logger import log
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("timing_spans", default=None)
+
+def start_request(request_id: Optional[str] = None) -> str:
+    """
+    Start a new request context and bind its ID to the structlog context
+    
+    Args:
+        request_id: Optional request ID supplied by the caller. A new one is generated if omitted
+        
+    Returns:
+        The request ID
+    """
+    request_id = request_id or uuid.uuid4().hex
+    _request_id.set(request_id)
+    _spans.set([])
+    structlog.contextvars.bind_contextvars(request_id=request_id)
+    return request_id
+
+def end_request() -> None:
+    """Clear the current request context"""
+    _request_id.set(None)
+    _spans.set(None)
+    structlog.contextvars.unbind_contextvars("request_id")
+
+def get_request_id() -> Optional[str]:
+    """Return the ID of the current request, if any"""
+    return _request_id.get()
+
+def get_spans() -> List[Tuple[str, float]]:
+    """
+    Return the spans recorded in the current request context
+    
+    Returns:
+        List of (name, duration in milliseconds) tuples in completion order
+    """
+    return list(_spans.get() or [])
+
+def summarize_spans(spans: List[Tuple[str, float]]) -> Dict[str, float]:
+    """
+    Total the duration of spans by name
+    
+    Args:
+        spans: List of (name, duration in milliseconds) tuples
+        
+    Returns:
+        Dictionary of span name to total duration in milliseconds
+    """
+    totals: Dict[str, float] = {}
+    for name, duration in spans:
+        totals[name] = round(totals.get(name, 0.0) + duration, 3)
+    return totals
+
+def server_timing_header(spans: List[Tuple[str, float]]) -> str:
+    """
+    Render spans as a Server-Timing header value
+    
+    Args:
+        spans: List of (name, duration in milliseconds) tuples
+        
+    Returns:
+        The header value, e.g. "llm_call;dur=812.4, file_db.get_position_data;dur=1.2"
+    """
+    return ", ".join(f"{name};dur={duration:.1f}" for name, duration in summarize_spans(spans).items())
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time a block of code and record it against the current request
+    
+    Args:
+        name: Name of the stage being timed
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = (time.perf_counter() - start) * 1000
+        spans = _spans.get()
+        if spans is not None:
+            spans.append((name, duration))
+        log.debug("Timing span", span=name, duration_ms=round(duration, 3))
+
+def timed(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator that records each call of the wrapped function as a span
+    
+    Args:
+        name: Name of the span
+        
+    Returns:
+        The decorator
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,261 @@
+# src/utils/usage.py
+"""
+LLM token and cost accounting.
+
+Token usage reported by each LLM call is aggregated in memory per workflow
+step, request, position and company, and periodically persisted to a JSON
+file (if USAGE_STATS_FILE is set) so totals survive restarts.
+
+Workers sharing the file add the usage recorded since their last persist to
+the totals in the file under a file lock, and then serve the combined totals.
+"""
+
+import os
+import json
+import fcntl
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.config import settings
+from src.utils.logger import log
+from src.utils.timing import get_request_id
+
+# Not persisted unless configured; relative paths are resolved once, so a later chdir doesn't move the file
+USAGE_STATS_FILE = os.path.abspath(settings.usage_stats_file) if settings.usage_stats_file else None
+USAGE_PERSIST_INTERVAL = settings.usage_persist_interval
+# Prices in USD per million tokens (defaults are Claude 3 Haiku list prices)
+LLM_INPUT_COST_PER_MTOK = settings.llm_input_cost_per_mtok
+LLM_OUTPUT_COST_PER_MTOK = settings.llm_output_cost_per_mtok
+
+# Number of most recent requests kept for per-request breakdowns
+MAX_TRACKED_REQUESTS = 1000
+
+DIMENSIONS = ("step", "position", "company", "request")
+
+_scope: ContextVar[Tuple[Optional[int], Optional[int]]] = ContextVar("usage_scope", default=(None, None))
+
+@contextmanager
+def usage_scope(position_id: Optional[int] = None, company_id: Optional[int] = None) -> Iterator[None]:
+    """
+    Attribute LLM usage inside the block to a position and company
+    
+    Args:
+        position_id: The position the calls are made for
+        company_id: The company the calls are made for
+    """
+    token = _scope.set((position_id, company_id))
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+def _empty_totals() -> Dict[str, float]:
+    return {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0, "llm_seconds": 0.0}
+
+def _empty_snapshot() -> Dict[str, Any]:
+    return {"totals": _empty_totals(), "groups": {dimension: {} for dimension in DIMENSIONS if dimension != "request"}}
+
+def _add_totals(target: Dict[str, float], source: Dict[str, float]) -> None:
+    for field, value in source.items():
+        target[field] = target.get(field, 0) + value
+
+def _add_snapshot(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    """Add the totals and groups of one snapshot to another"""
+    _add_totals(target["totals"], source["totals"])
+    for dimension, groups in source["groups"].items():
+        target_groups = target["groups"].setdefault(dimension, {})
+        for key, totals in groups.items():
+            _add_totals(target_groups.setdefault(key, _empty_totals()), totals)
+
+class UsageTracker:
+    """
+    Aggregates LLM token usage and cost in memory
+    
+    Totals are kept per workflow step, request, position and company. The usage
+    recorded since the last persist is added to the stats file at most once per
+    persist interval, and on flush(). Per-request totals are not persisted.
+    """
+    
+    def __init__(self, file_path: Optional[str] = USAGE_STATS_FILE,
+                 persist_interval: float = USAGE_PERSIST_INTERVAL,
+                 input_cost_per_mtok: float = LLM_INPUT_COST_PER_MTOK,
+                 output_cost_per_mtok: float = LLM_OUTPUT_COST_PER_MTOK):
+        self.file_path = file_path
+        self.persist_interval = persist_interval
+        self.input_cost_per_mtok = input_cost_per_mtok
+        self.output_cost_per_mtok = output_cost_per_mtok
+        self._lock = threading.Lock()
+        self._totals = _empty_totals()
+        self._groups: Dict[str, Dict[str, Dict[str, float]]] = {dimension: {} for dimension in DIMENSIONS}
+        self._groups["request"] = OrderedDict()
+        # Usage recorded since the last persist, added to the file's totals on flush()
+        self._pending = _empty_snapshot()
+        self._dirty = False
+        self._last_persist = time.monotonic()
+        self._load()
+    
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        """Return the cost in USD of the given token counts"""
+        return (input_tokens * self.input_cost_per_mtok + output_tokens * self.output_cost_per_mtok) / 1_000_000
+    
+    def record(self, step: str, input_tokens: int, output_tokens: int, duration: float = 0.0) -> None:
+        """
+        Record the usage of one LLM call against the current scope
+        
+        Args:
+            step: The workflow step that made the call
+            input_tokens: Number of input tokens
+            output_tokens: Number of output tokens
+            duration: Call duration in seconds
+        """
+        position_id, company_id = _scope.get()
+        request_id = get_request_id()
+        cost = self.cost(input_tokens, output_tokens)
+        keys = [("step", step), ("position", position_id), ("company", company_id), ("request", request_id)]
+        
+        usage = {"calls": 1, "input_tokens": input_tokens, "output_tokens": output_tokens,
+                 "cost_usd": cost, "llm_seconds": duration}
+        
+        with self._lock:
+            for totals in [self._totals] + [self._group(dimension, key) for dimension, key in keys if key is not None]:
+                _add_totals(totals, usage)
+            _add_totals(self._pending["totals"], usage)
+            for dimension, key in keys:
+                if key is not None and dimension != "request":
+                    _add_totals(self._pending["groups"][dimension].setdefault(str(key), _empty_totals()), usage)
+            self._dirty = True
+            should_persist = time.monotonic() - self._last_persist >= self.persist_interval
+        
+        if should_persist:
+            self.flush()
+    
+    def _group(self, dimension: str, key: Any) -> Dict[str, float]:
+        groups = self._groups[dimension]
+        key = str(key)
+        totals = groups.get(key)
+        if totals is None:
+            totals = groups[key] = _empty_totals()
+            if dimension == "request" and len(groups) > MAX_TRACKED_REQUESTS:
+                groups.popitem(last=False)
+        return totals
+    
+    def summary(self) -> Dict[str, Any]:
+        """Return the overall totals"""
+        with self._lock:
+            return self._rounded(self._totals)
+    
+    def top(self, dimension: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Return the groups of a dimension with the highest token usage
+        
+        Args:
+            dimension: One of step, position, company or request
+            limit: Maximum number of groups to return
+            
+        Returns:
+            List of totals, each with its key and average input tokens per call
+        """
+        if dimension not in self._groups:
+            raise ValueError(f"Unknown usage dimension: {dimension}")
+        with self._lock:
+            items = [(key, dict(totals)) for key, totals in self._groups[dimension].items()]
+        items.sort(key=lambda item: item[1]["input_tokens"] + item[1]["output_tokens"], reverse=True)
+        result = []
+        for key, totals in items[:limit]:
+            entry = {"key": key}
+            entry.update(self._rounded(totals))
+            entry["avg_input_tokens"] = round(totals["input_tokens"] / totals["calls"], 1) if totals["calls"] else 0.0
+            result.append(entry)
+        return result
+    
+    @staticmethod
+    def _rounded(totals: Dict[str, float]) -> Dict[str, Any]:
+        result = dict(totals)
+        result["cost_usd"] = round(result["cost_usd"], 6)
+        result["llm_seconds"] = round(result["llm_seconds"], 3)
+        return result
+    
+    def flush(self) -> None:
+        """Add the usage recorded since the last persist to the stats file"""
+        with self._lock:
+            self._last_persist = time.monotonic()
+            if not self.file_path or not self._dirty:
+                return
+            pending, self._pending = self._pending, _empty_snapshot()
+            self._dirty = False
+        
+        # Unique per writer, so concurrent flushes never write the same temporary file
+        temp_path = f"{self.file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with self._file_lock():
+                stored = self._read()
+                _add_snapshot(stored, pending)
+                try:
+                    with open(temp_path, 'w') as file:
+                        json.dump(stored, file)
+                    os.replace(temp_path, self.file_path)
+                except OSError:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                    raise
+        except OSError as e:
+            log.error("Error saving usage stats", error=str(e))
+            with self._lock:
+                # Kept for the next flush
+                _add_snapshot(self._pending, pending)
+                self._dirty = True
+            return
+        
+        with self._lock:
+            # Serve the totals of every worker sharing the file, plus usage recorded since
+            _add_snapshot(stored, self._pending)
+            self._set_persisted(stored)
+    
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock shared by all processes using the stats file"""
+        fd = os.open(f"{self.file_path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+    
+    def _read(self) -> Dict[str, Any]:
+        """Read the stats file, or return empty totals if there is none"""
+        snapshot = _empty_snapshot()
+        if not os.path.exists(self.file_path):
+            return snapshot
+        try:
+            with open(self.file_path, 'r') as file:
+                stored = json.load(file)
+        except json.JSONDecodeError as e:
+            log.error("Error reading usage stats", file_path=self.file_path, error=str(e))
+            return snapshot
+        _add_snapshot(snapshot, {"totals": stored.get("totals", {}), "groups": {
+            dimension: groups for dimension, groups in stored.get("groups", {}).items()
+            if dimension in self._groups and dimension != "request"}})
+        return snapshot
+    
+    def _set_persisted(self, snapshot: Dict[str, Any]) -> None:
+        self._totals = snapshot["totals"]
+        for dimension, groups in snapshot["groups"].items():
+            self._groups[dimension] = groups
+    
+    def _load(self) -> None:
+        if not self.file_path:
+            return
+        try:
+            snapshot = self._read()
+        except OSError as e:
+            log.error("Error loading usage stats", error=str(e))
+            return
+        self._set_persisted(snapshot)
+        if os.path.exists(self.file_path):
+            log.info("Loaded usage stats", file_path=self.file_path)
+
+usage_tracker = UsageTracker()
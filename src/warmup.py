@@ -0,0 +1,142 @@
+# src/warmup.py
+"""
+Warm-up run when a worker starts, and the readiness reported by /health/ready.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.config import settings
+from src.database import file_db
+from src.database.search_index import search_index
+from src.llms.llm import llm
+from src.utils.logger import log
+
+WARMUP_ENABLED = settings.warmup_enabled
+WARMUP_POSITIONS = settings.warmup_positions
+WARMUP_LLM_PING = settings.warmup_llm_ping
+
+class Readiness:
+    """Whether the worker has finished warming up, with the warm-up results"""
+    
+    def __init__(self):
+        self._ready = threading.Event()
+        self.details: Dict[str, Any] = {}
+    
+    def is_ready(self) -> bool:
+        """Return True once the worker can take traffic"""
+        return self._ready.is_set()
+    
+    def mark_ready(self, details: Dict[str, Any]) -> None:
+        """Mark the worker as ready"""
+        self.details = details
+        self._ready.set()
+    
+    def reset(self) -> None:
+        """Mark the worker as not ready, e.g. before warming up again"""
+        self._ready.clear()
+        self.details = {}
+
+readiness = Readiness()
+
+def most_asked_positions(limit: int) -> List[int]:
+    """
+    Find the positions whose FAQs were asked most often
+    
+    Builds the file index and the position summaries as a side effect.
+    
+    Args:
+        limit: Maximum number of positions to return
+        
+    Returns:
+        Position IDs, most asked first
+    """
+    asked = []
+    for position_id in file_db.get_position_ids():
+        summary = file_db.get_position_summary(position_id)
+        if summary is not None:
+            asked.append((summary["timesAsked"], position_id))
+    asked.sort(key=lambda entry: (-entry[0], entry[1]))
+    return [position_id for _, position_id in asked[:limit]]
+
+def prime_llm(ping: bool = False) -> None:
+    """
+    Create the LLM client, and optionally send a one-token request
+    
+    The request opens the connection to the API so the first chat request does
+    not pay for connection setup. It is billed like any other request.
+    
+    Args:
+        ping: Whether to send the request
+    """
+    llm.get_client()
+    if ping:
+        llm.invoke("Reply with OK.", max_tokens=1)
+
+def warm_up(position_count: int = WARMUP_POSITIONS, llm_ping: bool = WARMUP_LLM_PING) -> Dict[str, Any]:
+    """
+    Load the most asked positions and their companies into the document cache,
+    build the search index and prime the LLM client
+    
+    The search index is built here so the first chat request does not read
+    every position and company.
+    
+    Args:
+        position_count: Number of positions to preload
+        llm_ping: Whether to send a request to the LLM API
+        
+    Returns:
+        Dictionary describing what was warmed up
+    """
+    start = time.perf_counter()
+    
+    position_ids = most_asked_positions(position_count)
+    company_ids = set()
+    for position_id in position_ids:
+        position_data = file_db.get_position_data(position_id)
+        company_id = (position_data or {}).get("position", {}).get("companyId")
+        if company_id is not None:
+            company_ids.add(company_id)
+    for company_id in sorted(company_ids):
+        file_db.get_company_data(company_id)
+    search_index.refresh()
+    
+    llm_status = "ready"
+    try:
+        prime_llm(llm_ping)
+    except Exception as e:
+        # The worker can still serve requests that don't need the LLM
+        log.warning("Failed to prime the LLM client", error=str(e))
+        llm_status = "failed"
+    
+    details = {
+        "positions": position_ids,
+        "companies": sorted(company_ids),
+        "llm": llm_status,
+        "durationMs": round((time.perf_counter() - start) * 1000, 1)
+    }
+    log.info("Warm-up finished", duration_ms=details["durationMs"], positions=len(position_ids))
+    return details
+
+def run_warm_up(position_count: int = WARMUP_POSITIONS, llm_ping: bool = WARMUP_LLM_PING) -> Optional[Dict[str, Any]]:
+    """
+    Warm up and mark the worker ready
+    
+    The worker is marked ready even if warm-up fails, since it only affects latency.
+    
+    Args:
+        position_count: Number of positions to preload
+        llm_ping: Whether to send a request to the LLM API
+        
+    Returns:
+        The warm-up details, or None if warm-up failed
+    """
+    try:
+        details = warm_up(position_count, llm_ping)
+    except Exception as e:
+        log.exception("Warm-up failed", error=str(e))
+        readiness.mark_ready({"error": "Warm-up failed"})
+        return None
+    readiness.mark_ready(details)
+    return details
@@ -0,0 +1,110 @@
+# src/workflow/answer_cache.py
+"""
+Cache of LLM answers to repeated questions about a position.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.config import settings
+from src.utils.metrics import record_cache_lookup
+from src.workflow.question_matching import normalize_question
+
+ANSWER_CACHE_SIZE = settings.answer_cache_size
+
+def answer_fingerprint(position_data: Dict[str, Any], company_data: Dict[str, Any]) -> str:
+    """
+    Fingerprint the data an answer depends on
+    
+    Only the description, questions, answers and info items are included, so
+    FAQ bookkeeping (timesAsked, timestamps) does not invalidate cached answers,
+    while any edit to the content or a new FAQ does.
+    
+    Args:
+        position_data: The position data
+        company_data: The company data
+        
+    Returns:
+        Hex digest identifying the content
+    """
+    content = [
+        position_data.get("position", {}).get("positionDescription"),
+        [(faq.get("id"), faq.get("question"), faq.get("response")) for faq in position_data.get("positionFAQs", [])],
+        [(info.get("id"), info.get("subject"), info.get("answer")) for info in position_data.get("positionInfo", [])],
+        [(faq.get("question"), faq.get("response")) for faq in company_data.get("companyFAQs", [])],
+        [(info.get("subject"), info.get("answer")) for info in company_data.get("companyInfo", [])]
+    ]
+    return hashlib.sha1(json.dumps(content).encode("utf-8")).hexdigest()
+
+class AnswerCache:
+    """
+    LRU cache of parsed LLM results keyed by position and normalized question
+    
+    Each entry remembers the fingerprint of the data it was answered from and is
+    only used while the data still has that fingerprint.
+    """
+    
+    def __init__(self, max_entries: int = ANSWER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[str, Dict[str, Any]]]" = OrderedDict()
+    
+    def contains(self, position_id: int, question: str) -> bool:
+        """
+        Check whether a question was answered before, without checking the data
+        
+        Cheap enough to call before loading any data, e.g. to prioritize requests.
+        """
+        with self._lock:
+            return (position_id, normalize_question(question)) in self._entries
+    
+    def get(self, position_id: int, question: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached result for a question
+        
+        Args:
+            position_id: The ID of the position
+            question: The question from the user
+            fingerprint: The fingerprint of the current data, see answer_fingerprint
+            
+        Returns:
+            A copy of the cached LLM result, or None if there is no valid entry
+        """
+        key = (position_id, normalize_question(question))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                result = copy.deepcopy(entry[1])
+            else:
+                result = None
+        record_cache_lookup("answers", result is not None)
+        return result
+    
+    def put(self, position_id: int, question: str, fingerprint: str, llm_result: Dict[str, Any]) -> None:
+        """
+        Cache the LLM result for a question
+        
+        Args:
+            position_id: The ID of the position
+            question: The question from the user
+            fingerprint: The fingerprint of the data the question was answered from
+            llm_result: The parsed LLM result
+        """
+        key = (position_id, normalize_question(question))
+        with self._lock:
+            self._entries[key] = (fingerprint, copy.deepcopy(llm_result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+answer_cache = AnswerCache()
@@ -0,0 +1,304 @@
+"""
+Offline pipeline that drafts answers for unanswered user-generated FAQs.
+
+Positions are streamed from the file database one at a time. Unanswered
+questions (response: null) asked by users are sent to the LLM in batches,
+with a bounded number of positions in flight, and the drafts are written
+back as one new version per position. Completed positions are recorded in a
+checkpoint file so an interrupted run can be resumed.
+
+Drafts are stored in a separate draftResponse field so they are not served
+to candidates until HR reviews them.
+
+Usage:
+    python -m src.workflow.bulk_answer --checkpoint bulk_answer_checkpoint.json --batch-size 10 --concurrency 4
+"""
+
+import os
+import sys
+import json
+import argparse
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, List, Optional, Set
+
+from src.config import settings
+from src.utils.logger import log
+from src.utils.usage import usage_scope
+from src.database import file_db
+from src.workflow import workflow
+from src.llms.structured_output import invoke_structured, DraftAnswers
+
+BULK_ANSWER_BATCH_SIZE = settings.bulk_answer_batch_size
+BULK_ANSWER_CONCURRENCY = settings.bulk_answer_concurrency
+
+def collect_unanswered_faqs(position_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Find the user-generated FAQs of a position that have no answer or draft yet
+    
+    Args:
+        position_data: The position data
+        
+    Returns:
+        List of unanswered FAQ dictionaries
+    """
+    return [
+        faq for faq in position_data.get("positionFAQs", [])
+        if faq.get("generatedByUser") and faq.get("response") is None and not faq.get("draftResponse")
+    ]
+
+def build_bulk_answer_prompt(faqs: List[Dict[str, Any]], position_data: Dict[str, Any],
+                             company_data: Dict[str, Any]) -> str:
+    """
+    Build a prompt asking the LLM to draft answers for several FAQs at once
+    
+    Args:
+        faqs: The FAQs to answer
+        position_data: The position data
+        company_data: The company data
+        
+    Returns:
+        The prompt for the LLM
+    """
+    position_info = position_data.get("position", {})
+    answered_faqs = [faq for faq in position_data.get("positionFAQs", []) if faq.get("response")]
+    questions = [{"id": faq.get("id"), "question": faq.get("question")} for faq in faqs]
+    
+    return f"""
+    You are an AI assistant helping HR draft answers to questions candidates asked about a job position.
+    
+    POSITION DESCRIPTION:
+    {position_info.get('positionDescription', 'No description available')}
+    
+    ANSWERED POSITION FAQs:
+    {json.dumps(answered_faqs, indent=2)}
+    
+    POSITION INFO:
+    {json.dumps(position_data.get("positionInfo", []), indent=2)}
+    
+    COMPANY FAQs:
+    {json.dumps(company_data.get("companyFAQs", []), indent=2)}
+    
+    COMPANY INFO:
+    {json.dumps(company_data.get("companyInfo", []), indent=2)}
+    
+    Draft an answer for each of the following questions using only the information above:
+    {json.dumps(questions, indent=2)}
+    
+    If the information above does not answer a question, set its response to null.
+    
+    Return ONLY a JSON object with the following structure:
+    {{
+      "answers": [
+        {{"id": the question ID, "response": "Draft answer" or null}}
+      ]
+    }}
+    """
+
+def draft_answers(faqs: List[Dict[str, Any]], position_data: Dict[str, Any],
+                  company_data: Dict[str, Any]) -> Dict[int, str]:
+    """
+    Ask the LLM to draft answers for a batch of FAQs
+    
+    Args:
+        faqs: The FAQs to answer
+        position_data: The position data
+        company_data: The company data
+        
+    Returns:
+        Dictionary of FAQ ID to draft answer, for the questions the LLM could answer
+        
+    Raises:
+        ValueError: If the LLM response cannot be parsed
+    """
+    prompt = build_bulk_answer_prompt(faqs, position_data, company_data)
+    result = invoke_structured(workflow._invoke_llm, "bulk_answer", prompt, DraftAnswers)
+    
+    requested_ids = {faq.get("id") for faq in faqs}
+    drafts = {}
+    for answer in result.answers:
+        if answer.id in requested_ids and answer.response:
+            drafts[answer.id] = answer.response
+    return drafts
+
+class _NothingToApply(Exception):
+    """Raised to skip writing a version when none of the drafts apply"""
+
+def apply_drafts(position_id: int, drafts: Dict[int, str]) -> Optional[int]:
+    """
+    Write draft answers to a new version of a position
+    
+    The drafts are applied to the latest version while it is locked, so FAQ updates
+    made while the drafts were generated are kept. Drafts are only applied to FAQs
+    that are still unanswered.
+    
+    Args:
+        position_id: The ID of the position
+        drafts: Dictionary of FAQ ID to draft answer
+        
+    Returns:
+        The new version number, or None if nothing was written
+    """
+    timestamp = datetime.datetime.now().isoformat()
+    applied = 0
+    
+    def add_drafts(position_data: Dict[str, Any]) -> None:
+        nonlocal applied
+        for faq in position_data.get("positionFAQs", []):
+            draft = drafts.get(faq.get("id"))
+            if draft and faq.get("response") is None:
+                faq["draftResponse"] = draft
+                faq["draftTimestamp"] = timestamp
+                applied += 1
+        if not applied:
+            raise _NothingToApply()
+    
+    try:
+        success, _, version = file_db.update_position_data(position_id, add_drafts)
+    except (_NothingToApply, file_db.PositionNotFoundError):
+        return None
+    if not success:
+        raise IOError(f"Failed to save drafts for position ID {position_id}")
+    log.info("Saved draft answers", position_id=position_id, applied=applied, version=version)
+    return version
+
+class Checkpoint:
+    """Set of completed position IDs, persisted to a JSON file after every update"""
+    
+    def __init__(self, file_path: Optional[str]):
+        self.file_path = file_path
+        self.completed: Set[int] = set()
+        self._lock = threading.Lock()
+        if file_path and os.path.exists(file_path):
+            with open(file_path, 'r') as file:
+                self.completed = set(json.load(file).get("completed", []))
+            log.info("Resuming from checkpoint", completed_positions=len(self.completed))
+    
+    def __contains__(self, position_id: int) -> bool:
+        return position_id in self.completed
+    
+    def mark_completed(self, position_id: int) -> None:
+        with self._lock:
+            self.completed.add(position_id)
+            if not self.file_path:
+                return
+            temp_path = f"{self.file_path}.tmp"
+            with open(temp_path, 'w') as file:
+                json.dump({"completed": sorted(self.completed)}, file)
+            os.replace(temp_path, self.file_path)
+    
+    def clear(self) -> None:
+        """Forget the completed positions and remove the file, so the next run starts afresh"""
+        with self._lock:
+            self.completed.clear()
+            if self.file_path and os.path.exists(self.file_path):
+                os.remove(self.file_path)
+
+def process_position(position_data: Dict[str, Any], batch_size: int) -> Dict[str, Any]:
+    """
+    Draft answers for all unanswered FAQs of one position and save them
+    
+    Args:
+        position_data: The latest position data
+        batch_size: Maximum number of questions per LLM call
+        
+    Returns:
+        Dictionary with the position ID, the number of questions and drafts, and the new version
+    """
+    position_id = position_data["position"]["id"]
+    company_id = position_data["position"].get("companyId")
+    faqs = collect_unanswered_faqs(position_data)
+    
+    drafts: Dict[int, str] = {}
+    if faqs:
+        company_data = file_db.get_company_data(company_id) if company_id else None
+        company_data = company_data or {"companyFAQs": [], "companyInfo": []}
+        with usage_scope(position_id, company_id):
+            for start in range(0, len(faqs), batch_size):
+                drafts.update(draft_answers(faqs[start:start + batch_size], position_data, company_data))
+    
+    version = apply_drafts(position_id, drafts) if drafts else None
+    return {"positionId": position_id, "questions": len(faqs), "drafted": len(drafts), "version": version}
+
+def run_bulk_answer(checkpoint_path: Optional[str] = None, batch_size: int = BULK_ANSWER_BATCH_SIZE,
+                    concurrency: int = BULK_ANSWER_CONCURRENCY, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Draft answers for the unanswered FAQs of every position
+    
+    Positions are streamed from the file database and at most `concurrency`
+    positions are processed at a time. A position is recorded in the checkpoint
+    once its drafts are saved (or it had nothing to draft); failed positions are
+    not recorded and will be retried on the next run. The checkpoint is removed
+    once a run completes every position without failures, so a later run drafts
+    answers for questions added since.
+    
+    Args:
+        checkpoint_path: Optional path of the checkpoint file used to resume runs
+        batch_size: Maximum number of questions per LLM call
+        concurrency: Maximum number of positions processed at a time
+        limit: Optional maximum number of positions to process in this run
+        
+    Returns:
+        Summary of the run
+    """
+    checkpoint = Checkpoint(checkpoint_path)
+    summary = {"positions": 0, "skipped": 0, "failed": 0, "questions": 0, "drafted": 0, "versions": 0}
+    summary_lock = threading.Lock()
+    stopped_early = False
+    slots = threading.BoundedSemaphore(max(1, concurrency))
+    
+    def on_done(future: Future, position_id: int) -> None:
+        slots.release()
+        with summary_lock:
+            try:
+                result = future.result()
+            except Exception as e:
+                log.error("Failed to draft answers", position_id=position_id, error=str(e))
+                summary["failed"] += 1
+                return
+            summary["questions"] += result["questions"]
+            summary["drafted"] += result["drafted"]
+            summary["versions"] += 1 if result["version"] else 0
+        checkpoint.mark_completed(position_id)
+    
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for position_data in file_db.iter_latest_position_data():
+            position_id = position_data.get("position", {}).get("id")
+            if position_id is None:
+                continue
+            if position_id in checkpoint:
+                summary["skipped"] += 1
+                continue
+            if limit is not None and summary["positions"] >= limit:
+                stopped_early = True
+                break
+            
+            # Block until a slot is free so only `concurrency` documents are held in memory
+            slots.acquire()
+            summary["positions"] += 1
+            future = executor.submit(process_position, position_data, batch_size)
+            future.add_done_callback(lambda f, position_id=position_id: on_done(f, position_id))
+    
+    if not stopped_early and not summary["failed"]:
+        checkpoint.clear()
+    log.info("Bulk answer run complete", summary=summary)
+    return summary
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Draft answers for unanswered user-generated FAQs")
+    parser.add_argument("--checkpoint", default="bulk_answer_checkpoint.json",
+                        help="Checkpoint file used to resume an interrupted or failed run")
+    parser.add_argument("--batch-size", type=int, default=BULK_ANSWER_BATCH_SIZE,
+                        help="Maximum number of questions per LLM call")
+    parser.add_argument("--concurrency", type=int, default=BULK_ANSWER_CONCURRENCY,
+                        help="Maximum number of positions processed at a time")
+    parser.add_argument("--limit", type=int, help="Maximum number of positions to process in this run")
+    args = parser.parse_args()
+    
+    summary = run_bulk_answer(args.checkpoint, args.batch_size, args.concurrency, args.limit)
+    print(json.dumps(summary, indent=2))
+    sys.exit(1 if summary["failed"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# src/workflow/company_knowledge.py
+"""
+Reuse of answered FAQs across the positions of a company.
+
+Questions about parking, remote work or benefits are often already answered in
+the company FAQs or in the FAQs of another position of the same company. Those
+answers are found through the search index and returned without an LLM call
+when the asked question closely matches the answered one.
+"""
+
+from typing import Any, Dict, Optional
+
+from src.config import settings
+from src.database.search_index import search_index
+from src.workflow.question_matching import question_terms, question_words
+from src.utils.metrics import record_cache_lookup
+from src.utils.timing import span
+
+COMPANY_ANSWER_REUSE_ENABLED = settings.company_answer_reuse_enabled
+COMPANY_ANSWER_MIN_SIMILARITY = settings.company_answer_min_similarity
+
+# Number of search results checked for a matching question
+CANDIDATES = 10
+
+def question_similarity(first: str, second: str) -> float:
+    """
+    Compare two questions by the overlap of their terms
+
+    Questions asking with different question words, e.g. "where" and "when",
+    never match, since one's answer doesn't answer the other.
+
+    Args:
+        first: A question
+        second: Another question
+
+    Returns:
+        The Jaccard similarity of the two sets of terms, from 0 to 1
+    """
+    if question_words(first) != question_words(second):
+        return 0.0
+    first_terms = set(question_terms(first))
+    second_terms = set(question_terms(second))
+    if not first_terms or not second_terms:
+        return 0.0
+    return len(first_terms & second_terms) / len(first_terms | second_terms)
+
+def find_known_answer(question: str, position_id: int, company_id: Optional[int]) -> Optional[Dict[str, Any]]:
+    """
+    Find an answered FAQ of the position's company that matches a question
+
+    Args:
+        question: The question from the user
+        position_id: The ID of the position the question is about
+        company_id: The ID of the company the position belongs to, or None
+
+    Returns:
+        A result in the same form as an LLM result, with the answer as response,
+        similar_question_id set when the FAQ belongs to the same position, and a
+        provenance dictionary describing the FAQ that was reused. None if no
+        answered FAQ matches closely enough.
+    """
+    if not COMPANY_ANSWER_REUSE_ENABLED:
+        return None
+
+    with span("company_knowledge"):
+        if company_id is not None:
+            candidates = search_index.search(question, company_id=company_id, answered_only=True, limit=CANDIDATES)
+        else:
+            candidates = search_index.search(question, position_id=position_id, answered_only=True, limit=CANDIDATES)
+
+        best = None
+        best_rank = None
+        for candidate in candidates:
+            if candidate["type"] not in ("positionFAQ", "companyFAQ"):
+                continue
+            similarity = question_similarity(question, candidate["question"])
+            if similarity < COMPANY_ANSWER_MIN_SIMILARITY:
+                continue
+            # Prefer the closest question, then the position's own FAQs, then company FAQs
+            rank = (similarity, candidate["positionId"] == position_id, candidate["type"] == "companyFAQ")
+            if best_rank is None or rank > best_rank:
+                best, best_rank = candidate, rank
+
+    record_cache_lookup("company_knowledge", best is not None)
+    if best is None:
+        return None
+
+    same_position = best["type"] == "positionFAQ" and best["positionId"] == position_id
+    return {
+        "similar_question_id": best["id"] if same_position else None,
+        "response": best["answer"],
+        "provenance": {
+            "source": best["type"],
+            "faqId": best["id"],
+            "positionId": best["positionId"],
+            "companyId": best["companyId"],
+            "question": best["question"],
+            "similarity": round(best_rank[0], 3)
+        }
+    }
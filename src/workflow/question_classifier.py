@@ -0,0 +1,308 @@
+# src/workflow/question_classifier.py
+"""
+Local pre-classifier for the legacy workflow's question type step.
+
+Greetings and thanks are recognised by rules. Other inputs are classified by a
+multinomial naive Bayes model over words, trained from built-in examples, the
+stored position and company FAQs and, optionally, a file of labelled inputs
+such as earlier LLM classifications. Inputs the model is not confident about
+are left to the LLM (identify_question_type).
+"""
+
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.config import settings
+from src.database import file_db
+from src.utils.logger import log
+from src.utils.metrics import QUESTION_CLASSIFICATIONS
+from src.workflow.question_matching import normalize_question
+
+QUESTION_CLASSIFIER_ENABLED = settings.question_classifier_enabled
+QUESTION_CLASSIFIER_THRESHOLD = settings.question_classifier_threshold
+QUESTION_CLASSIFIER_MAX_EXAMPLES = settings.question_classifier_max_examples
+QUESTION_CLASSIFIER_TRAINING_FILE = settings.question_classifier_training_file
+
+# Classes and the identify_question_type result each one stands for
+CHITCHAT = "chitchat"
+OFF_TOPIC = "off_topic"
+POSITION = "position"
+COMPANY = "company"
+CLASSES = (CHITCHAT, OFF_TOPIC, POSITION, COMPANY)
+_RESULTS = {
+    CHITCHAT: {"is_question": False, "about_position": False, "about_company": False},
+    OFF_TOPIC: {"is_question": True, "about_position": False, "about_company": False},
+    POSITION: {"is_question": True, "about_position": True, "about_company": False},
+    COMPANY: {"is_question": True, "about_position": False, "about_company": True},
+}
+
+# Inputs made only of these words are never questions
+_CHITCHAT_WORDS = frozenset({
+    "hello", "hi", "hey", "hiya", "there", "good", "morning", "afternoon", "evening", "thanks", "thank",
+    "you", "very", "much", "so", "ok", "okay", "great", "cool", "nice", "awesome", "bye", "goodbye",
+    "cheers", "got", "it", "sounds", "see", "ya", "later", "perfect", "sure", "yes", "no", "alright"
+})
+
+_QUESTION_WORDS = frozenset({
+    "what", "how", "is", "are", "can", "could", "do", "does", "did", "who", "where", "when", "why",
+    "which", "will", "would", "should", "may", "any", "tell", "explain", "describe"
+})
+
+_SEED_EXAMPLES = {
+    CHITCHAT: [
+        "hello", "hi there", "hey", "good morning", "thanks", "thank you very much", "ok", "great",
+        "bye", "got it", "sounds good", "cheers", "nice one", "awesome thanks", "see you later",
+    ],
+    OFF_TOPIC: [
+        "what is the weather like today", "who won the football game last night", "can you tell me a joke",
+        "what is the capital of france", "how do i cook pasta", "what time is it", "who are you",
+        "are you a robot", "what is 2 plus 2", "can you recommend a good movie", "how tall is mount everest",
+        "what is the meaning of life",
+    ],
+    POSITION: [
+        "what are the responsibilities of this role", "what skills are needed for this position",
+        "is this role remote", "what is the salary range for this job", "who does this position report to",
+        "what tech stack does the team use", "is there an on call rotation for this role",
+        "what experience is required for the job", "how many people are on the team",
+        "when is the start date for the role", "what does a typical day look like in this job",
+        "what are the working hours for this position",
+    ],
+    COMPANY: [
+        "what is the company culture like", "how big is the company", "where is the company headquartered",
+        "what does the company do", "what benefits does the company offer", "what are the company values",
+        "how many employees work at the company", "who founded the company", "is the company profitable",
+        "what is the mission of the organisation", "what is it like to work at this company",
+        "does the company have offices overseas",
+    ],
+}
+
+def _words(text: str) -> List[str]:
+    return normalize_question(text).split()
+
+def looks_like_question(text: str) -> bool:
+    """Whether the input ends with a question mark or starts with a question word"""
+    words = _words(text)
+    return text.strip().endswith("?") or (bool(words) and words[0] in _QUESTION_WORDS)
+
+class NaiveBayesClassifier:
+    """
+    Multinomial naive Bayes over word counts, with Laplace smoothing
+
+    Args:
+        alpha: The smoothing added to every word count
+    """
+
+    def __init__(self, alpha: float = 1.0):
+        self.alpha = alpha
+        self.classes: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        self._class_log_prior = None
+        self._word_log_prob = None
+
+    def fit(self, examples: Iterable[Tuple[str, str]]) -> "NaiveBayesClassifier":
+        """
+        Train on (text, class) pairs
+
+        Args:
+            examples: The labelled texts
+
+        Returns:
+            The classifier
+        """
+        # NumPy is imported on first use so it doesn't slow down startup
+        import numpy as np
+
+        documents = [(_words(text), label) for text, label in examples]
+        self.classes = sorted({label for _, label in documents})
+        class_index = {label: index for index, label in enumerate(self.classes)}
+        self.vocabulary = {}
+        for words, _ in documents:
+            for word in words:
+                self.vocabulary.setdefault(word, len(self.vocabulary))
+
+        counts = np.zeros((len(self.classes), len(self.vocabulary)))
+        class_counts = np.zeros(len(self.classes))
+        for words, label in documents:
+            row = class_index[label]
+            class_counts[row] += 1
+            np.add.at(counts[row], [self.vocabulary[word] for word in words], 1)
+
+        self._class_log_prior = np.log(class_counts / class_counts.sum())
+        smoothed = counts + self.alpha
+        self._word_log_prob = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+        return self
+
+    def predict_proba(self, text: str) -> Optional[Dict[str, float]]:
+        """
+        Compute the probability of each class for a text
+
+        Args:
+            text: The text to classify
+
+        Returns:
+            Class -> probability, or None if the model is untrained or knows none of the words
+        """
+        import numpy as np
+
+        if self._word_log_prob is None:
+            return None
+        indexes = [self.vocabulary[word] for word in _words(text) if word in self.vocabulary]
+        if not indexes:
+            return None
+        scores = self._class_log_prior + self._word_log_prob[:, indexes].sum(axis=1)
+        probabilities = np.exp(scores - scores.max())
+        probabilities /= probabilities.sum()
+        return dict(zip(self.classes, probabilities.tolist()))
+
+def load_faq_examples(max_examples: int = QUESTION_CLASSIFIER_MAX_EXAMPLES) -> List[Tuple[str, str]]:
+    """
+    Collect training examples from the stored FAQs
+
+    Args:
+        max_examples: Maximum number of examples per class
+
+    Returns:
+        Position FAQ questions labelled position, company FAQ questions labelled company
+    """
+    examples = []
+    position_count = 0
+    for position_data in file_db.iter_latest_position_data():
+        for faq in position_data.get("positionFAQs") or []:
+            if faq.get("question") and position_count < max_examples:
+                examples.append((faq["question"], POSITION))
+                position_count += 1
+        if position_count >= max_examples:
+            break
+
+    company_count = 0
+    for company_id in file_db.get_company_ids():
+        for faq in (file_db.get_company_data(company_id) or {}).get("companyFAQs") or []:
+            if faq.get("question") and company_count < max_examples:
+                examples.append((faq["question"], COMPANY))
+                company_count += 1
+        if company_count >= max_examples:
+            break
+    return examples
+
+def load_labelled_examples(file_path: str) -> List[Tuple[str, str]]:
+    """
+    Read labelled inputs, one JSON object per line
+
+    Each line has an "input" and the identify_question_type result fields
+    ("is_question", "about_position", "about_company").
+
+    Args:
+        file_path: The JSON lines file
+
+    Returns:
+        (text, class) pairs
+    """
+    examples = []
+    with open(file_path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not record.get("is_question"):
+                label = CHITCHAT
+            elif record.get("about_position"):
+                label = POSITION
+            elif record.get("about_company"):
+                label = COMPANY
+            else:
+                label = OFF_TOPIC
+            examples.append((record["input"], label))
+    return examples
+
+class QuestionClassifier:
+    """
+    Rules plus naive Bayes, trained on first use
+
+    Args:
+        threshold: Minimum class probability for a local classification
+    """
+
+    def __init__(self, threshold: float = QUESTION_CLASSIFIER_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._model: Optional[NaiveBayesClassifier] = None
+
+    def train(self, examples: Optional[List[Tuple[str, str]]] = None) -> None:
+        """
+        Train the model
+
+        Args:
+            examples: Labelled examples added to the built-in ones. Defaults to the
+                stored FAQs and the QUESTION_CLASSIFIER_TRAINING_FILE examples
+        """
+        if examples is None:
+            examples = load_faq_examples()
+            if QUESTION_CLASSIFIER_TRAINING_FILE:
+                try:
+                    examples += load_labelled_examples(QUESTION_CLASSIFIER_TRAINING_FILE)
+                except (OSError, ValueError, KeyError) as e:
+                    log.warning("Could not read question classifier examples", error=str(e))
+        seeds = [(text, label) for label, texts in _SEED_EXAMPLES.items() for text in texts]
+        model = NaiveBayesClassifier().fit(seeds + list(examples))
+        with self._lock:
+            self._model = model
+        log.info("Trained question classifier", examples=len(seeds) + len(examples), words=len(model.vocabulary))
+
+    def reset(self) -> None:
+        """Drop the model so it is trained again on next use"""
+        with self._lock:
+            self._model = None
+
+    def classify(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Classify an input locally if the classification is confident
+
+        Args:
+            text: The input text from the user
+
+        Returns:
+            A result in the form returned by identify_question_type, or None if
+            the LLM should decide
+        """
+        words = _words(text)
+        if not words or all(word in _CHITCHAT_WORDS for word in words):
+            return dict(_RESULTS[CHITCHAT])
+
+        model = self._model
+        if model is None:
+            self.train()
+            model = self._model
+        probabilities = model.predict_proba(text)
+        if not probabilities:
+            return None
+        label = max(probabilities, key=probabilities.get)
+        if probabilities[label] < self.threshold:
+            return None
+        # A question-shaped input is never dismissed as small talk without the LLM
+        if label == CHITCHAT and looks_like_question(text):
+            return None
+        return dict(_RESULTS[label])
+
+question_classifier = QuestionClassifier()
+
+def classify_question_locally(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Classify an input with the local classifier, if enabled and confident
+
+    Args:
+        text: The input text from the user
+
+    Returns:
+        A result in the form returned by identify_question_type, or None if the
+        LLM should classify the input
+    """
+    if not QUESTION_CLASSIFIER_ENABLED:
+        return None
+    try:
+        result = question_classifier.classify(text)
+    except Exception as e:
+        log.error("Error in local question classifier", error=str(e))
+        result = None
+    QUESTION_CLASSIFICATIONS.inc(source="local" if result is not None else "llm")
+    return result
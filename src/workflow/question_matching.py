@@ -0,0 +1,207 @@
+# src/workflow/question_matching.py
+"""
+Helpers for recognising repeated questions.
+"""
+
+import re
+import random
+import hashlib
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from src.config import settings
+
+DUPLICATE_QUESTION_THRESHOLD = settings.duplicate_question_threshold
+
+_NON_WORD = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "how",
+    "i", "in", "is", "it", "of", "on", "or", "the", "there", "this", "to", "what", "when", "where",
+    "which", "who", "will", "with", "you", "your"
+})
+
+# Stop words that still change what a question asks, e.g. "where" and "when"
+QUESTION_WORDS = frozenset({"how", "what", "when", "where", "which", "who", "whom", "whose", "why"})
+
+# Words that don't distinguish questions asked about a position
+_POSITION_WORDS = frozenset({"role", "position", "job", "s"})
+
+# Number of hash functions in a MinHash signature; the similarity estimate
+# has a standard error of at most 0.5 / sqrt(MINHASH_PERMUTATIONS)
+MINHASH_PERMUTATIONS = 128
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20250824)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(MINHASH_PERMUTATIONS)]
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question so trivially different phrasings compare equal
+    
+    Applies Unicode compatibility normalization, lowercases, removes punctuation
+    and collapses whitespace, e.g. "  Is it HYBRID?? " becomes "is it hybrid".
+    
+    Args:
+        question: The question text
+        
+    Returns:
+        The normalized question
+    """
+    text = unicodedata.normalize("NFKC", question).casefold()
+    text = _NON_WORD.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+def _stem(word: str) -> str:
+    """Fold simple plurals, so visas matches visa and policies matches policy"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into search terms
+
+    Args:
+        text: The text to split
+
+    Returns:
+        Normalized words with plurals folded, without stop words
+    """
+    return [_stem(term) for term in normalize_question(text).split() if term not in STOP_WORDS]
+
+def question_terms(question: str) -> List[str]:
+    """
+    Split a question into the terms compared between questions
+
+    Like tokenize, but keeps question words, so "Where does it start?" and
+    "When does it start?" don't compare equal. Negations are not stop words,
+    so they are kept as well.
+
+    Args:
+        question: The question text
+
+    Returns:
+        Normalized words with plurals folded, without stop words other than question words
+    """
+    return [_stem(term) for term in normalize_question(question).split()
+            if term in QUESTION_WORDS or term not in STOP_WORDS]
+
+def question_words(question: str) -> FrozenSet[str]:
+    """The question words of a question, e.g. where and how"""
+    return frozenset(term for term in normalize_question(question).split() if term in QUESTION_WORDS)
+
+def _content_words(question: str) -> List[str]:
+    return [word for word in question_terms(question) if word not in _POSITION_WORDS]
+
+def question_key(question: str) -> str:
+    """
+    Key that is equal for questions with the same content words in any order
+
+    Args:
+        question: The question text
+
+    Returns:
+        The sorted content words, e.g. "parking provided" for "Is parking provided for this role?"
+        or "how report" for "How do I report?"
+    """
+    return " ".join(sorted(set(_content_words(question))))
+
+def is_same_question(first: str, second: str) -> bool:
+    """
+    Check whether two questions have the same content words, so one's answer answers the other
+
+    Args:
+        first: A question
+        second: Another question
+
+    Returns:
+        True if both questions have the same non-empty question key
+    """
+    key = question_key(first)
+    return bool(key) and key == question_key(second)
+
+def question_shingles(question: str) -> FrozenSet[str]:
+    """
+    The features compared between questions
+
+    Content words plus each pair of adjacent content words, so questions
+    differing in one word, e.g. "start date" and "end date", share few features.
+
+    Args:
+        question: The question text
+
+    Returns:
+        The set of features
+    """
+    words = _content_words(question)
+    return frozenset(words) | frozenset(f"{first} {second}" for first, second in zip(words, words[1:]))
+
+@lru_cache(maxsize=4096)
+def minhash_signature(question: str) -> Tuple[int, ...]:
+    """
+    MinHash signature of a question's shingles
+
+    Args:
+        question: The question text
+
+    Returns:
+        The minimum of each hash function over the shingles, or an empty tuple
+        if the question has no content words
+    """
+    hashes = [int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+              for shingle in question_shingles(question)]
+    if not hashes:
+        return ()
+    return tuple(min((a * value + b) % _MERSENNE_PRIME for value in hashes) for a, b in _PERMUTATIONS)
+
+def signature_similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """
+    Estimate the Jaccard similarity of two questions from their MinHash signatures
+
+    Args:
+        first: A signature from minhash_signature
+        second: Another signature
+
+    Returns:
+        The fraction of matching hash values, from 0 to 1
+    """
+    if not first or not second:
+        return 0.0
+    return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+def find_duplicate_question(question: str, faqs: List[Dict[str, Any]],
+                            threshold: float = DUPLICATE_QUESTION_THRESHOLD) -> Optional[Dict[str, Any]]:
+    """
+    Find an FAQ asking the same question in different words
+
+    FAQs with the same content words are matched first; otherwise the FAQ with the
+    highest estimated similarity is returned if it reaches the threshold.
+
+    Args:
+        question: The question text
+        faqs: The FAQs to search, with "id" and "question" fields
+        threshold: Minimum estimated Jaccard similarity of the question shingles
+
+    Returns:
+        The matching FAQ, or None
+    """
+    key = question_key(question)
+    if not key:
+        return None
+    candidates = [faq for faq in faqs if faq.get("id") is not None and faq.get("question")]
+    for faq in candidates:
+        if question_key(faq["question"]) == key:
+            return faq
+
+    signature = minhash_signature(question)
+    best, best_similarity = None, threshold
+    for faq in candidates:
+        similarity = signature_similarity(signature, minhash_signature(faq["question"]))
+        if similarity >= best_similarity:
+            best, best_similarity = faq, similarity
+    return best
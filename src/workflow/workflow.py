@@ -1,11 +1,59 @@
+from src.config import settings
 from src.llms.llm import llm
+from src.llms.structured_output import invoke_structured, QuestionType, QuestionAnswer, StructuredOutputError
 from src.utils.logger import log
-from src.database.file_db import get_position_data, get_company_data
-from typing import Dict, Any, Literal, Optional
+from src.utils.timing import span
+from src.utils.metrics import LLM_CALLS, LLM_CALL_DURATION, LLM_TOKENS
+from src.utils.usage import usage_tracker, usage_scope
+from src.workflow.answer_cache import answer_cache, answer_fingerprint
+from src.workflow.company_knowledge import find_known_answer
+from src.utils.email_outbox import notify_question_added
+from src.workflow.question_classifier import classify_question_locally
+from src.workflow.question_matching import find_duplicate_question, is_same_question
+from src.database.file_db import get_position_data, get_company_data, get_position_data_version, update_position_data
+from typing import Dict, Any, List, Literal, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 import json
-import re
+import time
 import datetime
 
+BATCH_MAX_CONCURRENCY = settings.batch_max_concurrency
+
+LLM_FAILURE_RESPONSE = "I'm sorry, I couldn't process your question at the moment. Please try again later."
+
+def _invoke_llm(step: str, prompt: str) -> Any:
+    """
+    Invoke the LLM, recording the call latency, outcome and token usage for the workflow step.
+    
+    Args:
+        step: The workflow step making the call
+        prompt: The prompt to send
+        
+    Returns:
+        The LLM response message
+    """
+    start = time.perf_counter()
+    try:
+        with span("llm_call"):
+            response = llm.invoke(prompt)
+    except Exception:
+        LLM_CALLS.inc(step=step, outcome="error")
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        LLM_CALL_DURATION.observe(duration, step=step)
+    
+    LLM_CALLS.inc(step=step, outcome="success")
+    usage = getattr(response, "usage_metadata", None)
+    if isinstance(usage, dict):
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        LLM_TOKENS.inc(input_tokens, step=step, direction="input")
+        LLM_TOKENS.inc(output_tokens, step=step, direction="output")
+        usage_tracker.record(step, input_tokens, output_tokens, duration)
+    return response
+
 def identify_question_type(input_text: str) -> Dict[str, Any]:
     """
     Identifies if the input is a question and what type of question it is.
@@ -36,31 +84,12 @@ def identify_question_type(input_text: str) -> Dict[str, Any]:
     """
     
     try:
-        response = llm.invoke(prompt)
-        # Extract the JSON from the response
-        response_text = response.content.strip()
-        
-        # Simple parsing to extract JSON (assuming the LLM follows instructions)
-        import json
-        import re
-        
-        # Find JSON pattern in the response
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
-            result = json.loads(json_str)
-            log.info(f"Question type identified: {result}")
-            return result
-        else:
-            log.error("Failed to parse JSON from LLM response")
-            return {
-                "is_question": False,
-                "about_position": False,
-                "about_company": False
-            }
+        result = invoke_structured(_invoke_llm, "identify_question_type", prompt, QuestionType).model_dump()
+        log.info("Question type identified", result=result)
+        return result
             
     except Exception as e:
-        log.error(f"Error identifying question type: {str(e)}")
+        log.error("Error identifying question type", error=str(e))
         return {
             "is_question": False,
             "about_position": False,
@@ -91,10 +120,10 @@ def fetch_position_data(input_text: str) -> str:
     """
     
     try:
-        response = llm.invoke(prompt)
+        response = _invoke_llm("fetch_position_data", prompt)
         return response.content
     except Exception as e:
-        log.error(f"Error fetching position data: {str(e)}")
+        log.error("Error fetching position data", error=str(e))
         return "I'm sorry, I couldn't retrieve information about this position at the moment."
 
 def fetch_company_data(input_text: str) -> str:
@@ -121,10 +150,10 @@ def fetch_company_data(input_text: str) -> str:
     """
     
     try:
-        response = llm.invoke(prompt)
+        response = _invoke_llm("fetch_company_data", prompt)
         return response.content
     except Exception as e:
-        log.error(f"Error fetching company data: {str(e)}")
+        log.error("Error fetching company data", error=str(e))
         return "I'm sorry, I couldn't retrieve information about this company at the moment."
 
 def summarize_question(question: str) -> str:
@@ -155,10 +184,10 @@ def summarize_question(question: str) -> str:
     """
     
     try:
-        response = llm.invoke(prompt)
+        response = _invoke_llm("summarize_question", prompt)
         return response.content.strip()
     except Exception as e:
-        log.error(f"Error summarizing question: {str(e)}")
+        log.error("Error summarizing question", error=str(e))
         # If summarization fails, return the original question
         return question
 
@@ -173,7 +202,7 @@ def increment_faq_times_asked(position_data: Dict[str, Any], faq_id: int) -> Dic
     Returns:
         Updated position data with incremented timesAsked
     """
-    log.info(f"Incrementing timesAsked for FAQ ID {faq_id}")
+    log.info("Incrementing timesAsked", faq_id=faq_id)
     
     # Get existing FAQs
     position_faqs = position_data.get("positionFAQs", [])
@@ -188,7 +217,7 @@ def increment_faq_times_asked(position_data: Dict[str, Any], faq_id: int) -> Dic
             # Update the timestamp
             faq["timestamp"] = datetime.datetime.now().isoformat()
             
-            log.info(f"Incremented timesAsked for FAQ ID {faq_id} to {faq['timesAsked']}")
+            log.info("Incremented timesAsked", faq_id=faq_id, times_asked=faq['timesAsked'])
             break
     
     # Update the position data
@@ -196,25 +225,48 @@ def increment_faq_times_asked(position_data: Dict[str, Any], faq_id: int) -> Dic
     
     return position_data
 
-def add_question_to_faqs(question: str, position_data: Dict[str, Any], position_id: int) -> Dict[str, Any]:
+def add_question_to_faqs(question: str, position_data: Dict[str, Any], position_id: int,
+                         merged_into: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """
     Add an unanswered question to the position FAQs.
     
+    If an existing FAQ asks the same question in different words (see
+    find_duplicate_question), its timesAsked counter is incremented instead.
+    
     Args:
         question: The question to add
         position_data: The position data to update
         position_id: The ID of the position
+        merged_into: List the existing FAQ is appended to when the question is
+            merged into it instead of added
         
     Returns:
-        Updated position data with the new FAQ added
+        Updated position data with the new FAQ added or the duplicate FAQ incremented
     """
-    log.info(f"Adding unanswered question to FAQs for position ID {position_id}")
+    # Get existing FAQs
+    position_faqs = position_data.get("positionFAQs", [])
+    
+    # A rewording of an existing FAQ needs no summary and no new entry
+    duplicate = find_duplicate_question(question, position_faqs)
+    if duplicate is not None:
+        log.info("Merging question into a near-duplicate FAQ", position_id=position_id, faq_id=duplicate["id"])
+        if merged_into is not None:
+            merged_into.append(duplicate)
+        return increment_faq_times_asked(position_data, duplicate["id"])
+    
+    log.info("Adding unanswered question to FAQs", position_id=position_id)
     
     # Summarize the question
-    summarized_question = summarize_question(question)
+    with span("summarize"):
+        summarized_question = summarize_question(question)
     
-    # Get existing FAQs
-    position_faqs = position_data.get("positionFAQs", [])
+    # The summary may match an existing FAQ that the original wording did not
+    duplicate = find_duplicate_question(summarized_question, position_faqs)
+    if duplicate is not None:
+        log.info("Merging summarized question into a near-duplicate FAQ", position_id=position_id, faq_id=duplicate["id"])
+        if merged_into is not None:
+            merged_into.append(duplicate)
+        return increment_faq_times_asked(position_data, duplicate["id"])
     
     # Generate a new unique ID
     # Find the highest existing FAQ ID and increment by 1
@@ -244,7 +296,8 @@ def add_question_to_faqs(question: str, position_data: Dict[str, Any], position_
     
     return position_data
 
-def process_question_with_llm(question: str, position_data: Dict[str, Any], company_data: Dict[str, Any]) -> str:
+def process_question_with_llm(question: str, position_data: Dict[str, Any], company_data: Dict[str, Any],
+                              context: Optional[str] = None) -> str:
     """
     Process a question using the LLM with position data.
     
@@ -252,28 +305,107 @@ def process_question_with_llm(question: str, position_data: Dict[str, Any], comp
         question: The question from the user
         position_data: The position data from the database
         company_data: The company data from the database
+        context: Optional position context already rendered from the same data,
+            as returned by render_position_context
         
     Returns:
         The response from the LLM
     """
     log.info("Processing question with LLM")
     
+    with span("prompt_build"):
+        prompt = build_question_prompt(question, position_data, company_data, context)
+    
+    try:
+        # A response that doesn't match the schema gets one repair attempt, while a
+        # prose reply is shown to the user as is, marked as unstructured
+        answer = invoke_structured(_invoke_llm, "answer_question", prompt, QuestionAnswer, plain_text_fallback=True)
+        result = answer.model_dump()
+        if answer.unstructured:
+            result["unstructured"] = True
+        log.info("Parsed LLM response", result=result)
+        return result
+    except StructuredOutputError as e:
+        log.error("Failed to parse LLM response", error=str(e))
+        return {
+            "similar_question_id": None,
+            "response": LLM_FAILURE_RESPONSE
+        }
+    except Exception as e:
+        log.error("Error processing question with LLM", error=str(e))
+        return {
+            "similar_question_id": None,
+            "response": LLM_FAILURE_RESPONSE
+        }
+
+def answer_question(question: str, position_id: int, position_data: Dict[str, Any], company_data: Dict[str, Any],
+                    context: Optional[str] = None, fingerprint: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Answer a question, reusing an answered FAQ of the company or the cached result
+    for a repeated question when the data is unchanged, and calling the LLM otherwise.
+    
+    Args:
+        question: The question from the user
+        position_id: The ID of the position
+        position_data: The position data from the database
+        company_data: The company data from the database
+        context: Optional position context already rendered from the same data
+        fingerprint: Optional fingerprint of the same data, see answer_fingerprint
+        
+    Returns:
+        The parsed LLM result, or a result with a provenance entry if an answered
+        FAQ was reused (see find_known_answer)
+    """
+    company_id = position_data.get("position", {}).get("companyId")
+    known_answer = find_known_answer(question, position_id, company_id)
+    if known_answer is not None:
+        log.info("Answered question from a company FAQ", position_id=position_id, provenance=known_answer["provenance"])
+        return known_answer
+    
+    if fingerprint is None:
+        fingerprint = answer_fingerprint(position_data, company_data)
+    
+    cached_result = answer_cache.get(position_id, question, fingerprint)
+    if cached_result is not None:
+        log.info("Answered question from the answer cache", position_id=position_id)
+        return cached_result
+    
+    llm_result = process_question_with_llm(question, position_data, company_data, context)
+    # Failures and prose replies may parse on the next attempt, so neither is cached
+    if llm_result.get("response") != LLM_FAILURE_RESPONSE and not llm_result.get("unstructured"):
+        answer_cache.put(position_id, question, fingerprint, llm_result)
+    return llm_result
+
+def render_position_context_parts(position_data: Dict[str, Any], company_data: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Render the context section of the prompt, except for the position FAQs.
+    
+    The FAQs change whenever a question is asked, so callers that keep the
+    rendered context can re-render just them (see render_faq_item).
+    
+    Args:
+        position_data: The position data from the database
+        company_data: The company data from the database
+        
+    Returns:
+        Tuple of the rendered context before and after the position FAQs list
+    """
     # Format the position data for the prompt
     position_info = position_data.get("position", {})
-    position_faqs = position_data.get("positionFAQs", [])
     position_details = position_data.get("positionInfo", [])
     
     # Format the company data for the prompt
     company_faqs = company_data.get("companyFAQs", [])
     company_info = company_data.get("companyInfo", [])
     
-    # Create a formatted string of the data for the prompt
-    position_data_str = f"""
+    # Create formatted strings of the data for the prompt
+    head = f"""
     POSITION DESCRIPTION:
     {position_info.get('positionDescription', 'No description available')}
     
     POSITION FAQs:
-    {json.dumps(position_faqs, indent=2)}
+    """
+    tail = f"""
     
     POSITION INFO:
     {json.dumps(position_details, indent=2)}
@@ -285,6 +417,65 @@ def process_question_with_llm(question: str, position_data: Dict[str, Any], comp
     {json.dumps(company_info, indent=2)}
     """
     
+    return head, tail
+
+def render_faq_item(faq: Dict[str, Any]) -> str:
+    """
+    Render one position FAQ as it appears in the FAQs list of the context.
+    
+    Args:
+        faq: The FAQ
+        
+    Returns:
+        The FAQ as rendered by json.dumps(faqs, indent=2), without the separating comma
+    """
+    # JSON strings escape newlines, so every newline is a line break of the rendering
+    return "  " + json.dumps(faq, indent=2).replace("\n", "\n  ")
+
+def render_faq_list(rendered_faqs: Sequence[str]) -> str:
+    """
+    Join FAQs rendered by render_faq_item into the FAQs list of the context.
+    
+    Args:
+        rendered_faqs: The rendered FAQs in order
+        
+    Returns:
+        The same text as json.dumps(faqs, indent=2)
+    """
+    if not rendered_faqs:
+        return "[]"
+    return "[\n" + ",\n".join(rendered_faqs) + "\n]"
+
+def render_position_context(position_data: Dict[str, Any], company_data: Dict[str, Any]) -> str:
+    """
+    Render the position and company data into the context section of the prompt.
+    
+    Args:
+        position_data: The position data from the database
+        company_data: The company data from the database
+        
+    Returns:
+        The rendered context
+    """
+    head, tail = render_position_context_parts(position_data, company_data)
+    return head + json.dumps(position_data.get("positionFAQs", []), indent=2) + tail
+
+def build_question_prompt(question: str, position_data: Dict[str, Any], company_data: Dict[str, Any],
+                          context: Optional[str] = None) -> str:
+    """
+    Build the prompt used to answer a question about a position.
+    
+    Args:
+        question: The question from the user
+        position_data: The position data from the database
+        company_data: The company data from the database
+        context: Optional pre-rendered position context. Rendered from the data if omitted
+        
+    Returns:
+        The prompt for the LLM
+    """
+    position_data_str = context if context is not None else render_position_context(position_data, company_data)
+    
     # Create the prompt for the LLM
     prompt = f"""
     You are an AI assistant that helps answer questions about job positions. 
@@ -318,37 +509,190 @@ def process_question_with_llm(question: str, position_data: Dict[str, Any], comp
     Return ONLY the JSON object described above, without any additional text or explanation.
     """
     
-    try:
-        response = llm.invoke(prompt)
-        response_text = response.content.strip()
+    return prompt
+
+ADDED_TO_QUESTION_LIST_MESSAGE = "This question has been added to the question list for the Hiring Manager"
+PASSED_TO_HIRING_MANAGER_RESPONSE = "This question has been passed to the hiring manager."
+
+def load_position_context(position_id: int) -> Optional[Tuple[Dict[str, Any], Optional[int], Dict[str, Any]]]:
+    """
+    Load the latest position data and the data of the company it belongs to.
+    
+    Args:
+        position_id: The ID of the position
         
-        # Parse the JSON response
-        try:
-            # Find JSON pattern in the response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                result = json.loads(json_str)
-                log.info(f"Parsed LLM response: {result}")
-                return result
-            else:
-                log.error("Failed to parse JSON from LLM response")
-                return {
-                    "similar_question_id": None,
-                    "response": "I'm sorry, I couldn't process your question at the moment. Please try again later."
-                }
-        except json.JSONDecodeError as je:
-            log.error(f"JSON decode error: {str(je)}")
-            return {
-                "similar_question_id": None,
-                "response": response_text  # Return the raw response as fallback
-            }
+    Returns:
+        Tuple of (position_data, company_id, company_data), or None if the position was not found
+    """
+    # Retrieve data for the position
+    with span("position_read"):
+        position_data = get_position_data(position_id)
+    if position_data is None:
+        return None
+    
+    # Get the company ID from the position data and retrieve company data
+    company_id = position_data.get("position", {}).get("companyId")
+    if not company_id:
+        log.warning("No company ID found in position data", position_id=position_id)
+        company_data = {"companyFAQs": [], "companyInfo": []}
+    else:
+        with span("company_read"):
+            company_data = get_company_data(company_id)
+        if company_data is None:
+            log.warning("Company data not found", company_id=company_id)
+            company_data = {"companyFAQs": [], "companyInfo": []}
+    
+    return position_data, company_id, company_data
+
+def apply_faq_bookkeeping(question: str, llm_result: Dict[str, Any], position_data: Dict[str, Any],
+                          position_id: int, company_id: Optional[int],
+                          added_questions: Optional[List[str]] = None) -> bool:
+    """
+    Update the position FAQs to reflect a question that was asked.
+    
+    Increments the timesAsked counter of a similar FAQ, or adds the question as a
+    new unanswered FAQ if it could not be answered. If the question turns out to
+    be a rewording of an existing FAQ, it is merged into that FAQ and the response
+    in llm_result is replaced by the FAQ's answer if it has the same content words,
+    or else by the passed to the hiring manager message. Unstructured answers, prose replies that were
+    never parsed, change nothing. The position data is updated in place but not saved.
+    
+    Args:
+        question: The question from the user
+        llm_result: The parsed LLM result for the question
+        position_data: The position data to update
+        position_id: The ID of the position
+        company_id: The ID of the company the position belongs to
+        added_questions: List the question of a newly added FAQ is appended to,
+            to notify the hiring manager once it is saved
+        
+    Returns:
+        True if the position data was changed and needs saving
+    """
+    if llm_result.get("unstructured"):
+        # The reply was never parsed, so it says nothing reliable about the FAQs
+        log.warning("Skipping FAQ bookkeeping for an unstructured answer", position_id=position_id)
+        return False
+    
+    response_content = llm_result.get("response", "I'm sorry, I couldn't process your question at the moment.")
+    similar_question_id = llm_result.get("similar_question_id")
+    
+    if similar_question_id is not None:
+        # A similar question was found, increment the timesAsked counter
+        log.info("Similar question found", faq_id=similar_question_id)
+        increment_faq_times_asked(position_data, similar_question_id)
+        return True
+    
+    if ADDED_TO_QUESTION_LIST_MESSAGE in response_content:
+        # No similar question was found and the question couldn't be answered
+        log.info("No similar question found, adding new question to FAQs")
+        faq_count = len(position_data.get("positionFAQs", []))
+        merged_into: List[Dict[str, Any]] = []
+        with usage_scope(position_id, company_id):
+            add_question_to_faqs(question, position_data, position_id, merged_into)
+        if merged_into:
+            # Not added after all. Only an FAQ asking the same question answers it;
+            # an approximate match may ask something else, so the question is passed on
+            duplicate = merged_into[0]
+            same_question = is_same_question(question, duplicate["question"])
+            llm_result["response"] = (same_question and duplicate.get("response")) or PASSED_TO_HIRING_MANAGER_RESPONSE
+        elif added_questions is not None and len(position_data["positionFAQs"]) > faq_count:
+            added_questions.append(position_data["positionFAQs"][-1]["question"])
+        return True
+    
+    return False
+
+def rebase_faq_bookkeeping(base: Dict[str, Any], updated: Dict[str, Any], latest: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Re-apply FAQ bookkeeping made on one version of a position to a newer version.
+    
+    FAQs added since the base version are appended (with a new ID if the newer version
+    already uses theirs) and timesAsked increments are added to the newer counters.
+    All other changes in the newer version, e.g. edits by HR, are kept.
+    
+    Args:
+        base: The position data the bookkeeping was applied to, as loaded
+        updated: The position data after the bookkeeping
+        latest: The latest position data, updated in place
+        
+    Returns:
+        The latest position data with the bookkeeping applied
+    """
+    base_faqs = {faq.get("id"): faq for faq in base.get("positionFAQs", [])}
+    latest_faqs = latest.setdefault("positionFAQs", [])
+    latest_by_id = {faq.get("id"): faq for faq in latest_faqs}
+    next_id = max([50000] + [faq.get("id", 0) for faq in latest_faqs + updated.get("positionFAQs", [])]) + 1
+    
+    for faq in updated.get("positionFAQs", []):
+        base_faq = base_faqs.get(faq.get("id"))
+        if base_faq is None:
+            new_faq = dict(faq)
+            if new_faq.get("id") in latest_by_id:
+                new_faq["id"] = next_id
+                next_id += 1
+            latest_faqs.append(new_faq)
+            continue
+        
+        increment = faq.get("timesAsked", 0) - base_faq.get("timesAsked", 0)
+        target = latest_by_id.get(faq.get("id"))
+        if increment > 0 and target is not None:
+            target["timesAsked"] = target.get("timesAsked", 0) + increment
+            target["timestamp"] = faq.get("timestamp")
+    
+    return latest
+
+def save_faq_bookkeeping(position_data: Dict[str, Any], position_id: int,
+                         added_questions: Sequence[str] = ()) -> Optional[int]:
+    """
+    Save FAQ bookkeeping without overwriting versions saved since the data was loaded.
+    
+    The save is atomic with respect to other saves of the position. If a newer version
+    was saved after position_data was loaded, the bookkeeping is re-applied to that
+    version (see rebase_faq_bookkeeping) instead of saving position_data over it.
+    
+    The hiring manager is notified of the added questions only once they are saved.
+    
+    Args:
+        position_data: The position data with bookkeeping applied
+        position_id: The ID of the position
+        added_questions: Questions of the FAQs added by the bookkeeping
+        
+    Returns:
+        The saved version, or None if saving failed
+    """
+    base_version = position_data.get("position", {}).get("version")
+    saved: List[Dict[str, Any]] = []
+    
+    def rebase(latest: Dict[str, Any]) -> Dict[str, Any]:
+        saved.clear()
+        if latest.get("position", {}).get("version") == base_version:
+            saved.append(position_data)
+            return position_data
+        log.info("Position changed since loading, re-applying FAQ bookkeeping", position_id=position_id, base_version=base_version)
+        base = get_position_data_version(position_id, base_version) if base_version is not None else None
+        if base is None:
+            log.warning("Loaded position version unavailable, FAQ bookkeeping dropped", position_id=position_id, base_version=base_version)
+            return latest
+        rebased = rebase_faq_bookkeeping(base, position_data, latest)
+        saved.append(rebased)
+        return rebased
+    
+    try:
+        with span("save"):
+            success, _, version = update_position_data(position_id, rebase)
     except Exception as e:
-        log.error(f"Error processing question with LLM: {str(e)}")
-        return {
-            "similar_question_id": None,
-            "response": "I'm sorry, I couldn't process your question at the moment. Please try again later."
-        }
+        log.warning("Failed to save updated position data", position_id=position_id, error=str(e))
+        return None
+    
+    if not success:
+        log.warning("Failed to save updated position data", position_id=position_id)
+        return None
+    
+    if saved:
+        # Queued for the hiring manager's next digest rather than emailed right away
+        for question in added_questions:
+            notify_question_added(saved[0], position_id, question)
+    return version
 
 def process_input(input_text: str, position_id: Optional[int] = None) -> Dict[str, Any]:
     """
@@ -361,7 +705,7 @@ def process_input(input_text: str, position_id: Optional[int] = None) -> Dict[st
     Returns:
         A dictionary with the response and success status
     """
-    log.info(f"Processing input for position ID {position_id}: {input_text}")
+    log.info("Processing input", position_id=position_id, question=input_text)
     
     try:
         # If no position ID is provided, return an error
@@ -371,67 +715,123 @@ def process_input(input_text: str, position_id: Optional[int] = None) -> Dict[st
                 "error": "Position ID is required"
             }
             
-        # Step 1: Retrieve data for the position
-        position_data = get_position_data(position_id)
-        if position_data is None:
+        # Step 1 and 2: Retrieve data for the position and its company
+        context = load_position_context(position_id)
+        if context is None:
             return {
                 "success": False,
                 "error": f"Position with ID {position_id} not found"
             }
-        
-        # Step 2: Get the company ID from the position data and retrieve company data
-        company_id = position_data.get("position", {}).get("companyId")
-        if not company_id:
-            log.warning(f"No company ID found in position data for position ID {position_id}")
-            company_data = {"companyFAQs": [], "companyInfo": []}
-        else:
-            company_data = get_company_data(company_id)
-            if company_data is None:
-                log.warning(f"Company data not found for company ID {company_id}")
-                company_data = {"companyFAQs": [], "companyInfo": []}
+        position_data, company_id, company_data = context
             
         # Step 3: Process the question using the LLM with both position and company data
-        llm_result = process_question_with_llm(input_text, position_data, company_data)
-        
-        # Extract the response content and similar question ID
-        response_content = llm_result.get("response", "I'm sorry, I couldn't process your question at the moment.")
-        similar_question_id = llm_result.get("similar_question_id")
+        with usage_scope(position_id, company_id):
+            llm_result = answer_question(input_text, position_id, position_data, company_data)
         
         # Step 4: Handle the response based on whether a similar question was found
-        from src.database.file_db import save_position_data
+        added_questions: List[str] = []
+        if apply_faq_bookkeeping(input_text, llm_result, position_data, position_id, company_id, added_questions):
+            save_faq_bookkeeping(position_data, position_id, added_questions)
         
-        if similar_question_id is not None:
-            # A similar question was found, increment the timesAsked counter
-            log.info(f"Similar question found with ID: {similar_question_id}")
-            updated_position_data = increment_faq_times_asked(position_data, similar_question_id)
-            
-            # Save the updated position data
-            success, _, _ = save_position_data(updated_position_data, position_id)
-            
-            if not success:
-                log.warning(f"Failed to save updated position data for position ID {position_id}")
-        elif "This question has been added to the question list for the Hiring Manager" in response_content:
-            # No similar question was found and the question couldn't be answered
-            log.info("No similar question found, adding new question to FAQs")
-            updated_position_data = add_question_to_faqs(input_text, position_data, position_id)
-            
-            # Save the updated position data
-            success, _, _ = save_position_data(updated_position_data, position_id)
-            
-            if not success:
-                log.warning(f"Failed to save updated position data for position ID {position_id}")
+        # Extract the response content, which the bookkeeping may have replaced
+        response_content = llm_result.get("response", "I'm sorry, I couldn't process your question at the moment.")
         
-        return {
+        result = {
             "success": True,
             "response": response_content
         }
+        if "provenance" in llm_result:
+            result["provenance"] = llm_result["provenance"]
+        return result
             
     except Exception as e:
-        log.error(f"Error in workflow processing: {str(e)}")
+        log.error("Error in workflow processing", error=str(e))
         return {
             "success": False,
             "error": "An unexpected error occurred while processing your request. Please try again later."
         }
+
+def process_batch_input(questions: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    """
+    Process several questions, possibly about different positions, in one pass.
+    
+    Each position and its company are loaded once, the questions for a position
+    are answered concurrently against the same data, and all FAQ bookkeeping for
+    a position is written as a single new version.
+    
+    Args:
+        questions: List of (question, position_id) tuples
+        
+    Returns:
+        A list of result dictionaries in the same order as the questions, each with
+        the position ID, the question and either a response or an error
+    """
+    log.info("Processing batch", questions=len(questions))
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+    
+    # Group question indexes by position, preserving order
+    by_position: Dict[int, List[int]] = {}
+    for index, (_, position_id) in enumerate(questions):
+        by_position.setdefault(position_id, []).append(index)
+    
+    for position_id, indexes in by_position.items():
+        try:
+            context = load_position_context(position_id)
+            if context is None:
+                for index in indexes:
+                    results[index] = {
+                        "positionId": position_id,
+                        "question": questions[index][0],
+                        "success": False,
+                        "error": f"Position with ID {position_id} not found"
+                    }
+                continue
+            position_data, company_id, company_data = context
+            fingerprint = answer_fingerprint(position_data, company_data)
+            
+            def answer(question: str) -> Dict[str, Any]:
+                with usage_scope(position_id, company_id):
+                    return answer_question(question, position_id, position_data, company_data, fingerprint=fingerprint)
+            
+            # Answer concurrently; every call sees the data as loaded, before any bookkeeping
+            workers = max(1, min(BATCH_MAX_CONCURRENCY, len(indexes)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(contextvars.copy_context().run, answer, questions[index][0])
+                    for index in indexes
+                ]
+                llm_results = [future.result() for future in futures]
+            
+            changed = False
+            added_questions: List[str] = []
+            for index, llm_result in zip(indexes, llm_results):
+                question = questions[index][0]
+                changed = apply_faq_bookkeeping(question, llm_result, position_data, position_id, company_id,
+                                                added_questions) or changed
+                results[index] = {
+                    "positionId": position_id,
+                    "question": question,
+                    "success": True,
+                    "response": llm_result.get("response", "I'm sorry, I couldn't process your question at the moment.")
+                }
+                if "provenance" in llm_result:
+                    results[index]["provenance"] = llm_result["provenance"]
+            
+            if changed:
+                save_faq_bookkeeping(position_data, position_id, added_questions)
+                
+        except Exception as e:
+            log.error("Error in batch workflow processing", position_id=position_id, error=str(e))
+            for index in indexes:
+                results[index] = {
+                    "positionId": position_id,
+                    "question": questions[index][0],
+                    "success": False,
+                    "error": "An unexpected error occurred while processing your request. Please try again later."
+                }
+    
+    return results
         
 def process_legacy_input(input_text: str) -> Dict[str, Any]:
     """
@@ -443,11 +843,15 @@ def process_legacy_input(input_text: str) -> Dict[str, Any]:
     Returns:
         A dictionary with the response and success status
     """
-    log.info(f"Processing legacy input: {input_text}")
+    log.info("Processing legacy input", question=input_text)
     
     try:
-        # Step 1: Identify the question type
-        question_analysis = identify_question_type(input_text)
+        # Step 1: Identify the question type, asking the LLM only if the local classifier is unsure
+        question_analysis = classify_question_locally(input_text)
+        if question_analysis is None:
+            question_analysis = identify_question_type(input_text)
+        else:
+            log.info("Question type identified locally", result=question_analysis)
         
         # If it's not a question, return a generic response
         if not question_analysis.get("is_question", False):
@@ -477,7 +881,7 @@ def process_legacy_input(input_text: str) -> Dict[str, Any]:
             }
             
     except Exception as e:
-        log.error(f"Error in legacy workflow processing: {str(e)}")
+        log.error("Error in legacy workflow processing", error=str(e))
         return {
             "success": False,
             "error": "An unexpected error occurred while processing your request. Please try again later."
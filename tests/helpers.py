@@ -0,0 +1,36 @@
+"""
+Shared fixtures for tests that use the file database
+"""
+
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.database import file_db
+
+def use_temp_data_dir(test_case: unittest.TestCase) -> str:
+    """
+    Point the file database at an empty temporary directory until the test ends
+
+    Args:
+        test_case: The test the directory is used by
+
+    Returns:
+        The path of the directory
+    """
+    temp_dir = tempfile.TemporaryDirectory()
+    test_case.addCleanup(temp_dir.cleanup)
+    patcher = patch.object(file_db, "STATIC_FILES_DIR", temp_dir.name)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    return temp_dir.name
+
+def make_position(company_id, faqs, info=()):
+    """Build a position document from (question, response) pairs and (subject, answer) pairs"""
+    return {
+        "position": {"companyId": company_id, "positionTitle": "Engineer", "positionDescription": "Test position"},
+        "positionFAQs": [{"id": 50001 + i, "positionId": None, "timesAsked": 1, "question": question, "response": response}
+                         for i, (question, response) in enumerate(faqs)],
+        "positionInfo": [{"id": 60001 + i, "subject": subject, "answer": answer}
+                         for i, (subject, answer) in enumerate(info)]
+    }
@@ -0,0 +1,240 @@
+"""
+Tests for admission control and the answer cache
+"""
+
+import os
+import sys
+import copy
+import asyncio
+import unittest
+from unittest.mock import patch, MagicMock
+
+from fastapi.testclient import TestClient
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.main import app
+from src.handlers.admission import AdmissionController, AdmissionRejected, PRIORITY_HIGH, PRIORITY_NORMAL
+from src.utils.metrics import ADMISSION_SHED
+from src.workflow.answer_cache import AnswerCache, answer_cache, answer_fingerprint
+from src.workflow.question_matching import normalize_question
+from src.workflow.workflow import answer_question
+
+POSITION_DATA = {
+    "position": {"id": 1001, "companyId": 2001, "positionDescription": "Engineer", "version": 1},
+    "positionFAQs": [{"id": 50001, "question": "Is it hybrid?", "response": "Yes", "timesAsked": 1}],
+    "positionInfo": []
+}
+COMPANY_DATA = {"companyFAQs": [], "companyInfo": []}
+
+class TestAdmissionController(unittest.TestCase):
+    """Test cases for the admission controller"""
+    
+    def test_queued_requests_admitted_by_priority(self):
+        """Test that waiting requests are admitted high priority first, then in arrival order"""
+        async def scenario():
+            controller = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout=5, retry_after=1)
+            order = []
+            
+            async def request(name, priority):
+                async with controller.admit(priority):
+                    order.append(name)
+                    await asyncio.sleep(0)
+            
+            await controller.acquire()
+            tasks = [asyncio.create_task(request("normal-1", PRIORITY_NORMAL)),
+                     asyncio.create_task(request("normal-2", PRIORITY_NORMAL)),
+                     asyncio.create_task(request("high", PRIORITY_HIGH))]
+            await asyncio.sleep(0)
+            self.assertEqual(controller.queue_depth, 3)
+            controller.release()
+            await asyncio.gather(*tasks)
+            return order, controller.in_flight
+        
+        order, in_flight = asyncio.run(scenario())
+        
+        self.assertEqual(order, ["high", "normal-1", "normal-2"])
+        self.assertEqual(in_flight, 0)
+        
+    def test_queue_full_and_timeout_are_shed(self):
+        """Test 429 when the queue is full and 503 after the queue timeout"""
+        async def scenario():
+            controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=0.05, retry_after=3)
+            await controller.acquire()
+            waiter = asyncio.create_task(controller.acquire())
+            await asyncio.sleep(0)
+            with self.assertRaises(AdmissionRejected) as full:
+                await controller.acquire()
+            with self.assertRaises(AdmissionRejected) as timeout:
+                await waiter
+            return full.exception, timeout.exception, controller
+        
+        queue_full_before = ADMISSION_SHED.get(reason="queue_full")
+        full, timeout, controller = asyncio.run(scenario())
+        
+        self.assertEqual((full.status_code, full.reason, full.retry_after), (429, "queue_full", 3))
+        self.assertEqual((timeout.status_code, timeout.reason), (503, "queue_timeout"))
+        self.assertEqual(controller.in_flight, 1)
+        self.assertEqual(controller.queue_depth, 0)
+        self.assertEqual(ADMISSION_SHED.get(reason="queue_full"), queue_full_before + 1)
+        
+    def test_high_priority_displaces_normal_waiter(self):
+        """Test that a high priority request takes the place of a normal one when the queue is full"""
+        async def scenario():
+            controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5, retry_after=1)
+            await controller.acquire()
+            normal = asyncio.create_task(controller.acquire(PRIORITY_NORMAL))
+            await asyncio.sleep(0)
+            high = asyncio.create_task(controller.acquire(PRIORITY_HIGH))
+            await asyncio.sleep(0)
+            with self.assertRaises(AdmissionRejected) as displaced:
+                await normal
+            controller.release()
+            await high
+            return displaced.exception, controller.in_flight
+        
+        displaced, in_flight = asyncio.run(scenario())
+        
+        self.assertEqual((displaced.status_code, displaced.reason), (429, "displaced"))
+        self.assertEqual(in_flight, 1)
+
+    def test_weighted_requests_hold_several_slots(self):
+        """Test that a weighted request waits for enough free slots and holds them all"""
+        async def scenario():
+            controller = AdmissionController(max_in_flight=3, max_queue=5, queue_timeout=5, retry_after=1)
+            await controller.acquire()
+            heavy = asyncio.create_task(controller.acquire(weight=3))
+            await asyncio.sleep(0)
+            light = asyncio.create_task(controller.acquire())
+            await asyncio.sleep(0)
+            # The light request fits, but waits behind the heavy one
+            queued = controller.queue_depth
+            controller.release()
+            await heavy
+            in_flight_heavy = controller.in_flight
+            controller.release(3)
+            await light
+            return queued, in_flight_heavy, controller.in_flight
+        
+        queued, in_flight_heavy, in_flight_light = asyncio.run(scenario())
+        
+        self.assertEqual(queued, 2)
+        self.assertEqual(in_flight_heavy, 3)
+        self.assertEqual(in_flight_light, 1)
+        
+    def test_weight_capped_to_the_limit(self):
+        """Test that a request heavier than the limit is admitted alone instead of waiting forever"""
+        async def scenario():
+            controller = AdmissionController(max_in_flight=2, max_queue=0, queue_timeout=1, retry_after=1)
+            async with controller.admit(weight=10):
+                in_flight = controller.in_flight
+            return in_flight, controller.in_flight
+        
+        self.assertEqual(asyncio.run(scenario()), (2, 0))
+
+class TestAnswerCache(unittest.TestCase):
+    """Test cases for the answer cache"""
+    
+    def setUp(self):
+        answer_cache.clear()
+        
+    def test_normalize_question(self):
+        """Test that case, punctuation and spacing are ignored"""
+        self.assertEqual(normalize_question("  Is it  HYBRID?? "), "is it hybrid")
+        
+    def test_fingerprint_ignores_bookkeeping(self):
+        """Test that counters do not change the fingerprint but answers do"""
+        counted = copy.deepcopy(POSITION_DATA)
+        counted["positionFAQs"][0]["timesAsked"] = 5
+        edited = copy.deepcopy(POSITION_DATA)
+        edited["positionFAQs"][0]["response"] = "No"
+        
+        fingerprint = answer_fingerprint(POSITION_DATA, COMPANY_DATA)
+        self.assertEqual(answer_fingerprint(counted, COMPANY_DATA), fingerprint)
+        self.assertNotEqual(answer_fingerprint(edited, COMPANY_DATA), fingerprint)
+        
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = AnswerCache(max_entries=2)
+        cache.put(1001, "a?", "f", {"response": "A"})
+        cache.put(1001, "b?", "f", {"response": "B"})
+        cache.get(1001, "a?", "f")
+        cache.put(1001, "c?", "f", {"response": "C"})
+        
+        self.assertTrue(cache.contains(1001, "A"))
+        self.assertFalse(cache.contains(1001, "b?"))
+        
+    @patch('src.workflow.workflow.llm')
+    def test_repeated_question_skips_llm(self, mock_llm):
+        """Test that a repeated question is answered without an LLM call until the data changes"""
+        mock_llm.invoke.return_value = MagicMock(content='{"similar_question_id": 50001, "response": "Yes"}')
+        
+        first = answer_question("Is it hybrid?", 1001, POSITION_DATA, COMPANY_DATA)
+        second = answer_question("is it hybrid", 1001, POSITION_DATA, COMPANY_DATA)
+        edited = copy.deepcopy(POSITION_DATA)
+        edited["positionFAQs"][0]["response"] = "Yes, 2 days a week"
+        answer_question("Is it hybrid?", 1001, edited, COMPANY_DATA)
+        
+        self.assertEqual(first, second)
+        self.assertEqual(mock_llm.invoke.call_count, 2)
+        
+    @patch('src.workflow.workflow.llm')
+    def test_failures_are_not_cached(self, mock_llm):
+        """Test that fallback responses after LLM errors are not cached"""
+        mock_llm.invoke.side_effect = RuntimeError("API error")
+        
+        answer_question("Is it hybrid?", 1001, POSITION_DATA, COMPANY_DATA)
+        
+        self.assertFalse(answer_cache.contains(1001, "Is it hybrid?"))
+
+class TestChatRequestAdmission(unittest.TestCase):
+    """Test cases for admission control on the chat endpoint"""
+    
+    @patch('src.main.handle_workflow_request')
+    def test_rejected_request_returns_retry_after(self, mock_handle):
+        """Test that a shed request gets 429 with Retry-After and the workflow is not run"""
+        controller = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=1, retry_after=4)
+        controller.in_flight = 1
+        
+        with patch('src.main.admission_controller', controller):
+            response = TestClient(app).post("/v1/chatRequest", json={"question": "Is it hybrid?", "positionId": 1001})
+        
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "4")
+        self.assertEqual(response.json()["retryAfter"], 4)
+        mock_handle.assert_not_called()
+        
+    @patch('src.main.handle_workflow_request')
+    def test_admitted_request_releases_slot(self, mock_handle):
+        """Test that an admitted request runs the workflow and frees its slot"""
+        mock_handle.return_value = {"success": True, "response": "Yes"}
+        controller = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=1, retry_after=1)
+        
+        with patch('src.main.admission_controller', controller):
+            response = TestClient(app).post("/v1/chatRequest", json={"question": "Is it hybrid?", "positionId": 1001})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(controller.in_flight, 0)
+
+    @patch('src.main.handle_batch_workflow_request')
+    def test_batch_weighted_by_concurrent_questions(self, mock_handle):
+        """Test that a batch holds a slot for each question it answers at once"""
+        controller = AdmissionController(max_in_flight=8, max_queue=0, queue_timeout=1, retry_after=1)
+        weights = []
+        
+        def handle(questions):
+            weights.append(controller.in_flight)
+            return [{"success": True, "response": "Yes"} for _ in questions]
+        mock_handle.side_effect = handle
+        
+        with patch('src.main.admission_controller', controller), patch('src.main.BATCH_MAX_CONCURRENCY', 4):
+            client = TestClient(app)
+            client.post("/v1/chatRequest/batch", json={"questions": [{"question": "Is it hybrid?", "positionId": 1001}] * 2})
+            client.post("/v1/chatRequest/batch", json={"questions": [{"question": "Is it hybrid?", "positionId": 1001}] * 6})
+        
+        self.assertEqual(weights, [2, 4])
+        self.assertEqual(controller.in_flight, 0)
+
+if __name__ == "__main__":
+    unittest.main()
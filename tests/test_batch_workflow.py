@@ -0,0 +1,155 @@
+"""
+Tests for batch processing of chat questions
+"""
+
+import os
+import sys
+import json
+import copy
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.workflow.workflow import process_batch_input
+from src.workflow.answer_cache import answer_cache
+from src.handlers.workflow_handler import handle_batch_workflow_request
+
+POSITION_DATA = {
+    "position": {
+        "id": 1001,
+        "companyId": 2001,
+        "positionDescription": "Test position",
+        "version": 1
+    },
+    "positionFAQs": [
+        {
+            "id": 50001,
+            "positionId": 1001,
+            "timesAsked": 1,
+            "question": "Is this role hybrid?",
+            "response": "Yes"
+        }
+    ],
+    "positionInfo": []
+}
+
+COMPANY_DATA = {"companyFAQs": [], "companyInfo": []}
+
+def _llm_response(prompt):
+    """Answer based on which question appears in the prompt"""
+    response = MagicMock()
+    if "Summarize the following question" in prompt:
+        response.content = "Is parking provided?"
+    elif '"Is it hybrid?"' in prompt:
+        response.content = json.dumps({"similar_question_id": 50001, "response": "Yes"})
+    elif '"Is there parking?"' in prompt:
+        response.content = json.dumps({
+            "similar_question_id": None,
+            "response": "This question has been added to the question list for the Hiring Manager."
+        })
+    else:
+        response.content = json.dumps({"similar_question_id": None, "response": "Sydney office."})
+    return response
+
+class TestBatchWorkflow(unittest.TestCase):
+    """Test cases for batch question processing"""
+    
+    def setUp(self):
+        answer_cache.clear()
+    
+    @patch('src.workflow.workflow.update_position_data')
+    @patch('src.workflow.workflow.get_position_data')
+    @patch('src.workflow.workflow.get_company_data')
+    @patch('src.workflow.workflow.llm')
+    def test_batch_loads_and_saves_each_position_once(self, mock_llm, mock_get_company_data,
+                                                      mock_get_position_data, mock_save):
+        """Test that data is loaded once and bookkeeping is saved as one version per position"""
+        mock_get_position_data.side_effect = lambda position_id: (
+            copy.deepcopy(POSITION_DATA) if position_id == 1001 else None
+        )
+        mock_get_company_data.return_value = COMPANY_DATA
+        mock_llm.invoke.side_effect = _llm_response
+        mock_save.return_value = (True, 1001, 2)
+        
+        results = process_batch_input([
+            ("Is it hybrid?", 1001),
+            ("Where is the office?", 1001),
+            ("Is there parking?", 1001),
+            ("Any question", 9999)
+        ])
+        
+        # Results are returned in input order
+        self.assertEqual([r["question"] for r in results],
+                         ["Is it hybrid?", "Where is the office?", "Is there parking?", "Any question"])
+        self.assertEqual(results[0]["response"], "Yes")
+        self.assertEqual(results[1]["response"], "Sydney office.")
+        self.assertTrue(results[2]["success"])
+        self.assertFalse(results[3]["success"])
+        self.assertIn("not found", results[3]["error"])
+        
+        # Each position and company is loaded once
+        self.assertEqual(mock_get_position_data.call_count, 2)
+        mock_get_company_data.assert_called_once_with(2001)
+        
+        # All bookkeeping for the position is saved in one write
+        mock_save.assert_called_once()
+        # Nothing else was saved since loading, so the batch result is saved as it is
+        saved_data = mock_save.call_args[0][1](copy.deepcopy(POSITION_DATA))
+        faqs = {faq["id"]: faq for faq in saved_data["positionFAQs"]}
+        self.assertEqual(faqs[50001]["timesAsked"], 2)
+        self.assertEqual(faqs[50002]["question"], "Is parking provided?")
+        
+    @patch('src.workflow.workflow.update_position_data')
+    @patch('src.workflow.workflow.get_position_data')
+    @patch('src.workflow.workflow.get_company_data')
+    @patch('src.workflow.workflow.llm')
+    def test_batch_without_bookkeeping_does_not_save(self, mock_llm, mock_get_company_data,
+                                                     mock_get_position_data, mock_save):
+        """Test that no version is written when nothing changed"""
+        mock_get_position_data.return_value = copy.deepcopy(POSITION_DATA)
+        mock_get_company_data.return_value = COMPANY_DATA
+        mock_llm.invoke.side_effect = _llm_response
+        
+        results = process_batch_input([("Where is the office?", 1001)])
+        
+        self.assertTrue(results[0]["success"])
+        mock_save.assert_not_called()
+        
+    @patch('src.handlers.workflow_handler.process_batch_input')
+    def test_handler_reports_validation_errors_per_question(self, mock_process):
+        """Test that invalid questions fail individually without blocking the batch"""
+        mock_process.return_value = [
+            {"positionId": 1001, "question": "Valid?", "success": True, "response": "Yes"}
+        ]
+        
+        results = handle_batch_workflow_request([("   ", 1001), ("Valid?", 1001)])
+        
+        self.assertFalse(results[0]["success"])
+        self.assertEqual(results[0]["error"], "Message cannot be empty.")
+        self.assertEqual(results[1]["response"], "Yes")
+        mock_process.assert_called_once_with([("Valid?", 1001)])
+
+class TestBatchEndpoint(unittest.TestCase):
+    """Test cases for the batch chat endpoint"""
+    
+    @patch('src.main.handle_batch_workflow_request')
+    def test_batch_endpoint(self, mock_handle):
+        """Test the endpoint returns the responses and validates the batch"""
+        from fastapi.testclient import TestClient
+        from src.main import app
+        
+        mock_handle.return_value = [{"positionId": 1001, "question": "Q?", "success": True, "response": "A"}]
+        client = TestClient(app)
+        
+        response = client.post("/v1/chatRequest/batch", json={"questions": [{"question": "Q?", "positionId": 1001}]})
+        empty = client.post("/v1/chatRequest/batch", json={"questions": []})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["responses"][0]["response"], "A")
+        mock_handle.assert_called_once_with([("Q?", 1001)])
+        self.assertEqual(empty.status_code, 422)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Tests for the offline bulk FAQ answering pipeline
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import file_db
+from src.workflow.bulk_answer import collect_unanswered_faqs, run_bulk_answer
+
+def _faq(faq_id, position_id, question, response=None, generated_by_user=True):
+    return {
+        "id": faq_id,
+        "positionId": position_id,
+        "generatedByUser": generated_by_user,
+        "answeredByHR": response is not None,
+        "timesAsked": 1,
+        "question": question,
+        "response": response,
+        "version": 1,
+        "timestamp": "2025-08-24T12:00:00+10:00"
+    }
+
+def _position(position_id, faqs):
+    return {
+        "position": {"id": position_id, "companyId": 2001, "positionDescription": "Test", "version": 1},
+        "positionFAQs": faqs,
+        "positionInfo": []
+    }
+
+class StubLLM:
+    """Drafts an answer for every question ID in the prompt"""
+    
+    def __init__(self, fail_for=None):
+        self.prompts = []
+        self.fail_for = fail_for
+    
+    def invoke(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        if self.fail_for and self.fail_for in prompt:
+            raise RuntimeError("LLM unavailable")
+        questions = json.loads(prompt.split("using only the information above:")[1].split("If the information")[0])
+        response = MagicMock()
+        response.content = json.dumps({"answers": [{"id": q["id"], "response": f"Draft for {q['id']}"} for q in questions]})
+        response.usage_metadata = None
+        return response
+
+class TestBulkAnswer(unittest.TestCase):
+    """Test cases for the bulk answering pipeline"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.temp_dir.name, "checkpoint.json")
+        self.data_dir = os.path.join(self.temp_dir.name, "data")
+        os.makedirs(self.data_dir)
+        patcher = patch.object(file_db, "STATIC_FILES_DIR", self.data_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        file_db.save_company_data({"companyFAQs": [], "companyInfo": []}, 2001)
+        file_db.save_position_data(_position(1001, [
+            _faq(50001, 1001, "Is it hybrid?", "Yes", generated_by_user=False),
+            _faq(50002, 1001, "Is parking provided?"),
+            _faq(50003, 1001, "Is there relocation?"),
+            _faq(50004, 1001, "Is there a visa?")
+        ]), 1001)
+        file_db.save_position_data(_position(1002, [_faq(50001, 1002, "Is there on-call?")]), 1002)
+        file_db.save_position_data(_position(1003, [_faq(50001, 1003, "Answered?", "Yes")]), 1003)
+        
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        
+    def test_collect_unanswered_faqs(self):
+        """Test that only unanswered user-generated FAQs without drafts are collected"""
+        faqs = [
+            _faq(1, 1001, "A?"),
+            _faq(2, 1001, "B?", "Answered"),
+            _faq(3, 1001, "C?", generated_by_user=False),
+            dict(_faq(4, 1001, "D?"), draftResponse="Drafted")
+        ]
+        
+        self.assertEqual([faq["id"] for faq in collect_unanswered_faqs(_position(1001, faqs))], [1])
+        
+    def test_drafts_written_as_one_version_per_position(self):
+        """Test batching and that each position gets a single new version"""
+        stub = StubLLM()
+        with patch('src.workflow.workflow.llm', stub):
+            summary = run_bulk_answer(self.checkpoint, batch_size=2, concurrency=2)
+        
+        self.assertEqual(summary["positions"], 3)
+        self.assertEqual(summary["drafted"], 4)
+        self.assertEqual(summary["versions"], 2)
+        # Position 1001 has three questions in batches of two, 1002 has one, 1003 has none
+        self.assertEqual(len(stub.prompts), 3)
+        
+        versions = file_db.get_all_position_versions(1001)
+        self.assertEqual(len(versions), 2)
+        faqs = {faq["id"]: faq for faq in versions[0]["positionFAQs"]}
+        self.assertEqual(faqs[50002]["draftResponse"], "Draft for 50002")
+        self.assertIsNone(faqs[50002]["response"])
+        self.assertNotIn("draftResponse", faqs[50001])
+        self.assertEqual(len(file_db.get_all_position_versions(1003)), 1)
+        
+    def test_resume_after_interruption(self):
+        """Test that a failed position is retried and completed positions are skipped"""
+        with patch('src.workflow.workflow.llm', StubLLM(fail_for="Is there on-call?")):
+            first = run_bulk_answer(self.checkpoint, batch_size=10, concurrency=1)
+        
+        self.assertEqual(first["failed"], 1)
+        with open(self.checkpoint) as file:
+            self.assertEqual(json.load(file)["completed"], [1001, 1003])
+        
+        stub = StubLLM()
+        with patch('src.workflow.workflow.llm', stub):
+            second = run_bulk_answer(self.checkpoint, batch_size=10, concurrency=1)
+        
+        self.assertEqual(second["skipped"], 2)
+        self.assertEqual(second["positions"], 1)
+        self.assertEqual(second["drafted"], 1)
+        self.assertEqual(len(stub.prompts), 1)
+        self.assertEqual(len(file_db.get_all_position_versions(1001)), 2)
+        self.assertFalse(os.path.exists(self.checkpoint))
+        
+    def test_completed_run_removes_checkpoint(self):
+        """Test that a later run drafts answers for questions added after a completed run"""
+        with patch('src.workflow.workflow.llm', StubLLM()):
+            first = run_bulk_answer(self.checkpoint, batch_size=10, concurrency=1, limit=2)
+        
+        self.assertEqual(first["positions"], 2)
+        self.assertTrue(os.path.exists(self.checkpoint))
+        
+        with patch('src.workflow.workflow.llm', StubLLM()):
+            second = run_bulk_answer(self.checkpoint, batch_size=10, concurrency=1)
+        
+        self.assertEqual(second["skipped"], 2)
+        self.assertFalse(os.path.exists(self.checkpoint))
+        
+        position_data = file_db.get_position_data(1003)
+        position_data["positionFAQs"].append(_faq(9, 1003, "Is there a pension?"))
+        file_db.save_position_data(position_data, 1003)
+        
+        stub = StubLLM()
+        with patch('src.workflow.workflow.llm', stub):
+            third = run_bulk_answer(self.checkpoint, batch_size=10, concurrency=1)
+        
+        self.assertEqual(third["skipped"], 0)
+        self.assertEqual(third["positions"], 3)
+        self.assertEqual(third["drafted"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
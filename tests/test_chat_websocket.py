@@ -0,0 +1,190 @@
+"""
+Tests for the WebSocket chat channel and per-connection chat sessions
+"""
+
+import os
+import sys
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import file_db
+from src.handlers.chat_session import ChatSession
+from src.workflow.workflow import load_position_context, render_position_context, render_position_context_parts, render_faq_item
+from src.workflow.answer_cache import answer_cache
+from tests.helpers import use_temp_data_dir
+
+POSITION_DATA = {
+    "position": {"id": 1001, "companyId": 2001, "positionDescription": "Test position", "version": 1},
+    "positionFAQs": [
+        {"id": 50001, "positionId": 1001, "timesAsked": 1, "question": "Is this role hybrid?", "response": "Yes"}
+    ],
+    "positionInfo": []
+}
+
+def _llm_response(content):
+    response = MagicMock()
+    response.content = json.dumps(content)
+    return response
+
+class TestChatSession(unittest.TestCase):
+    """Test cases for chat session context reuse"""
+    
+    def setUp(self):
+        answer_cache.clear()
+        self.data_dir = use_temp_data_dir(self)
+        file_db.save_company_data({"companyFAQs": [], "companyInfo": []}, 2001)
+        file_db.save_position_data(json.loads(json.dumps(POSITION_DATA)), 1001)
+        
+    @patch('src.workflow.workflow.llm')
+    def test_context_reused_between_questions(self, mock_llm):
+        """Test that data is loaded and rendered once for several questions"""
+        mock_llm.invoke.return_value = _llm_response({"similar_question_id": None, "response": "Sydney."})
+        session = ChatSession()
+        
+        with patch('src.handlers.chat_session.load_position_context', wraps=load_position_context) as mock_load, \
+             patch('src.handlers.chat_session.render_position_context_parts', return_value=("CONTEXT", "")) as mock_render:
+            self.assertTrue(session.bind(1001)["success"])
+            first = session.ask("Where is the office?")
+            second = session.ask("Where exactly?")
+        
+        self.assertEqual(first["response"], "Sydney.")
+        self.assertTrue(second["success"])
+        mock_load.assert_called_once_with(1001)
+        mock_render.assert_called_once()
+        self.assertIn("CONTEXT", mock_llm.invoke.call_args[0][0])
+        
+    @patch('src.workflow.workflow.llm')
+    def test_reloads_when_version_changes(self, mock_llm):
+        """Test that a new version saved elsewhere is picked up"""
+        mock_llm.invoke.return_value = _llm_response({"similar_question_id": None, "response": "OK"})
+        session = ChatSession()
+        session.bind(1001)
+        
+        updated = file_db.get_position_data(1001)
+        updated["position"]["positionDescription"] = "Updated description"
+        file_db.save_position_data(updated, 1001)
+        session.ask("What is the role?")
+        
+        self.assertEqual(session.position_version, 2)
+        self.assertIn("Updated description", mock_llm.invoke.call_args[0][0])
+        
+    @patch('src.workflow.workflow.llm')
+    def test_bookkeeping_saved_without_reload(self, mock_llm):
+        """Test that FAQ bookkeeping is saved and tracked by the session"""
+        mock_llm.invoke.return_value = _llm_response({"similar_question_id": 50001, "response": "Yes"})
+        session = ChatSession()
+        session.bind(1001)
+        
+        session.ask("Is it hybrid?")
+        
+        self.assertEqual(session.position_version, 2)
+        self.assertEqual(file_db.get_position_data(1001)["positionFAQs"][0]["timesAsked"], 2)
+        self.assertEqual(session.position_data["positionFAQs"][0]["timesAsked"], 2)
+        
+    @patch('src.workflow.workflow.llm')
+    def test_bookkeeping_renders_only_changed_faqs(self, mock_llm):
+        """Test that the cached context is updated from the saved FAQs instead of rendered again"""
+        mock_llm.invoke.return_value = _llm_response({"similar_question_id": 50001, "response": "Yes"})
+        data = file_db.get_position_data(1001)
+        data["positionFAQs"].append({"id": 50002, "positionId": 1001, "timesAsked": 1,
+                                     "question": "Is there parking?", "response": "Yes"})
+        file_db.save_position_data(data, 1001)
+        session = ChatSession()
+        session.bind(1001)
+        
+        with patch('src.handlers.chat_session.render_position_context_parts',
+                   wraps=render_position_context_parts) as mock_parts, \
+             patch('src.handlers.chat_session.render_faq_item', wraps=render_faq_item) as mock_item:
+            session.ask("Is it hybrid?")
+            session.ask("Is it hybrid?")
+        
+        mock_parts.assert_called_once()
+        # Both FAQs for the first question, then only the one whose counter it changed
+        self.assertEqual([call.args[0]["id"] for call in mock_item.call_args_list], [50001, 50002, 50001])
+        self.assertEqual(session.position_version, 4)
+        self.assertEqual(session.context, render_position_context(session.position_data, session.company_data))
+        
+    @patch('src.workflow.workflow.llm')
+    def test_deleted_position_is_not_served_from_cache(self, mock_llm):
+        """Test that a session stops answering once its position can no longer be read"""
+        mock_llm.invoke.return_value = _llm_response({"similar_question_id": None, "response": "OK"})
+        session = ChatSession()
+        session.bind(1001)
+        for file_name in os.listdir(self.data_dir):
+            if file_name.startswith("example-data-pos-1001-"):
+                os.remove(os.path.join(self.data_dir, file_name))
+        file_db._index.invalidate()
+        
+        result = session.ask("What is the role?")
+        
+        self.assertFalse(result["success"])
+        self.assertIn("not found", result["error"])
+        self.assertIsNone(session.position_data)
+        mock_llm.invoke.assert_not_called()
+        
+    def test_ask_requires_binding(self):
+        """Test that a question before binding is rejected"""
+        result = ChatSession().ask("Hello?")
+        
+        self.assertFalse(result["success"])
+        self.assertIn("not bound", result["error"])
+
+class TestChatWebSocket(unittest.TestCase):
+    """Test cases for the WebSocket endpoint"""
+    
+    @patch('src.main.ChatSession')
+    def test_websocket_protocol(self, mock_session_class):
+        """Test binding, answering and error messages"""
+        from fastapi.testclient import TestClient
+        from src.main import app
+        
+        session = mock_session_class.return_value
+        session.bind.return_value = {"success": True, "positionId": 1001, "version": 3}
+        session.ask.return_value = {"success": True, "response": "Hybrid."}
+        session.position_id = 1001
+        
+        client = TestClient(app)
+        with client.websocket_connect("/v1/chat/ws") as websocket:
+            websocket.send_json({"positionId": 1001})
+            bound = websocket.receive_json()
+            websocket.send_json({"question": "Is it hybrid?"})
+            answer = websocket.receive_json()
+            websocket.send_text("not json")
+            invalid = websocket.receive_json()
+            websocket.send_json({"hello": "world"})
+            missing = websocket.receive_json()
+        
+        self.assertEqual(bound, {"type": "bound", "positionId": 1001, "version": 3})
+        self.assertEqual(answer, {"type": "answer", "question": "Is it hybrid?", "response": "Hybrid."})
+        self.assertEqual(invalid["type"], "error")
+        self.assertEqual(missing["type"], "error")
+        session.bind.assert_called_once_with(1001)
+        session.ask.assert_called_once_with("Is it hybrid?")
+        
+    @patch('src.main.ChatSession')
+    def test_websocket_questions_pass_admission_control(self, mock_session_class):
+        """Test that a shed question gets an error message and is not answered"""
+        from fastapi.testclient import TestClient
+        from src.main import app
+        from src.handlers.admission import AdmissionController
+        
+        session = mock_session_class.return_value
+        session.position_id = 1001
+        controller = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=1, retry_after=4)
+        controller.in_flight = 1
+        
+        with patch('src.main.admission_controller', controller):
+            with TestClient(app).websocket_connect("/v1/chat/ws") as websocket:
+                websocket.send_json({"question": "Is it hybrid?"})
+                rejected = websocket.receive_json()
+        
+        self.assertEqual(rejected["type"], "error")
+        self.assertEqual(rejected["retryAfter"], 4)
+        session.ask.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
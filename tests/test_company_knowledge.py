@@ -0,0 +1,104 @@
+"""
+Tests for reusing answered FAQs across the positions of a company
+"""
+
+import os
+import sys
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import file_db
+from src.database.search_index import search_index
+from src.workflow.answer_cache import answer_cache
+from src.workflow.company_knowledge import find_known_answer, question_similarity
+from src.workflow.workflow import process_input
+from tests.helpers import make_position, use_temp_data_dir
+
+class TestCompanyKnowledge(unittest.TestCase):
+    """Test cases for company-wide answer reuse"""
+
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        search_index.clear()
+        self.addCleanup(search_index.clear)
+        answer_cache.clear()
+
+        file_db.save_company_data({
+            "companyFAQs": [{"id": 70001, "question": "Do you sponsor visas?", "answer": "Yes, for senior roles."}],
+            "companyInfo": []
+        }, 2001)
+        file_db.save_position_data(make_position(2001, [
+            ("Is parking provided?", "Yes, free parking in the basement."),
+            ("Is the role remote?", None),
+        ]), 1001)
+        file_db.save_position_data(make_position(2001, [("Is the role hybrid?", "Two days in the office.")]), 1002)
+        file_db.save_position_data(make_position(2002, [("Is there a gym?", "Yes, on site.")]), 1003)
+
+    def test_question_similarity(self):
+        """Test that similarity ignores case, punctuation and stop words"""
+        self.assertEqual(question_similarity("Is PARKING provided?", "is parking provided"), 1.0)
+        self.assertEqual(question_similarity("Is parking provided?", "Is lunch provided?"), 1 / 3)
+        self.assertEqual(question_similarity("Is it?", "Parking"), 0.0)
+
+    def test_question_similarity_keeps_question_words_and_negations(self):
+        """Test that questions asking where instead of when, or who instead of how, don't match"""
+        self.assertEqual(question_similarity("When does the role start?", "when does the role start"), 1.0)
+        self.assertEqual(question_similarity("Where does the role start?", "When does the role start?"), 0.0)
+        self.assertEqual(question_similarity("Who do I report to?", "How do I report?"), 0.0)
+        self.assertLess(question_similarity("Is parking provided?", "Is parking not provided?"), 1.0)
+
+    def test_question_word_mismatch_is_not_reused(self):
+        """Test that an answer to a when question isn't served for a where question"""
+        file_db.save_position_data(make_position(2001, [("When does the role start?", "In March.")]), 1004)
+
+        self.assertEqual(find_known_answer("When does the role start?", 1002, 2001)["response"], "In March.")
+        self.assertIsNone(find_known_answer("Where does the role start?", 1002, 2001))
+
+    @patch('src.workflow.workflow.llm')
+    def test_sibling_position_answer_is_reused(self, mock_llm):
+        """Test that an answered FAQ of another position of the company is reused without the LLM"""
+        result = process_input("Is parking provided?", 1002)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["response"], "Yes, free parking in the basement.")
+        self.assertEqual(result["provenance"]["source"], "positionFAQ")
+        self.assertEqual(result["provenance"]["positionId"], 1001)
+        self.assertEqual(result["provenance"]["faqId"], 50001)
+        mock_llm.invoke.assert_not_called()
+
+    @patch('src.workflow.workflow.llm')
+    def test_same_position_match_counts_as_asked(self, mock_llm):
+        """Test that a match in the position's own FAQs increments timesAsked"""
+        result = process_input("Is the role hybrid", 1002)
+
+        self.assertEqual(result["response"], "Two days in the office.")
+        self.assertEqual(file_db.get_position_data(1002)["positionFAQs"][0]["timesAsked"], 2)
+        mock_llm.invoke.assert_not_called()
+
+    def test_company_faq_and_other_companies(self):
+        """Test that company FAQs are reused and other companies' FAQs are not"""
+        known_answer = find_known_answer("Do you sponsor visas?", 1002, 2001)
+
+        self.assertEqual(known_answer["provenance"]["source"], "companyFAQ")
+        self.assertIsNone(known_answer["similar_question_id"])
+        self.assertIsNone(find_known_answer("Is there a gym?", 1002, 2001))
+        self.assertIsNone(find_known_answer("Is the role remote?", 1002, 2001))
+
+    @patch('src.workflow.workflow.llm')
+    def test_dissimilar_questions_use_the_llm(self, mock_llm):
+        """Test that a loosely related question is still sent to the LLM"""
+        response = MagicMock()
+        response.content = json.dumps({"similar_question_id": None, "response": "Parking is shared with visitors."})
+        mock_llm.invoke.return_value = response
+
+        result = process_input("Is visitor parking provided for interviews?", 1002)
+
+        self.assertNotIn("provenance", result)
+        self.assertTrue(mock_llm.invoke.called)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Tests for ETag based conditional GET on the read endpoints
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.main import app
+from src.database import file_db
+from src.api.http_caching import etag_matches, make_etag
+from tests.helpers import use_temp_data_dir
+
+def _position(position_id, company_id, title="Engineer"):
+    return {
+        "position": {"id": position_id, "companyId": company_id, "positionTitle": title, "version": 1},
+        "positionFAQs": [],
+        "positionInfo": []
+    }
+
+class TestEtagHelpers(unittest.TestCase):
+    """Test cases for ETag helpers"""
+    
+    def test_etag_matches(self):
+        """Test If-None-Match comparison"""
+        etag = make_etag("position-versions", 1001, [1, 2])
+        
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches(f'"other", W/{etag}', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches('"other"', etag))
+        self.assertFalse(etag_matches(None, etag))
+        self.assertNotEqual(etag, make_etag("position-versions", 1001, [1, 2, 3]))
+
+class TestConditionalGet(unittest.TestCase):
+    """Test cases for conditional GET on company positions and position versions"""
+    
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        file_db.save_position_data(_position(1001, 2001), 1001)
+        file_db.save_position_data(_position(1002, 2001), 1002)
+        file_db.save_position_data(_position(1003, 2002), 1003)
+        self.client = TestClient(app)
+        
+    def test_company_positions_not_modified(self):
+        """Test that an unchanged company returns 304 without loading documents"""
+        first = self.client.get("/v1/company/2001/positions")
+        etag = first.headers["ETag"]
+        
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("must-revalidate", first.headers["Cache-Control"])
+        
+        with patch('src.main.get_company_positions_page') as mock_get_positions:
+            second = self.client.get("/v1/company/2001/positions", headers={"If-None-Match": etag})
+        
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers["ETag"], etag)
+        self.assertEqual(second.content, b"")
+        mock_get_positions.assert_not_called()
+        
+    def test_company_positions_etag_changes_on_save(self):
+        """Test that saving a new version of a position changes the company ETag"""
+        etag = self.client.get("/v1/company/2001/positions").headers["ETag"]
+        other_company_etag = self.client.get("/v1/company/2002/positions").headers["ETag"]
+        
+        file_db.save_position_data(_position(1002, 2001, "Senior Engineer"), 1002)
+        
+        response = self.client.get("/v1/company/2001/positions", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(self.client.get("/v1/company/2002/positions").headers["ETag"], other_company_etag)
+        
+    def test_company_positions_body_matches_etag(self):
+        """Test that a version saved after the ETag is computed is not served under it"""
+        get_versions = file_db.get_company_position_versions
+        
+        def versions_then_save(company_id):
+            versions = get_versions(company_id)
+            file_db.save_position_data(_position(1002, 2001, "Senior Engineer"), 1002)
+            return versions
+        
+        with patch('src.main.get_company_position_versions', side_effect=versions_then_save):
+            stale = self.client.get("/v1/company/2001/positions")
+        fresh = self.client.get("/v1/company/2001/positions")
+        
+        self.assertEqual([position["position"]["version"] for position in stale.json()["positions"]], [1, 1])
+        self.assertEqual([position["position"]["version"] for position in fresh.json()["positions"]], [1, 2])
+        self.assertNotEqual(stale.headers["ETag"], fresh.headers["ETag"])
+        
+    def test_position_versions_body_matches_etag(self):
+        """Test that a version saved after the version ETag is computed is not served under it"""
+        get_versions = file_db.get_version_numbers
+        
+        def versions_then_save(data_type, data_id):
+            versions = get_versions(data_type, data_id)
+            file_db.save_position_data(_position(1001, 2001, "Lead Engineer"), 1001)
+            return versions
+        
+        with patch('src.main.get_version_numbers', side_effect=versions_then_save):
+            stale = self.client.get("/v1/position/1001/versions")
+        fresh = self.client.get("/v1/position/1001/versions")
+        
+        self.assertEqual([version["position"]["version"] for version in stale.json()["versions"]], [1])
+        self.assertEqual([version["position"]["version"] for version in fresh.json()["versions"]], [2, 1])
+        self.assertNotEqual(stale.headers["ETag"], fresh.headers["ETag"])
+        
+    def test_position_versions_not_modified(self):
+        """Test conditional GET on the version history"""
+        etag = self.client.get("/v1/position/1001/versions").headers["ETag"]
+        
+        self.assertEqual(self.client.get("/v1/position/1001/versions", headers={"If-None-Match": etag}).status_code, 304)
+        
+        file_db.save_position_data(_position(1001, 2001, "Lead Engineer"), 1001)
+        
+        response = self.client.get("/v1/position/1001/versions", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["versions"]), 2)
+        
+    def test_missing_position_is_not_cached(self):
+        """Test that 404 responses are not answered with 304"""
+        response = self.client.get("/v1/position/9999/versions", headers={"If-None-Match": "*"})
+        
+        self.assertEqual(response.status_code, 404)
+
+class TestVersionIndex(unittest.TestCase):
+    """Test cases for the file version index"""
+    
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        
+    def test_index_picks_up_external_files(self):
+        """Test that files added by another process are found"""
+        file_db.save_position_data(_position(1001, 2001), 1001)
+        self.assertEqual(file_db.get_latest_version("pos", 1001), 1)
+        
+        with open(os.path.join(self.data_dir, "example-data-pos-1001-7.json"), "w") as file:
+            file.write('{"position": {"id": 1001, "companyId": 2002, "version": 7}}')
+        # Make sure the directory modification time changes even on coarse clocks
+        stat = os.stat(self.data_dir)
+        os.utime(self.data_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        
+        self.assertEqual(file_db.get_latest_version("pos", 1001), 7)
+        self.assertEqual(file_db.get_version_numbers("pos", 1001), [1, 7])
+        self.assertEqual(file_db.get_company_position_versions(2002), {1001: 7})
+        self.assertEqual(file_db._get_next_id("pos"), 1002)
+
+if __name__ == "__main__":
+    unittest.main()
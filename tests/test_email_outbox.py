@@ -0,0 +1,176 @@
+"""
+Tests for the hiring manager notification outbox
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import email_outbox as outbox_module
+from src.utils.email_outbox import EmailOutbox, FileTransport, make_transport, notify_question_added
+from src.database import file_db
+from src.workflow.workflow import ADDED_TO_QUESTION_LIST_MESSAGE, apply_faq_bookkeeping, save_faq_bookkeeping
+from tests.helpers import use_temp_data_dir
+
+class RecordingTransport:
+    """Transport that records messages and fails for chosen recipients"""
+
+    def __init__(self, failing=()):
+        self.messages = []
+        self.failing = set(failing)
+        self.lock = threading.Lock()
+
+    def send(self, message):
+        if message["To"] in self.failing:
+            raise ConnectionError("SMTP server unavailable")
+        with self.lock:
+            self.messages.append(message)
+
+class TestEmailOutbox(unittest.TestCase):
+    """Test cases for queueing, coalescing and sending digests"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.file_path = os.path.join(self.temp_dir.name, "outbox.sqlite3")
+        self.transport = RecordingTransport()
+        self.outbox = EmailOutbox(self.file_path, self.transport, concurrency=2, max_attempts=2)
+
+    def test_notifications_are_coalesced_per_recipient(self):
+        """Test that each recipient gets one digest listing their questions by position"""
+        self.outbox.enqueue("hm1@example.com", "Is parking provided?", 1001, "Engineer")
+        self.outbox.enqueue("hm2@example.com", "Is there a gym?", 1002, "Designer")
+        self.outbox.enqueue("hm1@example.com", "Is the role remote?", 1001, "Engineer")
+        self.outbox.enqueue("hm1@example.com", "Do you sponsor visas?", 1003, "Analyst")
+
+        self.assertEqual(self.outbox.flush(), 2)
+
+        messages = {message["To"]: message for message in self.transport.messages}
+        self.assertEqual(messages["hm1@example.com"]["Subject"], "3 new questions about your positions")
+        body = messages["hm1@example.com"].get_content()
+        self.assertIn("Engineer (position 1001):\n  - Is parking provided?\n  - Is the role remote?", body)
+        self.assertIn("Analyst (position 1003)", body)
+        self.assertEqual(messages["hm2@example.com"]["Subject"], "1 new question about your positions")
+        self.assertEqual(self.outbox.pending_count(), 0)
+        self.assertEqual(self.outbox.flush(), 0)
+
+    def test_queue_survives_restart(self):
+        """Test that queued notifications are sent by a new outbox on the same file"""
+        self.outbox.enqueue("hm1@example.com", "Is parking provided?", 1001, "Engineer")
+
+        restarted = EmailOutbox(self.file_path, self.transport)
+        self.assertEqual(restarted.pending_count(), 1)
+        self.assertEqual(restarted.flush(), 1)
+        self.assertEqual(self.outbox.flush(), 0)
+        self.assertEqual(len(self.transport.messages), 1)
+
+    def test_leased_digests_are_not_sent_twice(self):
+        """Test that a digest being sent by one outbox is skipped by another"""
+        self.outbox.enqueue("hm1@example.com", "Is parking provided?", 1001, "Engineer")
+        self.outbox._coalesce(1000.0)
+        self.assertEqual(len(self.outbox._lease(1000.0)), 1)
+
+        other = EmailOutbox(self.file_path, self.transport)
+        self.assertEqual(other.flush(now=1001.0), 0)
+        # Once the lease has expired the digest is retried, with the same Message-ID
+        self.assertEqual(other.flush(now=1000.0 + outbox_module.LEASE_SECONDS), 1)
+
+    def test_failed_sends_are_retried_then_given_up(self):
+        """Test retry with backoff and giving up after the maximum attempts"""
+        self.transport.failing.add("hm1@example.com")
+        self.outbox.enqueue("hm1@example.com", "Is parking provided?", 1001, "Engineer")
+
+        self.assertEqual(self.outbox.flush(now=1000.0), 0)
+        self.assertEqual(self.outbox.flush(now=1001.0), 0)
+        self.assertEqual(self.outbox.pending_count(), 1)
+
+        self.outbox.flush(now=1000.0 + outbox_module.RETRY_MAX_SECONDS)
+        self.assertEqual(self.outbox.pending_count(), 0)
+        self.assertEqual(self.transport.messages, [])
+
+    def test_file_transport(self):
+        """Test that the file transport writes one file per digest"""
+        directory = os.path.join(self.temp_dir.name, "sent")
+        outbox = EmailOutbox(self.file_path, FileTransport(directory))
+        outbox.enqueue("hm1@example.com", "Is parking provided?", 1001, "Engineer")
+        outbox.flush()
+
+        files = os.listdir(directory)
+        self.assertEqual(len(files), 1)
+        with open(os.path.join(directory, files[0]), "rb") as file:
+            self.assertIn(b"Is parking provided?", file.read())
+        with self.assertRaises(ValueError):
+            make_transport("carrier-pigeon")
+
+    def test_default_file_does_not_depend_on_working_directory(self):
+        package_dir = os.path.dirname(os.path.dirname(os.path.abspath(outbox_module.__file__)))
+        self.assertTrue(os.path.isabs(outbox_module.EMAIL_OUTBOX_FILE))
+        self.assertEqual(os.path.dirname(outbox_module.EMAIL_OUTBOX_FILE), package_dir)
+        self.assertEqual(EmailOutbox().file_path, outbox_module.EMAIL_OUTBOX_FILE)
+
+    def test_flush_without_queue_creates_no_file(self):
+        """Test that an outbox that never queued anything leaves no file behind"""
+        self.assertEqual(self.outbox.flush(), 0)
+        self.assertFalse(os.path.exists(self.file_path))
+
+class TestQuestionNotifications(unittest.TestCase):
+    """Test cases for notifying hiring managers of added questions"""
+
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        self.outbox = EmailOutbox(os.path.join(self.data_dir, "outbox.sqlite3"), RecordingTransport())
+        patcher = patch.object(outbox_module, "email_outbox", self.outbox)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        file_db.save_position_data({"position": {"positionTitle": "Engineer", "hiringManagerEmail": "hm@example.com"},
+                                    "positionFAQs": []}, 1001)
+
+    def add_question(self):
+        """Apply the bookkeeping of an unanswered question to the stored position"""
+        position_data = file_db.get_position_data(1001)
+        added_questions = []
+        llm_result = {"response": ADDED_TO_QUESTION_LIST_MESSAGE, "similar_question_id": None}
+        with patch('src.workflow.workflow.summarize_question', return_value="Is parking provided?"):
+            self.assertTrue(apply_faq_bookkeeping("is there parking??", llm_result, position_data, 1001, None,
+                                                  added_questions))
+        self.assertEqual(added_questions, ["Is parking provided?"])
+        return position_data, added_questions
+
+    def test_added_question_is_queued_once_saved(self):
+        """Test that a saved question is queued for the position's hiring manager"""
+        position_data, added_questions = self.add_question()
+        self.assertEqual(self.outbox.pending_count(), 0)
+
+        self.assertIsNotNone(save_faq_bookkeeping(position_data, 1001, added_questions))
+
+        self.assertEqual(self.outbox.pending_count(), 1)
+
+    def test_unsaved_question_is_not_queued(self):
+        """Test that no notification is queued when the save fails or the bookkeeping is dropped"""
+        position_data, added_questions = self.add_question()
+
+        with patch('src.workflow.workflow.update_position_data', side_effect=OSError("disk full")):
+            self.assertIsNone(save_faq_bookkeeping(position_data, 1001, added_questions))
+        file_db.save_position_data(file_db.get_position_data(1001), 1001)
+        with patch('src.workflow.workflow.get_position_data_version', return_value=None):
+            self.assertIsNotNone(save_faq_bookkeeping(position_data, 1001, added_questions))
+
+        self.assertEqual(self.outbox.pending_count(), 0)
+
+    def test_recipient_falls_back_to_setting(self):
+        """Test that positions without a hiring manager use HIRING_MANAGER_EMAIL, if set"""
+        position_data = {"position": {"positionTitle": "Engineer"}}
+
+        self.assertFalse(notify_question_added(position_data, 1001, "Is parking provided?"))
+        with patch.object(outbox_module, "HIRING_MANAGER_EMAIL", "hr@example.com"):
+            self.assertTrue(notify_question_added(position_data, 1001, "Is parking provided?"))
+        self.assertEqual(self.outbox.pending_count(), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Tests for the FAQ statistics aggregates and endpoints
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.main import app
+from src.database import file_db
+from src.database.faq_stats import faq_stats
+from tests.helpers import use_temp_data_dir
+
+def make_faq(faq_id, question, times_asked, response=None, timestamp="2025-08-24T10:00:00"):
+    return {"id": faq_id, "question": question, "response": response, "timesAsked": times_asked, "timestamp": timestamp}
+
+class TestFaqStats(unittest.TestCase):
+    """Test cases for FAQ statistics"""
+
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        faq_stats.clear()
+        self.addCleanup(faq_stats.clear)
+
+        file_db.save_position_data({
+            "position": {"companyId": 2001, "positionTitle": "Engineer"},
+            "positionFAQs": [
+                make_faq(50001, "Is parking provided?", 5),
+                make_faq(50002, "Is the role remote?", 3, "Hybrid."),
+                make_faq(50003, "Is there a gym?", 1),
+            ]
+        }, 1001)
+        file_db.save_position_data({
+            "position": {"companyId": 2001, "positionTitle": "Designer"},
+            "positionFAQs": [make_faq(50001, "Do you sponsor visas?", 4, timestamp="2025-08-25T09:00:00")]
+        }, 1002)
+        self.client = TestClient(app)
+
+    def test_position_stats(self):
+        """Test counts, ratio, top unanswered and asks per day of a position"""
+        stats = faq_stats.position_stats(1001)
+
+        self.assertEqual(stats["faqCount"], 3)
+        self.assertEqual((stats["answeredCount"], stats["unansweredCount"]), (1, 2))
+        self.assertEqual(stats["answeredRatio"], 0.3333)
+        self.assertEqual(stats["timesAsked"], 9)
+        self.assertEqual([item["id"] for item in stats["topUnanswered"]], [50001, 50003])
+        self.assertEqual(stats["askedPerDay"], {"2025-08-24": 9})
+        self.assertIsNone(faq_stats.position_stats(9999))
+
+    def test_company_stats_merge_positions(self):
+        """Test that company statistics combine the company's positions"""
+        stats = faq_stats.company_stats(2001, limit=2)
+
+        self.assertEqual(stats["positionCount"], 2)
+        self.assertEqual(stats["faqCount"], 4)
+        self.assertEqual([(item["positionId"], item["timesAsked"]) for item in stats["topUnanswered"]], [(1001, 5), (1002, 4)])
+        self.assertEqual(stats["askedPerDay"], {"2025-08-24": 9, "2025-08-25": 4})
+        self.assertIsNone(faq_stats.company_stats(2999))
+
+    def test_updates_reread_only_changed_positions(self):
+        """Test that an increment and an added FAQ update the aggregates incrementally"""
+        faq_stats.company_stats(2001)
+
+        def ask(data):
+            data["positionFAQs"][2]["timesAsked"] = 7
+            data["positionFAQs"][2]["timestamp"] = "2025-08-26T12:00:00"
+            data["positionFAQs"].append(make_faq(50004, "Is lunch provided?", 1, timestamp="2025-08-26T13:00:00"))
+        file_db.update_position_data(1001, ask)
+
+        with patch.object(file_db, "get_position_data", wraps=file_db.get_position_data) as get_position_data:
+            stats = faq_stats.company_stats(2001)
+            self.assertEqual(get_position_data.call_count, 1)
+        self.assertEqual(stats["topUnanswered"][0]["id"], 50003)
+        self.assertEqual(stats["unansweredCount"], 4)
+        self.assertEqual(stats["askedPerDay"]["2025-08-26"], 7)
+
+    def test_concurrent_saves_and_requests(self):
+        """Test that reading statistics while other threads save does not deadlock with the file index"""
+        errors = []
+
+        def save(times_asked):
+            try:
+                for _ in range(50):
+                    file_db.save_position_data({
+                        "position": {"companyId": 2001, "positionTitle": "Engineer"},
+                        "positionFAQs": [make_faq(50001, "Is parking provided?", times_asked)]
+                    }, 1001)
+            except Exception as e:
+                errors.append(e)
+
+        def read():
+            try:
+                for _ in range(200):
+                    faq_stats.position_stats(1001)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=save, args=(times_asked,), daemon=True) for times_asked in (6, 6)]
+        threads += [threading.Thread(target=read, daemon=True) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(errors, [])
+        self.assertEqual(faq_stats.position_stats(1001)["timesAsked"], 6)
+
+    def test_endpoints(self):
+        """Test the statistics endpoints and their validation"""
+        response = self.client.get("/v1/position/1001/faq-stats", params={"limit": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["topUnanswered"]), 1)
+
+        self.assertEqual(self.client.get("/v1/company/2001/faq-stats").json()["timesAsked"], 13)
+        self.assertEqual(self.client.get("/v1/company/2999/faq-stats").status_code, 404)
+        self.assertEqual(self.client.get("/v1/position/1001/faq-stats", params={"limit": 0}).status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,18 +5,22 @@ Tests for the file database interface
 import os
 import sys
 import json
+import tempfile
 import unittest
+from unittest.mock import patch
 from typing import Dict, Any
 
 # Add the parent directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from src.database import file_db
 from src.database.file_db import (
     get_company_data,
     get_position_data,
     save_company_data,
     save_position_data,
     _get_next_id,
+    iter_latest_position_data,
     _parse_file_info
 )
 
@@ -165,5 +169,17 @@ class TestFileDB(unittest.TestCase):
         self.assertEqual(updated_id, position_id)
         self.assertEqual(updated_version, 2)
 
+    def test_iter_latest_position_data(self):
+        """Test that the latest version of each position is streamed from the file index"""
+        with tempfile.TemporaryDirectory() as temp_dir, patch.object(file_db, "STATIC_FILES_DIR", temp_dir):
+            save_position_data({"position": {"companyId": 2001, "positionTitle": "Old"}}, 1001)
+            save_position_data({"position": {"companyId": 2001, "positionTitle": "New"}}, 1001)
+            save_position_data({"position": {"companyId": 2002, "positionTitle": "Designer"}}, 1002)
+            
+            with patch.object(file_db.glob, "glob", side_effect=AssertionError("directory listed")):
+                titles = [data["position"]["positionTitle"] for data in iter_latest_position_data()]
+        
+        self.assertEqual(titles, ["New", "Designer"])
+
 if __name__ == "__main__":
     unittest.main()
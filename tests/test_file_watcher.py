@@ -0,0 +1,138 @@
+"""
+Tests for the data directory watcher
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import file_db
+from src.database.file_watcher import InotifyWatcher, PollingWatcher
+from tests.helpers import use_temp_data_dir
+
+def write_position(directory, position_id, version, title):
+    """Write a position file the way external tooling would"""
+    data = {"position": {"id": position_id, "version": version, "companyId": 2001, "positionTitle": title}}
+    with open(os.path.join(directory, f"example-data-pos-{position_id}-{version}.json"), "w") as file:
+        json.dump(data, file)
+
+class TestWatchers(unittest.TestCase):
+    """Test cases for the inotify and polling watchers"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.events = []
+
+    def test_polling_reports_added_changed_and_removed_files(self):
+        """Test that a poll reports the differences since the previous scan"""
+        write_position(self.temp_dir.name, 1001, 1, "Engineer")
+        watcher = PollingWatcher(self.temp_dir.name, lambda name, exists: self.events.append((name, exists)))
+
+        write_position(self.temp_dir.name, 1001, 2, "Senior Engineer")
+        os.remove(os.path.join(self.temp_dir.name, "example-data-pos-1001-1.json"))
+        watcher.poll()
+
+        self.assertEqual(sorted(self.events), [("example-data-pos-1001-1.json", False), ("example-data-pos-1001-2.json", True)])
+
+    def test_inotify_reports_written_files(self):
+        """Test that inotify reports a file once it is closed after writing"""
+        reported = threading.Event()
+
+        def callback(name, exists):
+            self.events.append((name, exists))
+            reported.set()
+
+        try:
+            watcher = InotifyWatcher(self.temp_dir.name, callback).start()
+        except (OSError, AttributeError):
+            self.skipTest("inotify is not available")
+        self.addCleanup(watcher.stop)
+
+        write_position(self.temp_dir.name, 1001, 1, "Engineer")
+
+        self.assertTrue(reported.wait(5))
+        self.assertEqual(self.events[0], ("example-data-pos-1001-1.json", True))
+
+class TestWatchedFileDb(unittest.TestCase):
+    """Test cases for applying watcher reports to the file index"""
+
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        file_db.save_position_data({"position": {"companyId": 2001, "positionTitle": "Engineer"}}, 1001)
+
+        # Watch with a polling watcher that never polls; reports are applied by the tests
+        self.watcher = file_db.start_watching(mode="polling", interval=3600)
+        self.addCleanup(file_db.stop_watching, self.watcher)
+        self.changes = []
+        file_db.add_change_listener(self.record_change)
+        self.addCleanup(file_db.remove_change_listener, self.record_change)
+        file_db.get_position_summary(1001)
+
+    def record_change(self, data_type, data_id):
+        self.changes.append((data_type, data_id))
+
+    def test_external_files_are_applied_without_a_rescan(self):
+        """Test that a reported file updates only its entry"""
+        write_position(self.data_dir, 1001, 2, "Senior Engineer")
+
+        with patch.object(file_db.os, "scandir", side_effect=AssertionError("directory rescanned")):
+            file_db._index.apply_file_event("example-data-pos-1001-2.json", True)
+            self.assertEqual(file_db.get_latest_version("pos", 1001), 2)
+            self.assertEqual(file_db.get_position_summary(1001)["position"]["positionTitle"], "Senior Engineer")
+
+        self.assertEqual(self.changes, [("pos", 1001)])
+
+    def test_rewritten_versions_are_invalidated(self):
+        """Test that rewriting an existing version drops its cached summary"""
+        write_position(self.data_dir, 1001, 1, "Renamed")
+        file_db._index.apply_file_event("example-data-pos-1001-1.json", True)
+
+        self.assertEqual(file_db.get_position_summary(1001)["position"]["positionTitle"], "Renamed")
+
+    def test_removed_files_are_dropped(self):
+        """Test that a removed latest version is no longer served"""
+        file_db.save_position_data({"position": {"companyId": 2001, "positionTitle": "Lead"}}, 1001)
+        os.remove(os.path.join(self.data_dir, "example-data-pos-1001-2.json"))
+        file_db._index.apply_file_event("example-data-pos-1001-2.json", False)
+
+        self.assertEqual(file_db.get_version_numbers("pos", 1001), [1])
+        self.assertEqual(file_db.get_position_summary(1001)["position"]["positionTitle"], "Engineer")
+
+    def test_own_writes_are_ignored(self):
+        """Test that the watcher's report of a save through file_db is not applied twice"""
+        file_db.save_position_data({"position": {"companyId": 2001, "positionTitle": "Lead"}}, 1001)
+        file_db._index.apply_file_event("example-data-pos-1001-2.json", True)
+
+        with patch.object(file_db, "_read_json_file", side_effect=AssertionError("document read")):
+            self.assertEqual(file_db.get_position_summary(1001)["position"]["positionTitle"], "Lead")
+        self.assertEqual(self.changes, [("pos", 1001)])
+
+    def test_saves_replace_files_atomically(self):
+        """Test that a save writes a temporary file and renames it over the data file"""
+        with patch.object(file_db.os, "replace", wraps=os.replace) as replace:
+            file_db.save_position_data({"position": {"companyId": 2001, "positionTitle": "Lead"}}, 1001)
+
+        source, target = replace.call_args[0]
+        self.assertEqual(os.path.dirname(source), self.data_dir)
+        self.assertEqual(target, os.path.join(self.data_dir, "example-data-pos-1001-2.json"))
+        self.assertEqual(sorted(os.listdir(self.data_dir)),
+                         ["example-data-pos-1001-1.json", "example-data-pos-1001-2.json"])
+
+    def test_overflow_forces_a_rescan(self):
+        """Test that a report of missed changes rescans the directory"""
+        write_position(self.data_dir, 1002, 1, "Designer")
+        file_db._index.apply_file_event(None, False)
+
+        self.assertEqual(file_db.get_position_ids(), [1001, 1002])
+        self.assertIn(("pos", 1002), self.changes)
+
+if __name__ == "__main__":
+    unittest.main()
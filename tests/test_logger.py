@@ -0,0 +1,114 @@
+"""
+Tests for the logging pipeline
+"""
+
+import io
+import os
+import sys
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+import structlog
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import logger
+from src.utils.logger import (
+    EventSampler,
+    FieldTruncator,
+    QueueWriter,
+    configure_logging,
+    parse_level,
+    parse_sample_rates,
+)
+
+class TestLogSettings(unittest.TestCase):
+    def test_parse_level_accepts_names_and_numbers(self):
+        self.assertEqual(parse_level("INFO"), logging.INFO)
+        self.assertEqual(parse_level("debug"), logging.DEBUG)
+        self.assertEqual(parse_level("warn"), logging.WARNING)
+        self.assertEqual(parse_level("30"), logging.WARNING)
+        self.assertEqual(parse_level(40), logging.ERROR)
+        with self.assertRaises(ValueError):
+            parse_level("chatty")
+
+    def test_parse_sample_rates(self):
+        rates = parse_sample_rates("Request completed=0.1, Processing input=2,")
+        self.assertEqual(rates, {"Request completed": 0.1, "Processing input": 1.0})
+        self.assertEqual(parse_sample_rates(""), {})
+        with self.assertRaises(ValueError):
+            parse_sample_rates("Request completed")
+
+class TestProcessors(unittest.TestCase):
+    def test_sampler_drops_info_events_above_the_rate(self):
+        sampler = EventSampler({"Request completed": 0.25}, random_func=lambda: 0.5)
+        with self.assertRaises(structlog.DropEvent):
+            sampler(None, "info", {"event": "Request completed"})
+
+    def test_sampler_keeps_events_below_the_rate(self):
+        sampler = EventSampler({"Request completed": 0.25}, random_func=lambda: 0.1)
+        event = sampler(None, "info", {"event": "Request completed"})
+        self.assertEqual(event["sample_rate"], 0.25)
+
+    def test_sampler_never_drops_warnings_or_unlisted_events(self):
+        sampler = EventSampler({"Request completed": 0.0}, random_func=lambda: 0.5)
+        self.assertEqual(sampler(None, "warning", {"event": "Request completed"}), {"event": "Request completed"})
+        self.assertEqual(sampler(None, "info", {"event": "Other"}), {"event": "Other"})
+
+    def test_truncator_shortens_long_strings_and_payloads(self):
+        truncator = FieldTruncator(10)
+        event = truncator(None, "info", {
+            "event": "Parsed LLM response",
+            "question": "x" * 25,
+            "result": {"response": "y" * 40},
+            "position_id": 1,
+        })
+        self.assertEqual(event["question"], "x" * 10 + "...[15 more chars]")
+        self.assertTrue(event["result"].startswith('{"response'))
+        self.assertIn("more chars]", event["result"])
+        self.assertEqual(event["position_id"], 1)
+
+    def test_truncator_keeps_short_payloads_as_is(self):
+        truncator = FieldTruncator(100)
+        event = truncator(None, "info", {"event": "Workflow response", "result": {"response": "ok"}})
+        self.assertEqual(event["result"], {"response": "ok"})
+
+class TestQueueWriter(unittest.TestCase):
+    def test_writes_lines_from_the_background_thread(self):
+        output = io.StringIO()
+        writer = QueueWriter(max_size=10)
+        with patch("sys.stdout", output):
+            writer.write("first")
+            writer.write("second")
+            writer.flush()
+        self.assertEqual(output.getvalue(), "first\nsecond\n")
+
+    def test_drops_lines_when_the_queue_is_full(self):
+        writer = QueueWriter(max_size=1)
+        with patch.object(writer, "_ensure_started"):
+            writer.write("kept")
+            writer.write("dropped")
+        self.assertEqual(writer.dropped, 1)
+
+class TestConfigureLogging(unittest.TestCase):
+    def tearDown(self):
+        configure_logging()
+
+    def test_pipeline_filters_by_level_and_renders_json(self):
+        output = io.StringIO()
+        configure_logging(level="WARNING", sample_rates={}, max_field_length=5, use_queue=False)
+        with patch("sys.stdout", output):
+            logger.log.info("Processing input", question="hidden")
+            logger.log.warning("Shedding chat request", reason="queue_full")
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        event = json.loads(lines[0])
+        self.assertEqual(event["event"], "Shedd...[16 more chars]")
+        self.assertEqual(event["level"], "warning")
+        self.assertEqual(event["reason"], "queue...[5 more chars]")
+
+if __name__ == "__main__":
+    unittest.main()
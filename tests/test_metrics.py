@@ -0,0 +1,118 @@
+"""
+Tests for the in-process metrics and the /metrics endpoint
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    LLM_CALLS,
+    LLM_TOKENS,
+    CACHE_LOOKUPS,
+    FILE_DB_OPERATIONS,
+    record_cache_lookup,
+    render_metrics
+)
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for metric types and rendering"""
+    
+    def test_counter_and_gauge(self):
+        """Test counter and gauge arithmetic and rendering"""
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("test_total", "Test counter", ["route"]))
+        gauge = registry.register(Gauge("test_in_flight", "Test gauge"))
+        
+        counter.inc(route="/a")
+        counter.inc(2, route="/a")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        
+        self.assertEqual(counter.get(route="/a"), 3)
+        self.assertEqual(gauge.get(), 1)
+        rendered = registry.render()
+        self.assertIn("# TYPE test_total counter", rendered)
+        self.assertIn('test_total{route="/a"} 3', rendered)
+        self.assertIn("test_in_flight 1", rendered)
+        
+    def test_counter_rejects_wrong_labels(self):
+        """Test that label names are enforced"""
+        counter = Counter("test_labels_total", "Test counter", ["route"])
+        
+        with self.assertRaises(ValueError):
+            counter.inc(path="/a")
+        
+    def test_histogram_buckets(self):
+        """Test histogram buckets are cumulative"""
+        histogram = Histogram("test_seconds", "Test histogram", ["step"], buckets=(0.1, 1.0))
+        
+        histogram.observe(0.05, step="a")
+        histogram.observe(0.5, step="a")
+        histogram.observe(5.0, step="a")
+        
+        lines = histogram.render()
+        self.assertIn('test_seconds_bucket{step="a",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{step="a",le="1"} 2', lines)
+        self.assertIn('test_seconds_bucket{step="a",le="+Inf"} 3', lines)
+        self.assertIn('test_seconds_count{step="a"} 3', lines)
+        
+    def test_cache_hit_ratio(self):
+        """Test the derived cache hit ratio"""
+        record_cache_lookup("test_ratio_cache", True)
+        record_cache_lookup("test_ratio_cache", True)
+        record_cache_lookup("test_ratio_cache", False)
+        
+        self.assertIn('cache_hit_ratio{cache="test_ratio_cache"} 0.6666666666666666', render_metrics())
+
+class TestMetricsInstrumentation(unittest.TestCase):
+    """Test cases for metrics recorded by the application"""
+    
+    @patch('src.workflow.workflow.llm')
+    def test_llm_calls_and_tokens_recorded(self, mock_llm):
+        """Test that LLM calls record count and token usage per step"""
+        from src.workflow.workflow import identify_question_type
+        
+        mock_response = MagicMock()
+        mock_response.content = '{"is_question": true, "about_position": true, "about_company": false}'
+        mock_response.usage_metadata = {"input_tokens": 120, "output_tokens": 15}
+        mock_llm.invoke.return_value = mock_response
+        calls_before = LLM_CALLS.get(step="identify_question_type", outcome="success")
+        tokens_before = LLM_TOKENS.get(step="identify_question_type", direction="input")
+        
+        identify_question_type("Is this role remote?")
+        
+        self.assertEqual(LLM_CALLS.get(step="identify_question_type", outcome="success"), calls_before + 1)
+        self.assertEqual(LLM_TOKENS.get(step="identify_question_type", direction="input"), tokens_before + 120)
+        
+    def test_metrics_endpoint(self):
+        """Test that the endpoint exposes request and file_db metrics"""
+        from fastapi.testclient import TestClient
+        from src.main import app
+        
+        from src.database import file_db
+        
+        client = TestClient(app)
+        # Make sure the files are read from disk rather than the document cache
+        file_db._documents.clear()
+        reads_before = FILE_DB_OPERATIONS.get(operation="read")
+        client.get("/v1/position/1001/versions")
+        response = client.get("/metrics")
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertGreater(FILE_DB_OPERATIONS.get(operation="read"), reads_before)
+        self.assertIn('http_requests_total{method="GET",route="/v1/position/{position_id}/versions",status="200"}', response.text)
+        self.assertIn("http_requests_in_flight", response.text)
+
+if __name__ == "__main__":
+    unittest.main()
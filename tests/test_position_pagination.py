@@ -0,0 +1,106 @@
+"""
+Tests for pagination and summaries of company positions
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.main import app
+from src.database import file_db
+from tests.helpers import use_temp_data_dir
+
+def make_position(company_id, title, answered, unanswered):
+    """Build a position document with the given number of answered and unanswered FAQs"""
+    faqs = [{"id": 50000 + i, "question": f"Question {i}?", "response": "Yes" if i < answered else None}
+            for i in range(answered + unanswered)]
+    return {
+        "position": {"companyId": company_id, "positionTitle": title},
+        "positionFAQs": faqs,
+        "positionInfo": [{"id": 60001, "subject": "Team", "answer": "8 engineers"}]
+    }
+
+class TestPositionPagination(unittest.TestCase):
+    """Test cases for limit/cursor pagination and summary mode"""
+    
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        for position_id in (1001, 1002, 1003, 1004, 1005):
+            file_db.save_position_data(make_position(2001, f"Role {position_id}", 1, 2), position_id)
+        file_db.save_position_data(make_position(2002, "Other company", 0, 1), 1006)
+        self.client = TestClient(app)
+        
+    def position_ids(self, response):
+        return [item["position"]["id"] for item in response.json()["positions"]]
+        
+    def test_pages_follow_cursor(self):
+        """Test walking all pages in position ID order"""
+        first = self.client.get("/v1/company/2001/positions?limit=2")
+        second = self.client.get(f"/v1/company/2001/positions?limit=2&cursor={first.json()['nextCursor']}")
+        last = self.client.get(f"/v1/company/2001/positions?limit=2&cursor={second.json()['nextCursor']}")
+        
+        self.assertEqual(self.position_ids(first), [1001, 1002])
+        self.assertEqual(self.position_ids(second), [1003, 1004])
+        self.assertEqual(self.position_ids(last), [1005])
+        self.assertIsNone(last.json()["nextCursor"])
+        self.assertIn("positionFAQs", first.json()["positions"][0])
+        
+    def test_summary_mode_reads_no_documents(self):
+        """Test that summaries contain metadata and counts and are served without reading files"""
+        file_db.save_position_data(make_position(2001, "Role 1003 updated", 2, 0), 1003)
+        
+        with patch.object(file_db, "_read_json_file", side_effect=AssertionError("document read")):
+            response = self.client.get("/v1/company/2001/positions?summary=true&limit=3")
+        
+        positions = response.json()["positions"]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p["position"]["id"] for p in positions], [1001, 1002, 1003])
+        self.assertNotIn("positionFAQs", positions[0])
+        self.assertEqual(positions[0]["faqCount"], 3)
+        self.assertEqual(positions[0]["answeredFaqCount"], 1)
+        self.assertEqual(positions[0]["infoCount"], 1)
+        self.assertEqual(positions[2]["position"]["positionTitle"], "Role 1003 updated")
+        self.assertEqual(positions[2]["position"]["version"], 2)
+        
+    def test_summary_built_lazily_from_existing_files(self):
+        """Test that summaries are built from files written by another process"""
+        file_db._index._position_summaries.clear()
+        
+        summary = file_db.get_position_summary(1006)
+        
+        self.assertEqual(summary["position"]["companyId"], 2002)
+        self.assertEqual(summary["faqCount"], 1)
+        self.assertEqual(summary["answeredFaqCount"], 0)
+        
+    def test_unpaginated_response_unchanged(self):
+        """Test that requests without paging parameters return all positions without a cursor"""
+        response = self.client.get("/v1/company/2001/positions")
+        
+        self.assertEqual(sorted(self.position_ids(response)), [1001, 1002, 1003, 1004, 1005])
+        self.assertNotIn("nextCursor", response.json())
+        
+    def test_invalid_parameters(self):
+        """Test rejection of invalid limits and cursors"""
+        self.assertEqual(self.client.get("/v1/company/2001/positions?limit=0").status_code, 400)
+        self.assertEqual(self.client.get("/v1/company/2001/positions?limit=1000").status_code, 400)
+        self.assertEqual(self.client.get("/v1/company/2001/positions?cursor=abc").status_code, 400)
+        self.assertEqual(self.client.get("/v1/company/2001/positions?cursor=²").status_code, 400)
+        self.assertEqual(self.client.get("/v1/company/2001/positions?cursor=٣").status_code, 400)
+        
+    def test_page_past_end_and_unknown_company(self):
+        """Test an empty page for an existing company and 404 for an unknown company"""
+        past_end = self.client.get("/v1/company/2001/positions?limit=2&cursor=1005")
+        unknown = self.client.get("/v1/company/9999/positions?summary=true")
+        
+        self.assertEqual(past_end.status_code, 200)
+        self.assertEqual(past_end.json(), {"positions": [], "nextCursor": None})
+        self.assertEqual(unknown.status_code, 404)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+"""
+Tests for partial position updates and atomic saves
+"""
+
+import os
+import sys
+import copy
+import threading
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.main import app
+from src.database import file_db
+from src.workflow.workflow import save_faq_bookkeeping, increment_faq_times_asked
+from tests.helpers import use_temp_data_dir
+
+POSITION_DATA = {
+    "position": {"id": 1001, "companyId": 2001, "positionTitle": "Engineer", "version": 1},
+    "positionFAQs": [
+        {"id": 50001, "positionId": 1001, "timesAsked": 3, "question": "Hybrid?", "response": "Yes",
+         "version": 1, "timestamp": "2025-01-01T00:00:00"},
+        {"id": 50002, "positionId": 1001, "timesAsked": 1, "question": "Parking?", "response": None,
+         "version": 1, "timestamp": "2025-01-01T00:00:00"}
+    ],
+    "positionInfo": [
+        {"id": 60001, "positionId": 1001, "subject": "Team", "answer": "8 engineers", "version": 1,
+         "timestamp": "2025-01-01T00:00:00"}
+    ]
+}
+
+class TestPositionPatch(unittest.TestCase):
+    """Test cases for the PATCH position details endpoint"""
+    
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        file_db.save_position_data(copy.deepcopy(POSITION_DATA), 1001)
+        self.client = TestClient(app)
+        
+    def faqs(self):
+        return {faq["id"]: faq for faq in file_db.get_position_data(1001)["positionFAQs"]}
+        
+    def test_item_upserts(self):
+        """Test updating one FAQ and adding an info item by ID"""
+        response = self.client.patch("/v1/position/1001/details", headers={"If-Match": '"1"'}, json={
+            "positionFAQs": [{"id": 50002, "response": "Free parking on site."}],
+            "positionInfo": [{"subject": "Stack", "answer": "React and Node"}]
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["version"], 2)
+        self.assertEqual(response.headers["ETag"], '"2"')
+        data = file_db.get_position_data(1001)
+        faqs = self.faqs()
+        self.assertEqual(faqs[50002]["response"], "Free parking on site.")
+        self.assertEqual(faqs[50002]["version"], 2)
+        self.assertEqual(faqs[50002]["timesAsked"], 1)
+        self.assertEqual(faqs[50001], POSITION_DATA["positionFAQs"][0])
+        self.assertEqual(data["positionInfo"][1]["id"], 60002)
+        self.assertEqual(data["positionInfo"][1]["positionId"], 1001)
+        self.assertEqual(data["position"]["positionTitle"], "Engineer")
+        
+    def test_json_patch(self):
+        """Test applying an RFC 6902 JSON Patch"""
+        response = self.client.patch(
+            "/v1/position/1001/details",
+            headers={"Content-Type": "application/json-patch+json"},
+            content='[{"op": "test", "path": "/positionFAQs/1/id", "value": 50002},'
+                    ' {"op": "replace", "path": "/positionFAQs/1/response", "value": "No parking."},'
+                    ' {"op": "replace", "path": "/position/positionTitle", "value": "Senior Engineer"},'
+                    ' {"op": "replace", "path": "/position/id", "value": 7}]'
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        data = file_db.get_position_data(1001)
+        self.assertEqual(data["position"]["positionTitle"], "Senior Engineer")
+        self.assertEqual(data["position"]["id"], 1001)
+        self.assertEqual(self.faqs()[50002]["response"], "No parking.")
+        
+    def test_failed_json_patch_test_returns_conflict(self):
+        """Test that a failed test operation writes nothing"""
+        response = self.client.patch("/v1/position/1001/details", json=[
+            {"op": "test", "path": "/positionFAQs/1/response", "value": "Something else"},
+            {"op": "remove", "path": "/positionFAQs/1"}
+        ])
+        
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(file_db.get_version_numbers("pos", 1001), [1])
+        
+    def test_version_precondition(self):
+        """Test that a stale If-Match version is rejected"""
+        file_db.save_position_data(copy.deepcopy(POSITION_DATA), 1001)
+        
+        response = self.client.patch("/v1/position/1001/details", headers={"If-Match": '"1"'},
+                                     json={"position": {"positionTitle": "Stale"}})
+        
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response.json()["currentVersion"], 2)
+        self.assertEqual(file_db.get_version_numbers("pos", 1001), [1, 2])
+        
+    def test_versions_etag_as_precondition(self):
+        """Test that the ETag of the versions endpoint is accepted in If-Match"""
+        etag = self.client.get("/v1/position/1001/versions").headers["ETag"]
+        projected_etag = self.client.get("/v1/position/1001/versions", params={"fields": "position"}).headers["ETag"]
+        
+        response = self.client.patch("/v1/position/1001/details", headers={"If-Match": etag},
+                                     json={"position": {"positionTitle": "Current"}})
+        stale = self.client.patch("/v1/position/1001/details", headers={"If-Match": projected_etag},
+                                  json={"position": {"positionTitle": "Stale"}})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], self.client.get("/v1/position/1001/versions").headers["ETag"])
+        self.assertEqual(stale.status_code, 412)
+        
+    def test_invalid_requests(self):
+        """Test malformed bodies, preconditions and unknown positions"""
+        bad_patch = self.client.patch("/v1/position/1001/details", json=[{"op": "bogus", "path": "/position"}])
+        bad_header = self.client.patch("/v1/position/1001/details", headers={"If-Match": "abc"}, json={})
+        bad_items = self.client.patch("/v1/position/1001/details", json={"positionFAQs": "not a list"})
+        unknown = self.client.patch("/v1/position/9999/details", json={"position": {"positionTitle": "X"}})
+        
+        self.assertEqual(bad_patch.status_code, 400)
+        self.assertEqual(bad_header.status_code, 400)
+        self.assertEqual(bad_items.status_code, 400)
+        self.assertEqual(unknown.status_code, 404)
+
+    def test_put_uses_the_same_precondition_and_atomic_save(self):
+        """Test that PUT checks If-Match and replaces details under the position's lock"""
+        details = {"position": {"companyId": 2001, "positionTitle": "Lead"}}
+        
+        with patch('src.main.update_position_data', wraps=file_db.update_position_data) as update:
+            response = self.client.put("/v1/position/1001/details", headers={"If-Match": '"1"'}, json=details)
+        stale = self.client.put("/v1/position/1001/details", headers={"If-Match": '"1"'}, json=details)
+        unknown = self.client.put("/v1/position/9999/details", json=details)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], '"2"')
+        self.assertEqual(update.call_args[0][2], 1)
+        self.assertEqual(stale.status_code, 412)
+        self.assertEqual(unknown.status_code, 404)
+        latest = file_db.get_position_data(1001)
+        self.assertEqual(latest["position"]["positionTitle"], "Lead")
+        self.assertEqual(latest["positionFAQs"], file_db.get_position_data_version(1001, 1)["positionFAQs"])
+
+class TestAtomicPositionUpdates(unittest.TestCase):
+    """Test cases for atomic updates and FAQ bookkeeping saves"""
+    
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        file_db.save_position_data(copy.deepcopy(POSITION_DATA), 1001)
+        
+    def test_concurrent_updates_are_serialized(self):
+        """Test that concurrent increments are neither lost nor written to the same version"""
+        def increment():
+            for _ in range(5):
+                file_db.update_position_data(1001, lambda data: increment_faq_times_asked(data, 50001))
+        
+        threads = [threading.Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(file_db.get_version_numbers("pos", 1001), list(range(1, 22)))
+        self.assertEqual(file_db.get_position_data(1001)["positionFAQs"][0]["timesAsked"], 23)
+        
+    def test_bookkeeping_is_rebased_onto_newer_version(self):
+        """Test that bookkeeping on stale data keeps an HR edit saved in the meantime"""
+        stale = file_db.get_position_data(1001)
+        increment_faq_times_asked(stale, 50001)
+        stale["positionFAQs"].append({"id": 50003, "positionId": 1001, "timesAsked": 1,
+                                      "question": "Visa sponsorship?", "response": None})
+        
+        edited = file_db.get_position_data(1001)
+        edited["positionFAQs"][1]["response"] = "Free parking."
+        edited["positionFAQs"].append({"id": 50003, "positionId": 1001, "timesAsked": 0,
+                                       "question": "Salary?", "response": "Competitive."})
+        file_db.save_position_data(edited, 1001)
+        
+        version = save_faq_bookkeeping(stale, 1001)
+        
+        self.assertEqual(version, 3)
+        faqs = {faq["id"]: faq for faq in file_db.get_position_data(1001)["positionFAQs"]}
+        self.assertEqual(faqs[50001]["timesAsked"], 4)
+        self.assertEqual(faqs[50002]["response"], "Free parking.")
+        self.assertEqual(faqs[50003]["question"], "Salary?")
+        self.assertEqual(faqs[50004]["question"], "Visa sponsorship?")
+
+if __name__ == "__main__":
+    unittest.main()
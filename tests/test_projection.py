@@ -0,0 +1,103 @@
+"""
+Tests for field projection and response compression on list endpoints
+"""
+
+import os
+import sys
+import unittest
+
+from fastapi.testclient import TestClient
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.main import app
+from src.database import file_db
+from src.api.projection import parse_fields, canonical_fields, project
+from tests.helpers import use_temp_data_dir
+
+DOCUMENT = {
+    "position": {"id": 1001, "companyId": 2001, "positionTitle": "Engineer", "version": 2},
+    "positionFAQs": [
+        {"id": 50001, "question": "Hybrid?", "response": "Yes"},
+        {"id": 50002, "question": "Parking?", "response": None}
+    ],
+    "positionInfo": [{"id": 60001, "subject": "Team", "answer": "8 engineers"}]
+}
+
+class TestProjection(unittest.TestCase):
+    """Test cases for field projection"""
+    
+    def test_project_nested_fields(self):
+        """Test projecting nested fields and list items"""
+        tree = parse_fields("position.id, position.version,positionFAQs.question")
+        
+        self.assertEqual(project([DOCUMENT], tree), [{
+            "position": {"id": 1001, "version": 2},
+            "positionFAQs": [{"question": "Hybrid?"}, {"question": "Parking?"}]
+        }])
+        
+    def test_whole_value_and_missing_fields(self):
+        """Test that a parent path selects the whole value and unknown fields are skipped"""
+        tree = parse_fields("positionInfo,positionInfo.subject,position.unknown")
+        
+        self.assertEqual(project(DOCUMENT, tree), {"positionInfo": DOCUMENT["positionInfo"], "position": {}})
+        
+    def test_no_projection(self):
+        """Test that an empty fields parameter returns the value unchanged"""
+        self.assertIsNone(parse_fields(None))
+        self.assertIsNone(parse_fields("  "))
+        self.assertIs(project(DOCUMENT, None), DOCUMENT)
+        
+    def test_invalid_field_path(self):
+        """Test that malformed field paths are rejected"""
+        for fields in ("position..id", "position.id,", "position[0]"):
+            with self.assertRaises(ValueError):
+                parse_fields(fields)
+        
+    def test_canonical_fields(self):
+        """Test that equivalent field lists produce the same canonical form"""
+        self.assertEqual(
+            canonical_fields(parse_fields("position.version,position.id")),
+            canonical_fields(parse_fields("position.id,position.version"))
+        )
+
+class TestProjectionEndpoints(unittest.TestCase):
+    """Test cases for projection and compression on the endpoints"""
+    
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        document = dict(DOCUMENT, positionFAQs=[
+            {"id": 50001 + i, "question": f"Question {i}?", "response": "An answer " * 10} for i in range(50)
+        ])
+        file_db.save_position_data(document, 1001)
+        self.client = TestClient(app)
+        
+    def test_company_positions_fields(self):
+        """Test the fields parameter on the company positions endpoint"""
+        response = self.client.get("/v1/company/2001/positions?fields=position.id,position.positionTitle")
+        full = self.client.get("/v1/company/2001/positions")
+        
+        self.assertEqual(response.json(), {"positions": [{"position": {"id": 1001, "positionTitle": "Engineer"}}]})
+        self.assertNotEqual(response.headers["ETag"], full.headers["ETag"])
+        
+    def test_position_versions_fields_and_invalid(self):
+        """Test the fields parameter on the versions endpoint and rejection of bad paths"""
+        response = self.client.get("/v1/position/1001/versions?fields=position.version")
+        invalid = self.client.get("/v1/position/1001/versions?fields=position..version")
+        
+        self.assertEqual(response.json(), {"versions": [{"position": {"version": 1}}]})
+        self.assertEqual(invalid.status_code, 400)
+        
+    def test_large_responses_are_compressed(self):
+        """Test gzip compression above the size threshold only"""
+        large = self.client.get("/v1/position/1001/versions", headers={"Accept-Encoding": "gzip"})
+        small = self.client.get("/v1/position/1001/versions?fields=position.id", headers={"Accept-Encoding": "gzip"})
+        
+        self.assertEqual(large.headers.get("Content-Encoding"), "gzip")
+        self.assertIn("ETag", large.headers)
+        self.assertEqual(large.json()["versions"][0]["position"]["id"], 1001)
+        self.assertIsNone(small.headers.get("Content-Encoding"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for the local question type classifier
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import file_db
+from src.workflow.question_classifier import (
+    question_classifier, NaiveBayesClassifier, load_faq_examples, load_labelled_examples
+)
+from src.workflow.workflow import process_legacy_input
+
+class TestQuestionClassifier(unittest.TestCase):
+    """Test cases for local classification and the LLM fallback"""
+
+    def setUp(self):
+        question_classifier.train(examples=[])
+        self.addCleanup(question_classifier.reset)
+
+    def test_naive_bayes_probabilities(self):
+        """Test that the model prefers the class whose words a text shares"""
+        model = NaiveBayesClassifier().fit([("parking office", "a"), ("salary bonus", "b")])
+
+        probabilities = model.predict_proba("where is the parking")
+        self.assertGreater(probabilities["a"], probabilities["b"])
+        self.assertAlmostEqual(sum(probabilities.values()), 1.0)
+        self.assertIsNone(model.predict_proba("unknown words"))
+
+    def test_small_talk_is_handled_by_rules(self):
+        """Test that greetings and thanks are never sent to the LLM"""
+        for text in ("hello", "Thanks!", "ok, cheers", "   "):
+            self.assertFalse(question_classifier.classify(text)["is_question"], text)
+
+    def test_confident_questions(self):
+        """Test that clear position and company questions are classified locally"""
+        self.assertTrue(question_classifier.classify("What skills are needed for a Software Engineer position?")["about_position"])
+        self.assertTrue(question_classifier.classify("How many employees does the company have?")["about_company"])
+
+    def test_uncertain_inputs_are_left_to_the_llm(self):
+        """Test that unknown or ambiguous inputs are not classified locally"""
+        self.assertIsNone(question_classifier.classify("asdf qwer"))
+        self.assertIsNone(question_classifier.classify("Is parking available?"))
+
+    @patch('src.workflow.workflow.llm')
+    def test_legacy_workflow_skips_the_llm_for_small_talk(self, mock_llm):
+        """Test that the legacy workflow answers small talk without an LLM call"""
+        result = process_legacy_input("Hello there")
+
+        self.assertIn("I can answer questions", result["response"])
+        mock_llm.invoke.assert_not_called()
+
+    @patch('src.workflow.workflow.llm')
+    def test_legacy_workflow_falls_back_to_the_llm(self, mock_llm):
+        """Test that an uncertain input is classified by the LLM"""
+        response = MagicMock()
+        response.content = '{"is_question": true, "about_position": false, "about_company": false}'
+        mock_llm.invoke.return_value = response
+
+        result = process_legacy_input("asdf qwer?")
+
+        self.assertIn("I can only answer questions", result["response"])
+        mock_llm.invoke.assert_called_once()
+
+class TestTrainingExamples(unittest.TestCase):
+    """Test cases for loading training examples"""
+
+    def test_faq_examples(self):
+        """Test that stored FAQs are labelled by where they are stored"""
+        with tempfile.TemporaryDirectory() as temp_dir, patch.object(file_db, "STATIC_FILES_DIR", temp_dir):
+            file_db.save_position_data({"position": {"companyId": 2001},
+                                        "positionFAQs": [{"id": 50001, "question": "Is parking provided?"}]}, 1001)
+            file_db.save_company_data({"companyFAQs": [{"id": 70001, "question": "Do you sponsor visas?"}]}, 2001)
+
+            self.assertEqual(load_faq_examples(), [("Is parking provided?", "position"), ("Do you sponsor visas?", "company")])
+
+    def test_labelled_examples(self):
+        """Test that logged classifications are converted to classes"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "examples.jsonl")
+            with open(file_path, "w") as file:
+                file.write(json.dumps({"input": "hey you", "is_question": False}) + "\n\n")
+                file.write(json.dumps({"input": "Who is the CEO?", "is_question": True, "about_company": True}) + "\n")
+                file.write(json.dumps({"input": "Is it sunny?", "is_question": True}) + "\n")
+
+            self.assertEqual(load_labelled_examples(file_path),
+                             [("hey you", "chitchat"), ("Who is the CEO?", "company"), ("Is it sunny?", "off_topic")])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Tests for near-duplicate question detection
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.workflow.question_matching import (
+    question_key, is_same_question, minhash_signature, signature_similarity, find_duplicate_question
+)
+from src.workflow.workflow import add_question_to_faqs, apply_faq_bookkeeping, PASSED_TO_HIRING_MANAGER_RESPONSE
+
+FAQS = [
+    {"id": 50001, "question": "Is this role hybrid or fully on-site?", "response": "Hybrid.", "timesAsked": 3},
+    {"id": 50002, "question": "Is parking provided for this role's office?", "response": None, "timesAsked": 1},
+    {"id": 50003, "question": "What is the policy on relocation?", "response": None, "timesAsked": 2},
+]
+
+class TestDuplicateDetection(unittest.TestCase):
+    """Test cases for question keys and MinHash similarity"""
+
+    def test_question_key_ignores_order_stop_words_and_plurals(self):
+        """Test that rewordings with the same content words share a key"""
+        self.assertEqual(question_key("Is parking provided for this role?"), question_key("Parking: is it provided??"))
+        self.assertEqual(question_key("Do you sponsor visas?"), question_key("do you sponsor a visa"))
+        self.assertEqual(question_key("Is it?"), "")
+
+    def test_question_key_keeps_question_words(self):
+        """Test that questions asking how and who don't share a key"""
+        self.assertEqual(question_key("How do I report?"), "how report")
+        self.assertNotEqual(question_key("How do I report?"), question_key("Who do I report to?"))
+        self.assertTrue(is_same_question("What's the relocation policy", "What is the policy on relocation?"))
+        self.assertFalse(is_same_question("Where is the office?", "When is the office open?"))
+        self.assertFalse(is_same_question("Is it?", "Is it?"))
+
+    def test_signature_similarity_estimates_overlap(self):
+        """Test that similar questions have similar signatures and different ones don't"""
+        parking = minhash_signature("Is parking provided at the main office building?")
+
+        self.assertEqual(len(parking), 128)
+        self.assertGreater(signature_similarity(
+            parking, minhash_signature("Is parking provided at the main office building today?")), 0.7)
+        self.assertLess(signature_similarity(parking, minhash_signature("Is lunch provided?")), 0.4)
+        self.assertEqual(signature_similarity(parking, minhash_signature("the")), 0.0)
+
+    def test_find_duplicate_question(self):
+        """Test exact key matches, near duplicates and distinct questions"""
+        self.assertEqual(find_duplicate_question("is there parking provided at the office?", FAQS)["id"], 50002)
+        self.assertEqual(find_duplicate_question("What's the relocation policy", FAQS)["id"], 50003)
+        self.assertIsNone(find_duplicate_question("What is the policy on travel?", FAQS))
+        self.assertIsNone(find_duplicate_question("Is this role remote?", FAQS))
+
+    def test_questions_differing_in_one_word_are_not_merged(self):
+        """Test that questions asking about a different thing are kept apart"""
+        faqs = [{"id": 50001, "question": "Who do I report to?", "response": "The team lead."},
+                {"id": 50002, "question": "Is the start date flexible?", "response": "Yes."}]
+
+        self.assertIsNone(find_duplicate_question("How do I report a bug?", faqs))
+        self.assertIsNone(find_duplicate_question("Is the end date flexible?", faqs))
+        self.assertIsNone(find_duplicate_question("Where does the role start?",
+                                                  [{"id": 50003, "question": "When does the role start?"}]))
+
+class TestAddQuestionDeduplication(unittest.TestCase):
+    """Test cases for merging duplicates when adding questions"""
+
+    def position_data(self):
+        return {"position": {"companyId": 2001}, "positionFAQs": [dict(faq) for faq in FAQS]}
+
+    @patch('src.workflow.workflow.summarize_question')
+    def test_duplicate_is_merged_without_summarizing(self, mock_summarize):
+        """Test that a reworded question increments the existing FAQ"""
+        position_data = add_question_to_faqs("Is there parking provided at the office for this job?",
+                                             self.position_data(), 1001)
+
+        self.assertEqual(len(position_data["positionFAQs"]), 3)
+        self.assertEqual(position_data["positionFAQs"][1]["timesAsked"], 2)
+        mock_summarize.assert_not_called()
+
+    @patch('src.workflow.workflow.summarize_question', return_value="What is the policy on relocation?")
+    def test_summary_matching_an_faq_is_merged(self, mock_summarize):
+        """Test that a question whose summary matches an FAQ increments it"""
+        position_data = add_question_to_faqs("Hi, I'd need to move cities, would you help with that?",
+                                             self.position_data(), 1001)
+
+        self.assertEqual(len(position_data["positionFAQs"]), 3)
+        self.assertEqual(position_data["positionFAQs"][2]["timesAsked"], 3)
+
+    @patch('src.workflow.workflow.summarize_question', return_value="Is there a gym on site?")
+    def test_new_question_is_added(self, mock_summarize):
+        """Test that a distinct question is still added as a new FAQ"""
+        position_data = add_question_to_faqs("is there a gym??", self.position_data(), 1001)
+
+        self.assertEqual(position_data["positionFAQs"][-1]["id"], 50004)
+        self.assertEqual(position_data["positionFAQs"][-1]["question"], "Is there a gym on site?")
+        mock_summarize.assert_called_once()
+
+class TestMergedQuestionResponse(unittest.TestCase):
+    """Test cases for the reply to a question merged into an existing FAQ"""
+
+    ADDED = {"similar_question_id": None,
+             "response": "This question has been added to the question list for the Hiring Manager."}
+
+    def position_data(self):
+        return {"position": {"companyId": 2001}, "positionFAQs": [dict(faq) for faq in FAQS]}
+
+    @patch('src.workflow.workflow.summarize_question')
+    def test_merged_into_answered_faq_returns_its_answer(self, mock_summarize):
+        """Test that the user gets the existing answer instead of being told the question was added"""
+        llm_result = dict(self.ADDED)
+        added_questions = []
+
+        changed = apply_faq_bookkeeping("Is the role hybrid or fully on-site??", llm_result, self.position_data(),
+                                        1001, 2001, added_questions)
+
+        self.assertTrue(changed)
+        self.assertEqual(llm_result["response"], "Hybrid.")
+        self.assertEqual(added_questions, [])
+
+    @patch('src.workflow.workflow.summarize_question')
+    def test_merged_into_unanswered_faq_is_passed_on(self, mock_summarize):
+        """Test that a question merged into an unanswered FAQ is reported as passed on"""
+        llm_result = dict(self.ADDED)
+
+        apply_faq_bookkeeping("Is there parking provided at the office?", llm_result, self.position_data(), 1001, 2001)
+
+        self.assertEqual(llm_result["response"], PASSED_TO_HIRING_MANAGER_RESPONSE)
+
+    @patch('src.workflow.workflow.summarize_question')
+    def test_approximate_match_is_passed_on(self, mock_summarize):
+        """Test that a question only approximately matching an answered FAQ doesn't get its answer"""
+        position_data = {"position": {"companyId": 2001}, "positionFAQs": [
+            {"id": 50001, "question": "Is the relocation package paid in full before the start date?",
+             "response": "Yes, in full.", "timesAsked": 1}]}
+        llm_result = dict(self.ADDED)
+
+        apply_faq_bookkeeping("Is the relocation package paid in full before the start date or after?",
+                              llm_result, position_data, 1001, 2001)
+
+        self.assertEqual(llm_result["response"], PASSED_TO_HIRING_MANAGER_RESPONSE)
+        self.assertEqual(position_data["positionFAQs"][0]["timesAsked"], 2)
+        mock_summarize.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for the FAQ search index and endpoint
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.main import app
+from src.database import file_db
+from src.database.search_index import _Snapshot, search_index, tokenize
+from tests.helpers import make_position, use_temp_data_dir
+
+class TestSearchIndex(unittest.TestCase):
+    """Test cases for indexing and ranking"""
+
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        search_index.clear()
+        self.addCleanup(search_index.clear)
+
+        file_db.save_company_data({
+            "companyFAQs": [{"id": 70001, "question": "Do you sponsor visas?", "answer": "Yes, for senior roles."}],
+            "companyInfo": [{"id": 80001, "subject": "Relocation", "answer": "We cover relocation costs."}]
+        }, 2001)
+        file_db.save_position_data(make_position(2001, [
+            ("Is parking provided?", None),
+            ("Is the role remote?", "Hybrid, two days in the office."),
+        ], [("Office", "Brisbane office with parking for bikes and cars, showers and lockers on level two.")]), 1001)
+        file_db.save_position_data(make_position(2002, [("Is parking available?", "Yes, free parking.")]), 1002)
+        self.client = TestClient(app)
+
+    def result_keys(self, results):
+        return [(result["type"], result["positionId"], result["id"]) for result in results]
+
+    def test_tokenize_drops_stop_words_and_punctuation(self):
+        """Test that search terms are normalized"""
+        self.assertEqual(tokenize("Is PARKING provided?"), ["parking", "provided"])
+        self.assertEqual(tokenize("Visas and policies"), ["visa", "policy"])
+
+    def test_bm25_ranks_focused_items_first(self):
+        """Test that short items mentioning the term outrank long ones"""
+        results = search_index.search("parking")
+
+        self.assertEqual(set(self.result_keys(results)[:2]), {("positionFAQ", 1001, 50001), ("positionFAQ", 1002, 50001)})
+        self.assertEqual(results[-1]["type"], "positionInfo")
+        self.assertGreater(results[0]["score"], results[-1]["score"])
+
+    def test_filters(self):
+        """Test the company, position and answered filters"""
+        self.assertEqual(self.result_keys(search_index.search("parking", company_id=2002)), [("positionFAQ", 1002, 50001)])
+        self.assertEqual(len(search_index.search("parking", position_id=1001)), 2)
+        self.assertNotIn(("positionFAQ", 1001, 50001), self.result_keys(search_index.search("parking", answered_only=True)))
+        self.assertEqual(search_index.search("relocation", company_id=2001)[0]["type"], "companyInfo")
+
+    def test_saves_update_only_the_changed_entry(self):
+        """Test that a save re-indexes just the saved position"""
+        search_index.search("parking")
+        file_db.save_position_data(make_position(2001, [("Is there a gym?", "Yes, on site.")]), 1001)
+
+        with patch.object(file_db, "get_position_data", wraps=file_db.get_position_data) as get_position_data:
+            results = search_index.search("parking")
+            self.assertEqual(get_position_data.call_count, 1)
+        self.assertEqual(self.result_keys(results), [("positionFAQ", 1002, 50001)])
+        self.assertEqual(search_index.search("gym")[0]["answer"], "Yes, on site.")
+
+    def test_refresh_copies_only_changed_postings(self):
+        """Test that a refreshed snapshot shares unchanged postings and leaves its base unchanged"""
+        base = _Snapshot()
+        base.add_entry("pos", 1001, make_position(2001, [("Is parking provided?", "Yes, in the basement.")]))
+        base.add_entry("pos", 1002, make_position(2001, [("Is there a gym?", "Yes, on site.")]))
+
+        refreshed = _Snapshot(base)
+        refreshed.remove_entry(("pos", 1001))
+        refreshed.add_entry("pos", 1001, make_position(2001, [("Is parking free?", "Yes, in the basement.")]))
+
+        self.assertIs(refreshed.postings["gym"], base.postings["gym"])
+        self.assertIsNot(refreshed.postings["basement"], base.postings["basement"])
+        self.assertIn("provided", base.postings)
+        self.assertNotIn("provided", refreshed.postings)
+        self.assertIn("free", refreshed.postings)
+        self.assertNotIn("free", base.postings)
+        self.assertEqual(refreshed.total_length, base.total_length)
+
+    def test_concurrent_saves_and_searches(self):
+        """Test that searching while other threads save does not deadlock with the file index"""
+        errors = []
+
+        def save(position_id):
+            try:
+                for i in range(20):
+                    file_db.save_position_data(make_position(2001, [(f"Is parking provided {i}?", "Yes.")]), position_id)
+            except Exception as e:
+                errors.append(e)
+
+        def search():
+            try:
+                for _ in range(50):
+                    search_index.search("parking")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=save, args=(position_id,), daemon=True) for position_id in (1001, 1002)]
+        threads += [threading.Thread(target=search, daemon=True) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(errors, [])
+        self.assertEqual(search_index.search("parking 19", position_id=1001)[0]["question"], "Is parking provided 19?")
+
+    def test_endpoint(self):
+        """Test the search endpoint and its validation"""
+        response = self.client.get("/v1/search", params={"q": "visa", "companyId": 2001})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["question"], "Do you sponsor visas?")
+        self.assertEqual(self.client.get("/v1/search", params={"q": " "}).status_code, 400)
+        self.assertEqual(self.client.get("/v1/search", params={"q": "parking", "limit": 0}).status_code, 400)
+        self.assertEqual(self.client.get("/v1/search", params={"q": "the"}).json()["results"], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Tests for the store shared by worker processes
+"""
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import file_db
+from src.database.shared_store import SharedStore
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+class TestSharedStore(unittest.TestCase):
+    """Test cases for the change log and document slots"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, "api.store")
+        self.store = SharedStore(self.path, log_entries=4, doc_slots=8, slot_bytes=64)
+        self.addCleanup(self.store.close)
+
+    def test_changes_are_read_in_order(self):
+        """Test that published changes are returned after the caller's sequence number"""
+        self.store.publish("pos", 1001, 2, directory_mtime=10)
+        self.store.publish("com", 2001, 3, directory_mtime=11)
+
+        changes, sequence = self.store.changes_since(0)
+        self.assertEqual(changes, [("pos", 1001, 2), ("com", 2001, 3)])
+        self.assertEqual(sequence, 2)
+        self.assertEqual(self.store.changes_since(2), ([], 2))
+        self.assertEqual(self.store.directory_mtime(), 11)
+
+    def test_overwritten_changes_are_reported(self):
+        """Test that a reader that fell behind the ring is told to rescan"""
+        for version in range(1, 7):
+            self.store.publish("pos", 1001, version, directory_mtime=version)
+
+        changes, sequence = self.store.changes_since(1)
+        self.assertIsNone(changes)
+        self.assertEqual(sequence, 6)
+        self.assertEqual(len(self.store.changes_since(3)[0]), 3)
+
+    def test_documents_are_matched_by_version(self):
+        """Test that a slot only serves the version it holds"""
+        self.store.publish("pos", 1001, 2, directory_mtime=1, raw=b'{"a": 1}')
+
+        self.assertEqual(self.store.get_document("pos", 1001, 2), b'{"a": 1}')
+        self.assertIsNone(self.store.get_document("pos", 1001, 1))
+        self.assertIsNone(self.store.get_document("com", 1001, 2))
+        self.assertFalse(self.store.put_document("pos", 1002, 1, b"x" * 65))
+        self.assertIsNone(self.store.get_document("pos", 1002, 1))
+
+    def test_attaching_reuses_the_existing_store(self):
+        """Test that a second worker sees the first worker's changes and sizes"""
+        self.store.publish("pos", 1001, 2, directory_mtime=1, raw=b"{}")
+        other = SharedStore(self.path, log_entries=100, doc_slots=100, slot_bytes=100)
+        self.addCleanup(other.close)
+
+        self.assertEqual(other.log_entries, 4)
+        self.assertEqual(other.changes_since(0)[0], [("pos", 1001, 2)])
+        self.assertEqual(other.get_document("pos", 1001, 2), b"{}")
+
+class TestMultiWorkerFileDb(unittest.TestCase):
+    """Test cases for file_db in multi-worker mode"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.data_dir = os.path.join(self.temp_dir.name, "data")
+        os.mkdir(self.data_dir)
+        self.store_path = os.path.join(self.temp_dir.name, "api.store")
+        self.store = SharedStore(self.store_path)
+        self.addCleanup(self.store.close)
+        patchers = [
+            patch.object(file_db, "STATIC_FILES_DIR", self.data_dir),
+            patch.object(file_db, "_shared_store", self.store),
+            patch.object(file_db, "_entry_locks", {}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        file_db.save_position_data({"position": {"companyId": 2001, "positionTitle": "Engineer"}}, 1001)
+
+    def save_from_other_worker(self, version, title):
+        """Write a version the way another worker would, without touching this worker's index"""
+        data = {"position": {"id": 1001, "version": version, "companyId": 2001, "positionTitle": title}}
+        raw = json.dumps(data).encode()
+        with open(os.path.join(self.data_dir, f"example-data-pos-1001-{version}.json"), "wb") as file:
+            file.write(raw)
+        other = SharedStore(self.store_path)
+        other.publish("pos", 1001, version, os.stat(self.data_dir).st_mtime_ns, raw)
+        other.close()
+
+    def test_other_worker_saves_are_applied_without_a_rescan(self):
+        """Test that the index follows the change log instead of rescanning the directory"""
+        self.save_from_other_worker(2, "Senior Engineer")
+
+        with patch.object(file_db.os, "scandir", side_effect=AssertionError("directory rescanned")), \
+             patch.object(file_db, "_read_raw_file", side_effect=AssertionError("file read")):
+            self.assertEqual(file_db.get_latest_version("pos", 1001), 2)
+            self.assertEqual(file_db.get_position_data(1001)["position"]["positionTitle"], "Senior Engineer")
+            self.assertEqual(file_db.get_position_summary(1001)["position"]["version"], 2)
+
+    def test_watcher_reports_of_other_worker_saves_are_ignored(self):
+        """Test that a save already applied from the change log is not invalidated again by the watcher"""
+        watcher = file_db.start_watching(mode="polling", interval=3600)
+        self.addCleanup(file_db.stop_watching, watcher)
+        file_db.get_position_ids()
+        self.save_from_other_worker(2, "Senior Engineer")
+        self.assertEqual(file_db.get_latest_version("pos", 1001), 2)
+        changes = []
+        def record_change(data_type, data_id):
+            changes.append((data_type, data_id))
+        file_db.add_change_listener(record_change)
+        self.addCleanup(file_db.remove_change_listener, record_change)
+
+        with patch.object(self.store, "discard_document", side_effect=AssertionError("document discarded")):
+            file_db._index.apply_file_event("example-data-pos-1001-2.json", True)
+
+        self.assertEqual(changes, [])
+        self.assertIsNotNone(self.store.get_document("pos", 1001, 2))
+
+    def test_saves_are_published(self):
+        """Test that a save is visible to other workers through the store"""
+        file_db.save_position_data({"position": {"companyId": 2001, "positionTitle": "Lead"}}, 1001)
+
+        changes, _ = self.store.changes_since(0)
+        self.assertEqual(changes[-1], ("pos", 1001, 2))
+        self.assertEqual(json.loads(self.store.get_document("pos", 1001, 2))["position"]["positionTitle"], "Lead")
+
+    def test_concurrent_workers_do_not_lose_updates(self):
+        """Test that saves from several processes get distinct, consecutive versions"""
+        script = (
+            "import sys\n"
+            "from src.database import file_db\n"
+            "file_db.STATIC_FILES_DIR = sys.argv[1]\n"
+            "def bump(data):\n"
+            "    data['position']['counter'] = data['position'].get('counter', 0) + 1\n"
+            "for _ in range(15):\n"
+            "    file_db.update_position_data(1001, bump)\n"
+        )
+        env = dict(os.environ, SHARED_STORE_PATH=self.store_path, LOG_ASYNC="false", LOGGING_LEVEL="WARNING")
+        workers = [subprocess.Popen([sys.executable, "-c", script, self.data_dir], cwd=ROOT_DIR, env=env)
+                   for _ in range(3)]
+        for worker in workers:
+            self.assertEqual(worker.wait(timeout=60), 0)
+
+        self.assertEqual(file_db.get_version_numbers("pos", 1001), list(range(1, 47)))
+        self.assertEqual(file_db.get_position_data(1001)["position"]["counter"], 45)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests for lazy startup and settings
+"""
+
+import os
+import sys
+import subprocess
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import Settings
+from src.llms.llm import LazyLLM
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+class TestStartup(unittest.TestCase):
+    """Test cases for lazy startup"""
+    
+    def test_main_does_not_import_llm_libraries(self):
+        """Test that importing the app leaves the LLM client libraries unloaded"""
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, src.main; print(sorted(m for m in ('langchain_anthropic', 'anthropic') if m in sys.modules))"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "[]")
+        self.assertNotIn("Logging level", result.stdout)
+        
+    def test_lazy_llm_creates_client_once(self):
+        """Test that the client is created on first use and reused"""
+        client = MagicMock()
+        lazy_llm = LazyLLM()
+        
+        with patch("langchain_anthropic.ChatAnthropic", return_value=client) as mock_chat_anthropic:
+            self.assertFalse(lazy_llm.initialized)
+            lazy_llm.invoke("first")
+            lazy_llm.invoke("second")
+        
+        mock_chat_anthropic.assert_called_once()
+        self.assertTrue(lazy_llm.initialized)
+        self.assertEqual(client.invoke.call_count, 2)
+        
+    def test_settings_from_env(self):
+        """Test that settings are read from the environment with defaults"""
+        with patch.dict(os.environ, {"MAX_BATCH_QUESTIONS": "7", "SERVER_TIMING_ENABLED": "TRUE"}), \
+             patch("src.config.load_dotenv"):
+            os.environ.pop("GZIP_MINIMUM_SIZE", None)
+            os.environ.pop("USAGE_STATS_FILE", None)
+            settings = Settings.from_env()
+        
+        self.assertEqual(settings.max_batch_questions, 7)
+        self.assertTrue(settings.server_timing_enabled)
+        self.assertEqual(settings.gzip_minimum_size, 1024)
+        self.assertEqual(settings.usage_stats_file, "")
+
+if __name__ == "__main__":
+    unittest.main()
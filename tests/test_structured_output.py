@@ -0,0 +1,130 @@
+"""
+Tests for schema-validated LLM output
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.llms.structured_output import (
+    find_json_object, parse_structured, invoke_structured, QuestionAnswer, QuestionType, StructuredOutputError
+)
+from src.utils.metrics import LLM_PARSE_FAILURES
+from src.workflow.workflow import process_question_with_llm, identify_question_type, apply_faq_bookkeeping, LLM_FAILURE_RESPONSE
+
+def message(content):
+    response = MagicMock()
+    response.content = content
+    return response
+
+class TestParsing(unittest.TestCase):
+    """Test cases for locating and validating JSON objects"""
+
+    def test_find_json_object_stops_at_the_end_of_the_object(self):
+        """Test that text and braces around the object are ignored"""
+        text = 'Sure {see below}:\n```json\n{"response": "Yes {really}", "similar_question_id": null}\n```\nAlso {"other": 1}'
+
+        self.assertEqual(find_json_object(text), {"response": "Yes {really}", "similar_question_id": None})
+        self.assertIsNone(find_json_object("no object here"))
+
+    def test_parse_structured_validates_the_schema(self):
+        """Test type coercion, missing fields and plain text"""
+        self.assertTrue(parse_structured('{"is_question": "true"}', QuestionType).is_question)
+        with self.assertRaises(StructuredOutputError) as context:
+            parse_structured('{"similar_question_id": "abc", "response": "Yes"}', QuestionAnswer)
+        self.assertIn("similar_question_id", str(context.exception))
+        with self.assertRaises(StructuredOutputError):
+            parse_structured("I think it is a question", QuestionType)
+        with self.assertRaises(StructuredOutputError):
+            parse_structured("Hybrid, two days a week.", QuestionAnswer)
+
+class TestRepair(unittest.TestCase):
+    """Test cases for the repair attempt"""
+
+    def test_invalid_response_is_repaired_once(self):
+        """Test that an invalid response is followed by one repair call"""
+        invoke = MagicMock(side_effect=[message('{"about_position": true}'), message('{"is_question": true, "about_position": true}')])
+        failures_before = LLM_PARSE_FAILURES.get(step="test_step", attempt="first")
+
+        result = invoke_structured(invoke, "test_step", "prompt", QuestionType)
+
+        self.assertTrue(result.about_position)
+        self.assertEqual(invoke.call_args_list[1][0][0], "test_step_repair")
+        self.assertIn("is_question", invoke.call_args_list[1][0][1])
+        self.assertEqual(LLM_PARSE_FAILURES.get(step="test_step", attempt="first"), failures_before + 1)
+
+    def test_failed_repair_raises(self):
+        """Test that a second invalid response is not retried again"""
+        invoke = MagicMock(return_value=message("{broken"))
+        failures_before = LLM_PARSE_FAILURES.get(step="test_step", attempt="repair")
+
+        with self.assertRaises(StructuredOutputError):
+            invoke_structured(invoke, "test_step", "prompt", QuestionType)
+        self.assertEqual(invoke.call_count, 2)
+        self.assertEqual(LLM_PARSE_FAILURES.get(step="test_step", attempt="repair"), failures_before + 1)
+
+class TestWorkflowParsing(unittest.TestCase):
+    """Test cases for structured output in the workflow"""
+
+    @patch('src.workflow.workflow.llm')
+    def test_unrepairable_answer_returns_the_failure_response(self, mock_llm):
+        """Test that an answer that stays invalid after the repair is reported as a failure"""
+        mock_llm.invoke.return_value = message('{"similar_question_id": "x"}')
+
+        result = process_question_with_llm("Is it remote?", {"position": {}}, {})
+
+        self.assertEqual(result["response"], LLM_FAILURE_RESPONSE)
+        self.assertEqual(mock_llm.invoke.call_count, 2)
+
+    def test_plain_text_fallback_is_opt_in(self):
+        """Test that prose is only returned, marked as unstructured, when the caller opts in"""
+        invoke = MagicMock(return_value=message("It is fully remote."))
+
+        with self.assertRaises(StructuredOutputError):
+            invoke_structured(invoke, "test_step", "prompt", QuestionAnswer)
+        answer = invoke_structured(invoke, "test_step", "prompt", QuestionAnswer, plain_text_fallback=True)
+
+        self.assertEqual(answer.response, "It is fully remote.")
+        self.assertTrue(answer.unstructured)
+        self.assertNotIn("unstructured", answer.model_dump())
+        # Two calls without the fallback, then the prose is used without a repair
+        self.assertEqual(invoke.call_count, 3)
+
+    def test_broken_json_is_not_used_as_plain_text(self):
+        """Test that a response with broken JSON is repaired and raises even with the fallback"""
+        invoke = MagicMock(return_value=message('{"response": "Yes'))
+
+        with self.assertRaises(StructuredOutputError):
+            invoke_structured(invoke, "test_step", "prompt", QuestionAnswer, plain_text_fallback=True)
+        self.assertEqual(invoke.call_count, 2)
+
+    @patch('src.workflow.workflow.llm')
+    def test_unrepaired_plain_text_answer_skips_bookkeeping(self, mock_llm):
+        """Test that a prose answer is shown as is but does not change the FAQs"""
+        mock_llm.invoke.return_value = message("This question has been added to the question list for the Hiring Manager.")
+        position_data = {"position": {}, "positionFAQs": []}
+
+        result = process_question_with_llm("Is it remote?", position_data, {})
+
+        self.assertTrue(result["unstructured"])
+        self.assertIn("added to the question list", result["response"])
+        self.assertFalse(apply_faq_bookkeeping("Is it remote?", result, position_data, 1001, 2001))
+        self.assertEqual(position_data["positionFAQs"], [])
+
+    @patch('src.workflow.workflow.llm')
+    def test_question_type_after_repair(self, mock_llm):
+        """Test that the question type step uses the repaired response"""
+        mock_llm.invoke.side_effect = [
+            message('```json\n{"is_question": yes}\n```'),
+            message('{"is_question": true, "about_position": false, "about_company": true}')
+        ]
+
+        self.assertEqual(identify_question_type("What is the culture like at Google?"),
+                         {"is_question": True, "about_position": False, "about_company": True})
+
+if __name__ == "__main__":
+    unittest.main()
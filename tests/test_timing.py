@@ -0,0 +1,93 @@
+"""
+Tests for request-scoped timing spans
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.timing import (
+    start_request,
+    end_request,
+    get_request_id,
+    get_spans,
+    span,
+    timed,
+    summarize_spans,
+    server_timing_header
+)
+
+class TestTiming(unittest.TestCase):
+    """Test cases for timing spans"""
+    
+    def tearDown(self):
+        end_request()
+    
+    def test_spans_recorded_in_request_context(self):
+        """Test that spans are collected for the current request"""
+        request_id = start_request("test-request")
+        
+        with span("position_read"):
+            pass
+        with span("llm_call"):
+            pass
+        
+        self.assertEqual(request_id, "test-request")
+        self.assertEqual(get_request_id(), "test-request")
+        self.assertEqual([name for name, _ in get_spans()], ["position_read", "llm_call"])
+        
+    def test_spans_ignored_outside_request(self):
+        """Test that spans outside a request context are not collected"""
+        with span("orphan"):
+            pass
+        
+        self.assertEqual(get_spans(), [])
+        
+    def test_timed_decorator(self):
+        """Test that the decorator records a span and returns the result"""
+        @timed("file_db.example")
+        def example(value):
+            return value * 2
+        
+        start_request()
+        self.assertEqual(example(21), 42)
+        self.assertEqual(get_spans()[0][0], "file_db.example")
+        
+    def test_span_recorded_on_exception(self):
+        """Test that a span is recorded even if the block raises"""
+        start_request()
+        with self.assertRaises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+        
+        self.assertEqual(get_spans()[0][0], "failing")
+        
+    def test_server_timing_header(self):
+        """Test aggregation of repeated spans into the header"""
+        spans = [("save", 1.0), ("llm_call", 10.25), ("save", 2.0)]
+        
+        self.assertEqual(summarize_spans(spans), {"save": 3.0, "llm_call": 10.25})
+        self.assertEqual(server_timing_header(spans), "save;dur=3.0, llm_call;dur=10.2")
+
+class TestRequestTimingMiddleware(unittest.TestCase):
+    """Test cases for the request timing middleware"""
+    
+    def test_request_id_and_server_timing_headers(self):
+        """Test that responses carry the request ID and Server-Timing header"""
+        from fastapi.testclient import TestClient
+        from src.main import app
+        
+        client = TestClient(app)
+        with patch('src.main.SERVER_TIMING_ENABLED', True):
+            response = client.get("/v1/position/1001/versions", headers={"X-Request-ID": "abc123"})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-Request-ID"], "abc123")
+        self.assertIn("file_db.get_all_position_versions;dur=", response.headers["Server-Timing"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for LLM token and cost accounting
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.usage import UsageTracker, usage_scope
+
+class TestUsageTracker(unittest.TestCase):
+    """Test cases for the usage tracker"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "usage.json")
+        
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        
+    def _tracker(self, persist_interval=3600):
+        return UsageTracker(self.file_path, persist_interval, input_cost_per_mtok=1.0, output_cost_per_mtok=2.0)
+        
+    def test_aggregates_by_step_position_and_company(self):
+        """Test usage is attributed to the current scope"""
+        tracker = self._tracker()
+        
+        with usage_scope(1001, 2001):
+            tracker.record("answer_question", 1000, 100)
+            tracker.record("summarize_question", 50, 10)
+        with usage_scope(1002, 2001):
+            tracker.record("answer_question", 3000, 200)
+        
+        self.assertEqual(tracker.summary()["input_tokens"], 4050)
+        self.assertEqual(tracker.summary()["calls"], 3)
+        
+        positions = tracker.top("position")
+        self.assertEqual(positions[0]["key"], "1002")
+        self.assertEqual(positions[1]["input_tokens"], 1050)
+        self.assertEqual(tracker.top("company")[0]["calls"], 3)
+        
+        steps = {entry["key"]: entry for entry in tracker.top("step")}
+        self.assertEqual(steps["answer_question"]["avg_input_tokens"], 2000.0)
+        self.assertAlmostEqual(steps["answer_question"]["cost_usd"], (4000 * 1.0 + 300 * 2.0) / 1_000_000)
+        
+    def test_unknown_dimension(self):
+        """Test that an unknown grouping is rejected"""
+        with self.assertRaises(ValueError):
+            self._tracker().top("region")
+        
+    def test_persist_and_reload(self):
+        """Test that totals survive a restart"""
+        tracker = self._tracker(persist_interval=0)
+        with usage_scope(1001, 2001):
+            tracker.record("answer_question", 500, 50)
+        
+        with open(self.file_path) as file:
+            self.assertEqual(json.load(file)["totals"]["input_tokens"], 500)
+        
+        reloaded = self._tracker()
+        self.assertEqual(reloaded.summary()["input_tokens"], 500)
+        self.assertEqual(reloaded.top("position")[0]["key"], "1001")
+        
+    def test_workers_sharing_a_file_add_their_usage(self):
+        """Test that trackers sharing a stats file keep each other's usage"""
+        first = self._tracker()
+        second = self._tracker()
+        with usage_scope(1001, 2001):
+            first.record("answer_question", 500, 50)
+        with usage_scope(1002, 2001):
+            second.record("answer_question", 300, 30)
+            second.record("answer_question", 200, 20)
+        
+        first.flush()
+        second.flush()
+        first.flush()
+        
+        with open(self.file_path) as file:
+            stored = json.load(file)
+        self.assertEqual(stored["totals"]["input_tokens"], 1000)
+        self.assertEqual(stored["groups"]["company"]["2001"]["calls"], 3)
+        self.assertEqual(second.summary()["input_tokens"], 1000)
+        self.assertEqual({entry["key"] for entry in second.top("position")}, {"1001", "1002"})
+        self.assertEqual(sorted(name for name in os.listdir(self.temp_dir.name) if name.endswith(".tmp")), [])
+
+class TestUsageEndpoint(unittest.TestCase):
+    """Test cases for the usage endpoint"""
+    
+    def test_usage_recorded_for_chat_request(self):
+        """Test that a chat request's token usage is reported per position"""
+        from fastapi.testclient import TestClient
+        from src.main import app
+        
+        tracker = UsageTracker(None)
+        mock_response = MagicMock()
+        mock_response.content = '{"similar_question_id": null, "response": "Hybrid, 2 days in office."}'
+        mock_response.usage_metadata = {"input_tokens": 2500, "output_tokens": 40}
+        
+        with patch('src.workflow.workflow.usage_tracker', tracker), \
+             patch('src.main.usage_tracker', tracker), \
+             patch('src.workflow.workflow.llm') as mock_llm:
+            mock_llm.invoke.return_value = mock_response
+            client = TestClient(app)
+            client.post("/v1/chatRequest", json={"question": "Is this role hybrid?", "positionId": 1001})
+            response = client.get("/v1/usage")
+            by_company = client.get("/v1/usage?by=company")
+            invalid = client.get("/v1/usage?by=region")
+        
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["totals"]["input_tokens"], 2500)
+        self.assertEqual(body["positions"][0]["key"], "1001")
+        self.assertEqual(by_company.json()["usage"][0]["key"], "2001")
+        self.assertEqual(invalid.status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
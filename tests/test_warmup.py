@@ -0,0 +1,107 @@
+"""
+Tests for startup warm-up and the health endpoints
+"""
+
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from fastapi.testclient import TestClient
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import warmup
+from src.main import app
+from src.database import file_db
+from src.database.search_index import search_index
+from tests.helpers import use_temp_data_dir
+
+def make_position(company_id, times_asked):
+    return {
+        "position": {"companyId": company_id, "positionTitle": "Engineer"},
+        "positionFAQs": [{"id": 50001 + i, "question": f"Q{i}?", "timesAsked": count}
+                         for i, count in enumerate(times_asked)],
+        "positionInfo": []
+    }
+
+class TestWarmup(unittest.TestCase):
+    """Test cases for warm-up"""
+    
+    def setUp(self):
+        self.data_dir = use_temp_data_dir(self)
+        file_db.save_position_data(make_position(2001, [1, 2]), 1001)
+        file_db.save_position_data(make_position(2002, [10]), 1002)
+        file_db.save_position_data(make_position(2001, [0]), 1003)
+        file_db.save_position_data(make_position(2003, [4, 4]), 1004)
+        file_db.save_company_data({"companyInfo": [], "companyFAQs": []}, 2002)
+        file_db.save_company_data({"companyInfo": [], "companyFAQs": []}, 2003)
+        
+    def test_most_asked_positions(self):
+        """Test ranking positions by the total times their FAQs were asked"""
+        self.assertEqual(warmup.most_asked_positions(3), [1002, 1004, 1001])
+        
+    @patch('src.warmup.llm')
+    def test_warm_up_loads_documents_and_primes_llm(self, mock_llm):
+        """Test that warm-up caches the hot documents, builds the search index and creates the LLM client"""
+        file_db._documents.clear()
+        search_index.clear()
+        self.addCleanup(search_index.clear)
+        
+        details = warmup.warm_up(position_count=2, llm_ping=False)
+        
+        self.assertEqual(details["positions"], [1002, 1004])
+        self.assertEqual(details["companies"], [2002, 2003])
+        self.assertEqual(details["llm"], "ready")
+        mock_llm.get_client.assert_called_once()
+        mock_llm.invoke.assert_not_called()
+        with patch("builtins.open", side_effect=AssertionError("file read")):
+            self.assertIsNotNone(file_db.get_position_data(1002))
+            self.assertIsNotNone(file_db.get_company_data(2003))
+            self.assertEqual(len(search_index.search("q1")), 2)
+        
+    @patch('src.warmup.llm')
+    def test_llm_failure_does_not_block_readiness(self, mock_llm):
+        """Test that the worker becomes ready when the LLM client cannot be primed"""
+        mock_llm.get_client.side_effect = RuntimeError("no API key")
+        warmup.readiness.reset()
+        
+        details = warmup.run_warm_up(position_count=1)
+        
+        self.assertEqual(details["llm"], "failed")
+        self.assertTrue(warmup.readiness.is_ready())
+
+class TestHealthEndpoints(unittest.TestCase):
+    """Test cases for the liveness and readiness endpoints"""
+    
+    def test_ready_after_warm_up(self):
+        """Test readiness is reported once the startup warm-up finished"""
+        with patch('src.warmup.llm', MagicMock()):
+            with TestClient(app) as client:
+                live = client.get("/health/live")
+                # Warm-up runs in the background, so poll until it finishes
+                for _ in range(200):
+                    ready = client.get("/health/ready")
+                    if ready.status_code == 200:
+                        break
+                    time.sleep(0.01)
+        
+        self.assertEqual(live.status_code, 200)
+        self.assertEqual(ready.status_code, 200)
+        self.assertEqual(ready.json()["status"], "ready")
+        self.assertIn("positions", ready.json()["warmup"])
+        
+    def test_not_ready_while_warming_up(self):
+        """Test that readiness is 503 with Retry-After before warm-up finished"""
+        warmup.readiness.reset()
+        client = TestClient(app)
+        
+        response = client.get("/health/ready")
+        
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "1")
+
+if __name__ == "__main__":
+    unittest.main()